@@ -0,0 +1,60 @@
+from contextlib import nullcontext
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections, connection
+from django.urls import URLPattern
+
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def async_viewset_view(view):
+    """Асинхронное представление поверх view из ViewSet.as_view().
+
+    В Django 3.2 нет асинхронного ORM, а DRF не поддерживает async-
+    представления, поэтому чтение (GET/HEAD/OPTIONS) целиком, вместе с
+    запросами к БД, пагинацией и рендерингом ответа, выполняется в пуле
+    потоков (thread_sensitive=False) и не ждёт общего потока, в котором
+    ASGI-обработчик Django выполняет синхронные представления. Запись
+    идёт в этот общий поток, как и без обёртки.
+    """
+
+    def read(request, *args, **kwargs):
+        close_old_connections()
+        try:
+            timer = getattr(request, 'query_timer', None)
+            if timer is not None:
+                request.db_timed = True
+            with (
+                connection.execute_wrapper(timer) if timer is not None
+                else nullcontext()
+            ):
+                response = view(request, *args, **kwargs)
+                if hasattr(response, 'render'):
+                    response.render()
+            return response
+        finally:
+            close_old_connections()
+
+    read = sync_to_async(read, thread_sensitive=False)
+    write = sync_to_async(view, thread_sensitive=True)
+
+    @wraps(view)
+    async def async_view(request, *args, **kwargs):
+        if request.method in READ_METHODS:
+            return await read(request, *args, **kwargs)
+        return await write(request, *args, **kwargs)
+
+    return async_view
+
+
+def async_urls(urlpatterns, viewsets):
+    """URL роутера, где представления viewsets заменены асинхронными."""
+    return [
+        URLPattern(
+            pattern.pattern, async_viewset_view(pattern.callback),
+            pattern.default_args, pattern.name,
+        )
+        if getattr(pattern.callback, 'cls', None) in viewsets else pattern
+        for pattern in urlpatterns
+    ]
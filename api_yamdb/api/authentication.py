@@ -0,0 +1,71 @@
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+# Поля пользователя, которые кладутся в токен и нужны для проверки прав.
+USER_CLAIMS = ('role', 'is_staff', 'is_superuser', 'is_active')
+
+
+def get_access_token(user):
+    """Access-токен с id и ролью пользователя в claims."""
+    token = AccessToken.for_user(user)
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    return token
+
+
+def user_not_found():
+    return AuthenticationFailed(
+        'Пользователь не найден.', code='user_not_found'
+    )
+
+
+def load_full_user(user):
+    """Догрузка отложенных полей пользователя из токена одним запросом.
+
+    Пользователь мог быть удалён после выдачи токена - тогда 401.
+    """
+    deferred = user.get_deferred_fields()
+    if deferred:
+        try:
+            user.refresh_from_db(fields=deferred)
+        except get_user_model().DoesNotExist:
+            raise user_not_found()
+    return user
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация без запроса к таблице пользователей.
+
+    Пользователь собирается из claims токена: id, роль и флаги доступны
+    сразу, остальные поля отложены (deferred) и загружаются из БД при
+    первом обращении. Токены без claims роли обрабатываются как раньше.
+    Удалённый или деактивированный пользователь сохраняет доступ к API
+    до истечения access-токена (ACCESS_TOKEN_LIFETIME); записи с ним
+    автором получают 401 (см. api.exceptions).
+    """
+
+    def get_user(self, validated_token):
+        if not all(claim in validated_token for claim in USER_CLAIMS):
+            return super().get_user(validated_token)
+        if not validated_token['is_active']:
+            raise AuthenticationFailed(
+                'Пользователь неактивен.', code='user_inactive'
+            )
+        claims = {
+            api_settings.USER_ID_FIELD:
+                validated_token[api_settings.USER_ID_CLAIM],
+            **{claim: validated_token[claim] for claim in USER_CLAIMS},
+        }
+        # from_db ожидает значения в порядке полей модели.
+        field_names = [
+            field.attname for field in self.user_model._meta.concrete_fields
+            if field.attname in claims
+        ]
+        return self.user_model.from_db(
+            DEFAULT_DB_ALIAS, field_names,
+            [claims[name] for name in field_names]
+        )
@@ -0,0 +1,111 @@
+from django.db import connection
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField
+
+from reviews.signals import bulk_loaded
+
+
+class PrefetchedRelatedField(serializers.RelatedField):
+    """Связанный объект из словаря, загруженного заранее для всего пакета.
+
+    Вместо запроса на каждый элемент объекты берутся из
+    context['prefetched'], который заполняет prefetch_related_values
+    одним запросом на поле.
+    """
+    default_error_messages = {
+        'does_not_exist': 'Объект {lookup}={value} не найден.',
+        'incorrect_type': 'Некорректный тип. Ожидается {lookup}.',
+    }
+
+    def __init__(self, lookup='pk', **kwargs):
+        self.lookup = lookup
+        super().__init__(**kwargs)
+
+    @property
+    def prefetch_key(self):
+        return self.queryset.model, self.lookup
+
+    def to_internal_value(self, data):
+        if isinstance(data, (dict, list, bool)) or data is None:
+            self.fail('incorrect_type', lookup=self.lookup)
+        objects = self.context['prefetched'].get(self.prefetch_key, {})
+        try:
+            return objects[str(data)]
+        except KeyError:
+            self.fail('does_not_exist', lookup=self.lookup, value=data)
+
+    def to_representation(self, value):
+        return getattr(value, self.lookup)
+
+
+def get_prefetched_fields(serializer):
+    """Поля PrefetchedRelatedField сериализатора элемента пакета."""
+    for name, field in serializer.fields.items():
+        if isinstance(field, ManyRelatedField):
+            field = field.child_relation
+        if isinstance(field, PrefetchedRelatedField) and not field.read_only:
+            yield name, field
+
+
+def prefetch_related_values(serializer, items):
+    """Загрузка связанных объектов всех элементов пакета.
+
+    Возвращает словарь {(модель, поле поиска): {значение: объект}} -
+    по одному запросу на каждое поле PrefetchedRelatedField.
+    """
+    prefetched = {}
+    for name, field in get_prefetched_fields(serializer):
+        values = set()
+        for item in items:
+            value = item.get(name) if isinstance(item, dict) else None
+            for value in value if isinstance(value, list) else [value]:
+                if isinstance(value, (str, int)) and not isinstance(
+                    value, bool
+                ):
+                    values.add(str(value))
+        if not values:
+            continue
+        objects = prefetched.setdefault(field.prefetch_key, {})
+        lookup = field.lookup
+        if lookup == 'pk':
+            values = {value for value in values if value.isdigit()}
+        for obj in field.queryset.filter(**{f'{lookup}__in': values}):
+            objects[str(getattr(obj, lookup))] = obj
+    return prefetched
+
+
+def returns_bulk_keys():
+    """Ключи объектов из bulk_create известны: БД возвращает их
+    (RETURNING) или их можно прочитать следом (SQLite)."""
+    return (
+        connection.features.can_return_rows_from_bulk_insert
+        or connection.vendor == 'sqlite'
+    )
+
+
+def bulk_insert(model, objs):
+    """Вставка объектов пачкой с первичными ключами и сигналом bulk_loaded.
+
+    Должна вызываться внутри transaction.atomic(). Если БД не
+    возвращает ключи из bulk_create (SQLite в Django 3.2), они читаются
+    следующим запросом: открытая транзакция SQLite держит блокировку
+    записи, поэтому вставленные строки - последние по ключу и идут
+    в порядке вставки. На остальных БД без RETURNING (MySQL) объекты
+    сохраняются по одному через save(), счётчики и индексы обновляют
+    обработчики post_save.
+    """
+    if not objs:
+        return objs
+    if not returns_bulk_keys():
+        for obj in objs:
+            obj.save(force_insert=True)
+        return objs
+    model.objects.bulk_create(objs)
+    if objs[0].pk is None:
+        pks = list(model.objects.order_by('-pk').values_list(
+            'pk', flat=True
+        )[:len(objs)])
+        for obj, pk in zip(objs, reversed(pks)):
+            obj.pk = pk
+    bulk_loaded.send(sender=model, objs=objs)
+    return objs
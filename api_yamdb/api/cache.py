@@ -0,0 +1,165 @@
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils.http import quote_etag
+
+HITS_KEY = 'response-cache:hits'
+MISSES_KEY = 'response-cache:misses'
+
+
+def get_cache():
+    """Бэкенд кэша ответов (любой совместимый с Django cache API)."""
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def is_process_local(cache):
+    """Кэш у каждого процесса свой (LocMemCache)."""
+    return isinstance(cache, LocMemCache)
+
+
+def get_generations(namespaces):
+    """Текущие поколения пространств имён кэша.
+
+    Поколение - целое число секунд: время последней записи в данные
+    пространства, оно же Last-Modified ответов. Если его нет в кэше,
+    оно создаётся со значением "сейчас".
+
+    В кэше процесса (LocMemCache) запись в другом воркере поколение
+    этого процесса не меняет, поэтому поколение, не менявшееся дольше
+    RESPONSE_CACHE_TIMEOUT, сдвигается само: ответ устаревает не
+    позже, чем закэшированные данные.
+    """
+    cache = get_cache()
+    if is_process_local(cache):
+        fresh = cache.get_many(
+            f'generation-fresh:{namespace}' for namespace in namespaces
+        )
+        stale = [
+            namespace for namespace in namespaces
+            if f'generation-fresh:{namespace}' not in fresh
+        ]
+        if stale:
+            invalidate(*stale)
+    keys = [f'generation:{namespace}' for namespace in namespaces]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, math.ceil(time.time()), timeout=None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def invalidate(*namespaces):
+    """Сброс закэшированных ответов указанных пространств имён.
+
+    Новое поколение хотя бы на секунду больше прежнего, даже при
+    нескольких записях за секунду: иначе Last-Modified не изменился бы,
+    и клиент с одним If-Modified-Since получил бы 304 с устаревшими
+    данными. При частых записях поколение может опережать часы.
+    """
+    cache = get_cache()
+    now = math.ceil(time.time())
+    generations = {}
+    for namespace in namespaces:
+        key = f'generation:{namespace}'
+        previous = cache.get(key)
+        generations[key] = now
+        if previous is not None:
+            generations[key] = max(now, math.ceil(previous) + 1)
+    cache.set_many(generations, timeout=None)
+    if is_process_local(cache):
+        cache.set_many(
+            {
+                f'generation-fresh:{namespace}': True
+                for namespace in namespaces
+            },
+            timeout=settings.RESPONSE_CACHE_TIMEOUT,
+        )
+
+
+def make_key(namespaces, generations, request):
+    """Ключ ответа: пространства имён, их поколения, адрес и параметры.
+
+    В адрес входят схема и хост: ссылки пагинации next/previous в данных
+    ответа абсолютные. Параметры запроса нормализуются: сортируются,
+    пустые значения отбрасываются, поэтому порядок параметров не влияет
+    на попадание.
+    """
+    params = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+        if value != ''
+    )
+    digest = hashlib.md5(
+        f'{request.build_absolute_uri(request.path)}?{params}'.encode()
+    ).hexdigest()
+    return (
+        f'response:{":".join(namespaces)}:'
+        f'{":".join(map(str, generations))}:{digest}'
+    )
+
+
+def make_etag(key):
+    """ETag ответа: меняется вместе с поколениями в ключе кэша."""
+    return quote_etag(hashlib.md5(key.encode()).hexdigest())
+
+
+def lookup(key):
+    """Закэшированные данные ответа с учётом счётчиков попаданий/промахов."""
+    cache = get_cache()
+    data = cache.get(key)
+    _increment(cache, MISSES_KEY if data is None else HITS_KEY)
+    return data
+
+
+def store(key, data):
+    get_cache().set(key, data, timeout=settings.RESPONSE_CACHE_TIMEOUT)
+
+
+def get_parent_cache():
+    """Кэш проверенных родителей вложенных URL (NestedParentMixin)."""
+    return caches[settings.PARENT_LOOKUP_CACHE_ALIAS]
+
+
+def get_parent(model, lookups):
+    """Родитель вложенного ресурса проверен и закэширован с теми же
+    значениями полей (например, Отзыв - с тем же Произведением)."""
+    key = f'parent:{model._meta.model_name}:{lookups["pk"]}'
+    return get_parent_cache().get(key) == lookups
+
+
+def set_parent(model, lookups):
+    key = f'parent:{model._meta.model_name}:{lookups["pk"]}'
+    get_parent_cache().set(
+        key, lookups, timeout=settings.PARENT_LOOKUP_CACHE_TIMEOUT
+    )
+
+
+def forget_parent(model, pk):
+    get_parent_cache().delete(f'parent:{model._meta.model_name}:{pk}')
+
+
+def stats():
+    """Счётчики попаданий и промахов кэша ответов."""
+    counters = get_cache().get_many((HITS_KEY, MISSES_KEY))
+    hits = counters.get(HITS_KEY, 0)
+    misses = counters.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / total if total else None,
+    }
+
+
+def _increment(cache, key):
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 1, timeout=None)
@@ -0,0 +1,29 @@
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError
+from rest_framework.views import exception_handler as drf_exception_handler
+
+from .authentication import StatelessJWTAuthentication, user_not_found
+
+
+def exception_handler(exc, context):
+    """Обработчик ошибок DRF: запись от удалённого пользователя - 401.
+
+    Пользователь из claims токена не проверяется в БД, поэтому удалённый
+    после выдачи токена пользователь доходит до записи, и она падает
+    на внешнем ключе автора. Наличие пользователя проверяется только
+    после такой ошибки; остальные IntegrityError пробрасываются.
+    """
+    request = context.get('request')
+    if (
+        isinstance(exc, IntegrityError)
+        and request is not None
+        and isinstance(
+            request.successful_authenticator, StatelessJWTAuthentication
+        )
+        and not get_user_model().objects.filter(
+            pk=request.user.pk
+        ).exists()
+    ):
+        exc = user_not_found()
+        exc.auth_header = context['view'].get_authenticate_header(request)
+    return drf_exception_handler(exc, context)
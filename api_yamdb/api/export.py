@@ -0,0 +1,79 @@
+import csv
+import json
+from itertools import groupby
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from reviews.models import Review, Title, TitleGenre
+
+TITLE_FIELDS = (
+    'id', 'name', 'year', 'description', 'category', 'genre', 'rating'
+)
+REVIEW_FIELDS = ('id', 'title', 'author', 'text', 'score', 'pub_date')
+
+
+class Echo:
+    """Буфер для csv.writer, возвращающий строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def iter_titles(chunk_size):
+    """Произведения с категорией, жанрами и рейтингом.
+
+    Произведения и их жанры читаются двумя потоками .iterator(), оба
+    упорядочены по id произведения и сливаются без загрузки в память.
+    """
+    titles = Title.objects.order_by('pk').values_list(
+        'id', 'name', 'year', 'description', 'category__slug',
+        'rating'
+    ).iterator(chunk_size=chunk_size)
+    links = TitleGenre.objects.order_by('title_id', 'genre__slug').values_list(
+        'title_id', 'genre__slug'
+    ).iterator(chunk_size=chunk_size)
+    genres = groupby(links, key=lambda link: link[0])
+    current_id, current_genres = next(genres, (None, ()))
+    for title_id, name, year, description, category, rating in titles:
+        while current_id is not None and current_id < title_id:
+            current_id, current_genres = next(genres, (None, ()))
+        title_genres = []
+        if current_id == title_id:
+            title_genres = [slug for _, slug in current_genres]
+        yield {
+            'id': title_id,
+            'name': name,
+            'year': year,
+            'description': description,
+            'category': category,
+            'genre': title_genres,
+            'rating': rating,
+        }
+
+
+def iter_reviews(chunk_size):
+    """Отзывы с id произведения и именем автора."""
+    reviews = Review.objects.order_by('pk').values_list(
+        'id', 'title_id', 'author__username', 'text', 'score', 'pub_date'
+    ).iterator(chunk_size=chunk_size)
+    for review in reviews:
+        yield dict(zip(REVIEW_FIELDS, review))
+
+
+def render_csv(rows, fields):
+    """Построчная выдача CSV, списки склеиваются через запятую."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow(
+            ','.join(value) if isinstance(value, list) else value
+            for value in (row[field] for field in fields)
+        )
+
+
+def render_ndjson(rows, fields):
+    """Построчная выдача NDJSON: один JSON-объект на строку."""
+    for row in rows:
+        yield json.dumps(
+            row, cls=DjangoJSONEncoder, ensure_ascii=False
+        ) + '\n'
@@ -1,6 +1,7 @@
 from django_filters import rest_framework as filters
 
 from reviews.models import Title
+from reviews.search import get_search_backend
 
 
 class TitleFilter(filters.FilterSet):
@@ -8,7 +9,21 @@ class TitleFilter(filters.FilterSet):
     category = filters.CharFilter(field_name='category__slug')
     genre = filters.CharFilter(field_name='genre__slug')
     name = filters.CharFilter(field_name='name', lookup_expr='icontains')
+    q = filters.CharFilter(method='search')
 
     class Meta:
         model = Title
         fields = '__all__'
+
+    def search(self, queryset, name, value):
+        """Полнотекстовый поиск по названию и описанию с ранжированием."""
+        return get_search_backend().search(queryset, value)
+
+
+class TopTitleFilter(TitleFilter):
+    """Фильтр топа Произведений: диапазон лет и минимум отзывов."""
+    year_min = filters.NumberFilter(field_name='year', lookup_expr='gte')
+    year_max = filters.NumberFilter(field_name='year', lookup_expr='lte')
+    min_reviews = filters.NumberFilter(
+        field_name='reviews_count', lookup_expr='gte'
+    )
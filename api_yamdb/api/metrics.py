@@ -0,0 +1,62 @@
+import math
+import threading
+import time
+from collections import defaultdict, deque
+
+from django.conf import settings
+
+FIELDS = ('total_ms', 'db_ms', 'serializer_ms', 'queries')
+
+_samples = defaultdict(lambda: deque(maxlen=settings.REQUEST_METRICS_WINDOW))
+_lock = threading.Lock()
+
+
+class QueryTimer:
+    """Обёртка выполнения SQL: количество запросов и время в БД."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+def record(tag, total_ms, db_ms, serializer_ms, queries):
+    """Добавление замера запроса в скользящее окно представления."""
+    with _lock:
+        _samples[tag].append((total_ms, db_ms, serializer_ms, queries))
+
+
+def percentile(values, share):
+    """Перцентиль по методу ближайшего ранга."""
+    return values[max(0, math.ceil(share * len(values)) - 1)]
+
+
+def snapshot():
+    """Сводка по представлениям: число замеров и p50/p95/p99."""
+    with _lock:
+        samples = {tag: list(values) for tag, values in _samples.items()}
+    result = {}
+    for tag, values in sorted(samples.items()):
+        summary = {'count': len(values)}
+        for position, field in enumerate(FIELDS):
+            column = sorted(value[position] for value in values)
+            summary[field] = {
+                'p50': percentile(column, 0.5),
+                'p95': percentile(column, 0.95),
+                'p99': percentile(column, 0.99),
+                'max': column[-1],
+            }
+        result[tag] = summary
+    return result
+
+
+def reset():
+    with _lock:
+        _samples.clear()
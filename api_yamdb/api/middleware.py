@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+from asgiref.sync import markcoroutinefunction
+from django.db import connection
+
+from . import metrics
+
+
+class RequestMetricsMiddleware:
+    """Замер времени запроса, времени и количества запросов к БД.
+
+    Замеры группируются по вьюсету и действию (TitleViewSet.list и т.п.),
+    добавляются в заголовок Server-Timing и в скользящую гистограмму
+    api.metrics.
+
+    Работает и под ASGI: синхронные представления там выполняются в
+    другом потоке, поэтому счётчик запросов к БД (request.query_timer)
+    подключают сами представления (см. api.async_views), а для
+    остальных запросов раздел db в Server-Timing не выводится.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        start = self.start(request)
+        request.db_timed = True
+        with connection.execute_wrapper(request.query_timer):
+            response = self.get_response(request)
+        return self.finish(request, response, start)
+
+    async def __acall__(self, request):
+        start = self.start(request)
+        response = await self.get_response(request)
+        return self.finish(request, response, start)
+
+    def start(self, request):
+        request.metrics_tag = None
+        request.serializer_time = 0.0
+        request.query_timer = metrics.QueryTimer()
+        request.db_timed = False
+        return time.perf_counter()
+
+    def finish(self, request, response, start):
+        total_ms = (time.perf_counter() - start) * 1000
+        timer = request.query_timer
+        db_ms = timer.duration * 1000
+        serializer_ms = request.serializer_time * 1000
+        timings = [
+            f'serializer;dur={serializer_ms:.2f}',
+            f'total;dur={total_ms:.2f}',
+        ]
+        if request.db_timed:
+            timings.insert(
+                0, f'db;dur={db_ms:.2f};desc="{timer.count} queries"'
+            )
+        response['Server-Timing'] = ', '.join(timings)
+        if request.metrics_tag:
+            metrics.record(
+                request.metrics_tag, total_ms, db_ms, serializer_ms,
+                timer.count
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'cls', None)
+        if view_class is None:
+            return None
+        actions = getattr(view_func, 'actions', None) or {}
+        action = actions.get(request.method.lower(), request.method.lower())
+        request.metrics_tag = f'{view_class.__name__}.{action}'
+        return None
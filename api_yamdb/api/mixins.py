@@ -1,8 +1,238 @@
-from rest_framework import viewsets, filters
+import math
+import time
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
+from django.db.models import Prefetch
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import serializers, viewsets, filters, status
+from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+
+from reviews.stats import STATS_MODELS
+from . import cache
 from .permissions import IsAdminOrReadOnly
+from .serializers import CollectionStatsSerializer
+
+
+class SerializerTimingMixin:
+    """Миксин учёта времени сериализации для RequestMetricsMiddleware."""
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        request = self.request._request
+        if not hasattr(request, 'serializer_time'):
+            return serializer
+        to_representation = serializer.to_representation
+
+        def timed_to_representation(instance):
+            start = time.perf_counter()
+            try:
+                return to_representation(instance)
+            finally:
+                request.serializer_time += time.perf_counter() - start
+
+        serializer.to_representation = timed_to_representation
+        return serializer
+
+
+class SparseQuerysetMixin:
+    """Миксин чтения из БД только полей, которые выводит сериализатор.
+
+    Для GET-запросов queryset сужается через only() до колонок полей
+    сериализатора (с учётом ?fields=), связанные объекты загружаются
+    select_related/prefetch_related только для выводимых полей. Если
+    поле сериализатора не соответствует полю модели, queryset не
+    сужается.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method != 'GET':
+            return queryset
+        serializer = self.get_serializer_class()(
+            context=self.get_serializer_context()
+        )
+        return self.narrow_queryset(queryset, serializer)
+
+    @staticmethod
+    def get_related_columns(field):
+        """Поля связанной модели, которые выводит поле сериализатора."""
+        nested = getattr(field, 'child', field)
+        if isinstance(nested, serializers.BaseSerializer):
+            return [child.source for child in nested.fields.values()]
+        if isinstance(field, serializers.SlugRelatedField):
+            return [field.slug_field]
+        return []
+
+    def narrow_queryset(self, queryset, serializer):
+        meta = queryset.model._meta
+        only, select, prefetch = [meta.pk.name], [], []
+        for field in serializer.fields.values():
+            if field.source == '*':
+                return queryset
+            name = field.source.split('.')[0]
+            try:
+                model_field = meta.get_field(name)
+            except FieldDoesNotExist:
+                return queryset
+            columns = self.get_related_columns(field)
+            if model_field.many_to_many or model_field.one_to_many:
+                related = model_field.related_model.objects.all()
+                if columns:
+                    related = related.only(*columns)
+                prefetch.append(Prefetch(name, queryset=related))
+                continue
+            only.append(name)
+            if columns:
+                select.append(name)
+                only.extend(f'{name}__{column}' for column in columns)
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if select:
+            queryset = queryset.select_related(*select)
+        return queryset.prefetch_related(*prefetch).only(*only)
+
+
+class NestedParentMixin:
+    """Миксин вложенного ресурса: Отзывы Произведения, Комментарии Отзыва.
+
+    parent_lookups - {поле родителя: kwarg URL}, parent_field - внешний
+    ключ на родителя. Родитель загружается не больше одного раза за
+    запрос (get_parent). Queryset фильтруется по значениям из URL без
+    отдельного запроса к родителю, его существование проверяется, только
+    если страница списка пуста.
 
+    При PARENT_LOOKUP_CACHE_TIMEOUT > 0 проверенный родитель
+    запоминается на это время в кэше PARENT_LOOKUP_CACHE_ALIAS
+    (сбрасывается при удалении, см. api.signals): queryset фильтруется
+    только по внешнему ключу, без join с таблицей родителя, а пустая
+    страница не проверяет родителя в БД.
+    """
+    parent_model = None
+    parent_field = None
+    parent_lookups = {}
 
-class CategoryGenreMixin(viewsets.GenericViewSet,
+    def get_parent_lookups(self):
+        return {
+            field: self.kwargs.get(kwarg)
+            for field, kwarg in self.parent_lookups.items()
+        }
+
+    def get_parent(self):
+        if not hasattr(self, '_parent'):
+            self._parent = get_object_or_404(
+                self.parent_model, **self.get_parent_lookups()
+            )
+            self.remember_parent()
+        return self._parent
+
+    def parent_known(self):
+        """Родитель уже проверен в этом запросе или закэширован."""
+        if not hasattr(self, '_parent_known'):
+            self._parent_known = (
+                settings.PARENT_LOOKUP_CACHE_TIMEOUT > 0
+                and cache.get_parent(
+                    self.parent_model, self.get_parent_lookups()
+                )
+            )
+        return self._parent_known
+
+    def remember_parent(self):
+        if settings.PARENT_LOOKUP_CACHE_TIMEOUT > 0 and not (
+            self.parent_known()
+        ):
+            cache.set_parent(self.parent_model, self.get_parent_lookups())
+        self._parent_known = True
+
+    def get_queryset(self):
+        lookups = self.get_parent_lookups()
+        if self.parent_known():
+            lookups = {'pk': lookups['pk']}
+        return super().get_queryset().filter(**{
+            f'{self.parent_field}__{field}': value
+            for field, value in lookups.items()
+        })
+
+    def paginate_queryset(self, queryset):
+        """Пустая страница - повод проверить, что родитель существует."""
+        page = super().paginate_queryset(queryset)
+        if page:
+            self.remember_parent()
+        elif not self.parent_known():
+            self.get_parent()
+        return page
+
+
+class CachedResponseMixin:
+    """Миксин кэширования ответов на GET-запросы списка.
+
+    Данные ответа хранятся в кэше до ближайшей записи в модели
+    пространств имён из get_cache_namespaces (см. api.signals). Другие
+    действия кэшируются через get_cached_response, namespace задаёт
+    другое пространство имён.
+
+    Ответы получают ETag и Last-Modified по поколениям пространств имён,
+    поэтому условный запрос с актуальным ETag получает 304 без чтения
+    данных из БД и сериализации.
+    """
+    cache_namespace = None
+
+    def get_cache_namespaces(self):
+        """Пространства имён, от данных которых зависит ответ."""
+        return (self.cache_namespace,)
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def get_cached_response(self, handler, request, *args, namespace=None,
+                            **kwargs):
+        namespaces = (
+            (namespace,) if namespace else self.get_cache_namespaces()
+        )
+        generations = cache.get_generations(namespaces)
+        key = cache.make_key(namespaces, generations, request)
+        last_modified = math.ceil(max(generations))
+        validators = {
+            'ETag': cache.make_etag(key),
+            'Last-Modified': http_date(last_modified),
+        }
+        # If-Modified-Since - только для клиентов без If-None-Match:
+        # ETag точнее даты с точностью до секунды.
+        if request.META.get('HTTP_IF_NONE_MATCH'):
+            last_modified = None
+        conditional = get_conditional_response(
+            request._request,
+            etag=validators['ETag'],
+            last_modified=last_modified,
+        )
+        if conditional is not None:
+            if conditional.status_code != status.HTTP_304_NOT_MODIFIED:
+                return conditional
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED, headers=validators
+            )
+        data = cache.lookup(key)
+        if data is not None:
+            response = Response(data, status=status.HTTP_200_OK)
+            response['X-Cache'] = 'HIT'
+        else:
+            response = handler(request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.store(key, response.data)
+            response['X-Cache'] = 'MISS'
+        if response.status_code == status.HTTP_200_OK:
+            for header, value in validators.items():
+                response[header] = value
+        return response
+
+
+class CategoryGenreMixin(CachedResponseMixin,
+                         SerializerTimingMixin,
+                         viewsets.GenericViewSet,
                          viewsets.mixins.CreateModelMixin,
                          viewsets.mixins.ListModelMixin,
                          viewsets.mixins.DestroyModelMixin):
@@ -11,3 +241,25 @@ class CategoryGenreMixin(viewsets.GenericViewSet,
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
+    stats_top_titles = 5
+
+    @action(methods=['GET'], detail=True)
+    def stats(self, request, slug=None):
+        """Количество Произведений и Отзывов, средняя оценка и лучшие
+        Произведения по предрассчитанной статистике."""
+        return self.get_cached_response(
+            self.get_stats, request, namespace='titles', slug=slug
+        )
+
+    def get_stats(self, request, slug=None):
+        group = self.get_object()
+        try:
+            stats = group.stats
+        except ObjectDoesNotExist:
+            stats = STATS_MODELS[type(group)](pk=group.pk)
+        stats.top_titles = group.titles.filter(
+            rating__isnull=False
+        ).order_by(
+            '-rating', '-reviews_count', 'pk'
+        )[:self.stats_top_titles]
+        return Response(CollectionStatsSerializer(stats).data)
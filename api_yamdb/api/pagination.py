@@ -0,0 +1,156 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.template import loader
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class ReviewCommentPagination(LimitOffsetPagination):
+    """Пагинация Отзывов и Комментариев.
+
+    По умолчанию limit/offset. Параметр pagination=cursor (или cursor из
+    ссылок next/previous) включает keyset-режим: страница выбирается по
+    (pub_date, id) последнего объекта, поэтому её стоимость не зависит
+    от глубины. Параметр count=false отключает подсчёт общего количества.
+    """
+    mode_query_param = 'pagination'
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Некорректный курсор.'
+    # Без общего количества номера страниц неизвестны: в Browsable API
+    # выводятся только ссылки назад/вперёд.
+    previous_and_next_template = (
+        'rest_framework/pagination/previous_and_next.html'
+    )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.with_count = request.query_params.get(
+            self.count_query_param, ''
+        ).lower() not in ('false', '0')
+        self.keyset = (
+            self.cursor_query_param in request.query_params
+            or request.query_params.get(self.mode_query_param) == 'cursor'
+        )
+        if self.with_count and not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+        self.display_page_controls = self.template is not None
+        if self.keyset:
+            return self.paginate_keyset(queryset, request)
+        self.offset = self.get_offset(request)
+        page = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(page) > self.limit
+        return page[:self.limit]
+
+    def get_paginated_response(self, data):
+        response = OrderedDict()
+        if self.with_count:
+            response['count'] = self.count
+        response['next'] = self.get_next_link()
+        response['previous'] = self.get_previous_link()
+        response['results'] = data
+        return Response(response)
+
+    def get_next_link(self):
+        if self.keyset:
+            return self.get_cursor_link(self.next_position, reverse=False)
+        if self.with_count:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            url, self.offset_query_param, self.offset + self.limit
+        )
+
+    def get_previous_link(self):
+        if self.keyset:
+            return self.get_cursor_link(self.previous_position, reverse=True)
+        return super().get_previous_link()
+
+    def get_html_context(self):
+        if self.with_count and not self.keyset:
+            return super().get_html_context()
+        return {
+            'previous_url': self.get_previous_link(),
+            'next_url': self.get_next_link(),
+        }
+
+    def to_html(self):
+        if self.with_count and not self.keyset:
+            return super().to_html()
+        template = loader.get_template(self.previous_and_next_template)
+        return template.render(self.get_html_context())
+
+    def paginate_keyset(self, queryset, request):
+        position, reverse = self.decode_cursor(request)
+        if self.with_count:
+            self.count = self.get_count(queryset)
+        if reverse:
+            queryset = queryset.order_by('pub_date', 'id')
+            if position:
+                queryset = queryset.filter(
+                    Q(pub_date__gt=position[0])
+                    | Q(pub_date=position[0], id__gt=position[1])
+                )
+        else:
+            queryset = queryset.order_by('-pub_date', '-id')
+            if position:
+                queryset = queryset.filter(
+                    Q(pub_date__lt=position[0])
+                    | Q(pub_date=position[0], id__lt=position[1])
+                )
+        page = list(queryset[:self.limit + 1])
+        has_more = len(page) > self.limit
+        page = page[:self.limit]
+        if reverse:
+            page.reverse()
+        has_next = not reverse and has_more or reverse and bool(position)
+        has_previous = reverse and has_more or not reverse and bool(position)
+        self.next_position = (
+            self.get_position(page[-1]) if has_next and page else None
+        )
+        self.previous_position = (
+            self.get_position(page[0]) if has_previous and page else None
+        )
+        return page
+
+    def get_position(self, obj):
+        return (obj.pub_date.isoformat(), obj.pk)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode()).decode())
+            pub_date = parse_datetime(cursor['d'])
+            position = (pub_date, int(cursor['i']))
+            reverse = bool(cursor.get('r'))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if pub_date is None:
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def get_cursor_link(self, position, reverse):
+        if position is None:
+            return None
+        cursor = {'d': position[0], 'i': position[1]}
+        if reverse:
+            cursor['r'] = 1
+        encoded = urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        url = remove_query_param(url, self.offset_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded)
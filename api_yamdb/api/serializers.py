@@ -1,7 +1,38 @@
+from django.db import IntegrityError
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
 from api_yamdb.settings import REGEX_SIGNS, REGEX_ME
 from reviews.models import User, Title, Category, Genre, Review, Comment
+from .batch import PrefetchedRelatedField
+
+
+def get_requested_fields(request, available):
+    """Имена полей из параметра ?fields=a,b,... GET-запроса.
+
+    Неизвестные имена отбрасываются; None - параметра нет или в нём
+    нет ни одного известного поля.
+    """
+    if request is None or request.method != 'GET':
+        return None
+    value = request.query_params.get('fields')
+    if not value:
+        return None
+    requested = {name.strip() for name in value.split(',')}
+    return requested & set(available) or None
+
+
+class SparseFieldsMixin:
+    """Миксин сериализатора: в ответе только поля из ?fields=."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = get_requested_fields(
+            self.context.get('request'), self.fields
+        )
+        if requested:
+            for name in set(self.fields) - requested:
+                self.fields.pop(name)
 
 
 class UsersSerializer(serializers.ModelSerializer):
@@ -80,24 +111,51 @@ class TitleSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Title
-        fields = '__all__'
+        exclude = ('rating_sum',)
+
+
+class TitleBatchSerializer(TitleSerializer):
+    """Сериализатор элемента пакетного создания Произведений."""
+    category = PrefetchedRelatedField(
+        lookup='slug',
+        queryset=Category.objects.all(),
+    )
+    genre = PrefetchedRelatedField(
+        lookup='slug',
+        queryset=Genre.objects.all(),
+        many=True,
+    )
 
 
-class TitleSerializerGet(serializers.ModelSerializer):
+class TitleSerializerGet(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор для метода GET модели Произведение."""
     category = CategorySerializer(read_only=True)
     genre = GenreSerializer(read_only=True, many=True)
-    rating = serializers.IntegerField(
-        read_only=True,
-        default=0
-    )
+    rating = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Title
-        fields = '__all__'
+        exclude = ('rating_sum',)
+
+
+class TopTitleSerializer(serializers.ModelSerializer):
+    """Краткое представление Произведения в статистике."""
+    rating = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Title
+        fields = ('id', 'name', 'year', 'rating')
+
 
+class CollectionStatsSerializer(serializers.Serializer):
+    """Сериализатор статистики Категории/Жанра."""
+    titles_count = serializers.IntegerField(read_only=True)
+    reviews_count = serializers.IntegerField(read_only=True)
+    rating = serializers.IntegerField(read_only=True)
+    top_titles = TopTitleSerializer(many=True, read_only=True)
 
-class ReviewSerializers(serializers.ModelSerializer):
+
+class ReviewSerializers(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор модели review."""
     author = serializers.SlugRelatedField(
         slug_field='username',
@@ -105,24 +163,57 @@ class ReviewSerializers(serializers.ModelSerializer):
         read_only=True,
     )
 
-    def validate(self, data):
-        """Валидация на повторный отзыв."""
-        if self.context.get('request').method != 'POST':
-            return data
-        author = self.context.get('request').user
-        title_id = self.context.get('view').kwargs.get('title_id')
-        if Review.objects.filter(author=author, title=title_id).exists():
-            raise serializers.ValidationError(
-                'Вы уже оставляли отзыв на это произведение.'
-            )
-        return data
+    def create(self, validated_data):
+        """Повторный отзыв отсекает ограничение unique_review в БД.
+
+        Остальные ошибки целостности (CHECK, счётчики) пробрасываются.
+        """
+        try:
+            return super().create(validated_data)
+        except IntegrityError:
+            if not Review.objects.filter(
+                author=validated_data['author'],
+                title=validated_data['title'],
+            ).exists():
+                raise
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Вы уже оставляли отзыв на это произведение.'
+                ]
+            })
 
     class Meta:
         model = Review
         exclude = ('title',)
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class ReviewSearchSerializer(ReviewSerializers):
+    """Сериализатор результатов поиска по Отзывам."""
+
+    class Meta:
+        model = Review
+        fields = ('id', 'title', 'text', 'author', 'score', 'pub_date')
+
+
+class ReviewBatchSerializer(ReviewSearchSerializer):
+    """Сериализатор элемента пакетного создания Отзывов.
+
+    context['reviewed'] - id Произведений, на которые автор уже оставил
+    отзыв; пополняется по мере проверки элементов пакета.
+    """
+    title = PrefetchedRelatedField(queryset=Title.objects.all())
+
+    def validate(self, attrs):
+        reviewed = self.context['reviewed']
+        if attrs['title'].pk in reviewed:
+            raise serializers.ValidationError(
+                'Вы уже оставляли отзыв на это произведение.'
+            )
+        reviewed.add(attrs['title'].pk)
+        return attrs
+
+
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор модели comment."""
     author = serializers.SlugRelatedField(
         slug_field='username',
@@ -137,3 +228,12 @@ class CommentSerializer(serializers.ModelSerializer):
             'author',
             'pub_date'
         )
+
+
+class CommentBatchSerializer(CommentSerializer):
+    """Сериализатор элемента пакетного создания Комментариев."""
+    review = PrefetchedRelatedField(queryset=Review.objects.all())
+
+    class Meta:
+        model = Comment
+        fields = ('id', 'review', 'text', 'author', 'pub_date')
@@ -0,0 +1,115 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import (
+    Category, Comment, Genre, Review, Title, TitleGenre, User
+)
+from reviews.signals import bulk_loaded, deleting_reviews
+from . import cache
+
+# Пространства имён кэша ответов, зависящие от данных модели.
+CACHE_DEPENDENCIES = {
+    Title: ('titles',),
+    TitleGenre: ('titles',),
+    Review: ('titles',),
+    Category: ('categories', 'titles'),
+    Genre: ('genres', 'titles'),
+}
+
+
+def comment_namespaces(comment):
+    """Комментарии Отзыва и Отзывы Произведения: счётчик комментариев
+    входит в ответ Отзыва.
+
+    Произведение берётся из загруженного Отзыва (создание через API),
+    иначе сбрасываются Отзывы всех Произведений - без запроса на каждый
+    Комментарий. При каскадном удалении вместе с Отзывом его
+    пространства имён сбрасывает сам Отзыв.
+    """
+    if comment.review_id in deleting_reviews():
+        return (f'comments:{comment.review_id}',)
+    if Comment.review.is_cached(comment):
+        return (
+            f'comments:{comment.review_id}',
+            f'reviews:{comment.review.title_id}',
+        )
+    return (f'comments:{comment.review_id}', 'reviews')
+
+
+# Пространства имён Отзывов Произведения и Комментариев Отзыва,
+# зависящие от конкретного объекта.
+INSTANCE_DEPENDENCIES = {
+    Title: lambda title: (f'reviews:{title.pk}',),
+    Review: lambda review: (
+        f'reviews:{review.title_id}', f'comments:{review.pk}'
+    ),
+    Comment: comment_namespaces,
+}
+
+# Общие пространства имён, сбрасываемые при массовой загрузке без
+# списка объектов.
+BULK_DEPENDENCIES = {
+    Title: ('reviews',),
+    Review: ('reviews', 'comments'),
+    Comment: ('comments', 'reviews'),
+}
+
+
+@receiver(bulk_loaded)
+def invalidate_response_cache(sender, instance=None, objs=None, **kwargs):
+    """Сброс кэша ответов после фиксации изменений в БД."""
+    namespaces = set(CACHE_DEPENDENCIES.get(sender, ()))
+    get_namespaces = INSTANCE_DEPENDENCIES.get(sender)
+    if get_namespaces is not None:
+        if instance is not None:
+            namespaces.update(get_namespaces(instance))
+        elif objs is not None:
+            for obj in objs:
+                namespaces.update(get_namespaces(obj))
+        else:
+            namespaces.update(BULK_DEPENDENCIES[sender])
+    if namespaces:
+        transaction.on_commit(partial(cache.invalidate, *namespaces))
+
+
+# Только модели из словарей выше: удаление остальных (сессии, журнал
+# Админки) остаётся быстрым, без загрузки объектов.
+for model in {**CACHE_DEPENDENCIES, **INSTANCE_DEPENDENCIES}:
+    post_save.connect(invalidate_response_cache, sender=model)
+    post_delete.connect(invalidate_response_cache, sender=model)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_author_names(sender, created=False, **kwargs):
+    """Имена авторов входят в ответы Отзывов и Комментариев.
+
+    Новый пользователь ещё не автор, поэтому регистрация кэш не
+    сбрасывает.
+    """
+    if not created:
+        transaction.on_commit(
+            partial(cache.invalidate, 'reviews', 'comments')
+        )
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, action, **kwargs):
+    """Сброс кэша ответов при изменении Жанров Произведения."""
+    if action.startswith('post_'):
+        invalidate_response_cache(sender)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=Title)
+def forget_parent(sender, instance, created=False, **kwargs):
+    """Сброс кэша родителя вложенных URL (api.mixins.NestedParentMixin):
+    Произведение или Отзыв удалены, либо Отзыв перенесён."""
+    if not created:
+        transaction.on_commit(
+            partial(cache.forget_parent, sender, instance.pk)
+        )
@@ -0,0 +1,229 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+_store = None
+_store_lock = threading.Lock()
+
+
+class LocalBucketStore:
+    """Корзины токенов в памяти процесса.
+
+    Подходит для одного процесса: у каждого воркера свои счётчики.
+    Полностью восстановившиеся корзины не отличаются от отсутствующих,
+    поэтому не реже раза в sweep_interval секунд они удаляются - иначе
+    запросы со случайными username/email раздували бы память воркера.
+    """
+
+    def __init__(self, sweep_interval=60):
+        # {ключ: (токены, время обновления, время полного восстановления)}
+        self.buckets = {}
+        self.counters = Counter()
+        self.lock = threading.Lock()
+        self.sweep_interval = sweep_interval
+        self.next_sweep = time.monotonic() + sweep_interval
+
+    def consume(self, key, capacity, rate):
+        """Списание токена из корзины key.
+
+        Возвращает 0, если токен списан, иначе время в секундах до
+        появления следующего токена.
+        """
+        now = time.monotonic()
+        with self.lock:
+            if now >= self.next_sweep:
+                self.sweep(now)
+            tokens, updated, _ = self.buckets.get(key, (capacity, now, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            wait = 0 if tokens >= 1 else (1 - tokens) / rate
+            if not wait:
+                tokens -= 1
+            self.buckets[key] = (
+                tokens, now, now + (capacity - tokens) / rate
+            )
+            return wait
+
+    def sweep(self, now):
+        """Удаление полностью восстановившихся корзин."""
+        self.buckets = {
+            key: bucket for key, bucket in self.buckets.items()
+            if bucket[2] > now
+        }
+        self.next_sweep = now + self.sweep_interval
+
+    def count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counters)
+
+
+class CacheBucketStore:
+    """Корзины токенов в кэше Django, общие для всех воркеров.
+
+    Чтение и запись корзины не атомарны, поэтому при одновременных
+    запросах с одним ключом лимит может быть превышен на число воркеров.
+    """
+
+    def __init__(self, alias='default', prefix='throttle'):
+        self.alias = alias
+        self.prefix = prefix
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def consume(self, key, capacity, rate):
+        now = time.time()
+        cache_key = f'{self.prefix}:bucket:{key}'
+        tokens, updated = self.cache.get(cache_key, (capacity, now))
+        tokens = min(capacity, tokens + max(0, now - updated) * rate)
+        # Корзина полностью восстанавливается за capacity / rate секунд,
+        # дольше её хранить незачем.
+        timeout = int(capacity / rate) + 1
+        if tokens >= 1:
+            self.cache.set(cache_key, (tokens - 1, now), timeout)
+            return 0
+        self.cache.set(cache_key, (tokens, now), timeout)
+        return (1 - tokens) / rate
+
+    def count(self, name):
+        names_key = f'{self.prefix}:names'
+        names = self.cache.get(names_key, set())
+        if name not in names:
+            self.cache.set(names_key, names | {name}, timeout=None)
+        key = f'{self.prefix}:count:{name}'
+        if not self.cache.add(key, 1, timeout=None):
+            try:
+                self.cache.incr(key)
+            except ValueError:
+                self.cache.add(key, 1, timeout=None)
+
+    def stats(self):
+        names = self.cache.get(f'{self.prefix}:names', set())
+        counters = self.cache.get_many(
+            f'{self.prefix}:count:{name}' for name in names
+        )
+        return {
+            name: counters.get(f'{self.prefix}:count:{name}', 0)
+            for name in names
+        }
+
+
+def get_store():
+    """Хранилище корзин, настроенное в settings.THROTTLE_STORE."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            backend = import_string(settings.THROTTLE_STORE['BACKEND'])
+            _store = backend(**settings.THROTTLE_STORE.get('OPTIONS', {}))
+        return _store
+
+
+@receiver(setting_changed)
+def reset_store(setting, **kwargs):
+    global _store
+    if setting == 'THROTTLE_STORE':
+        with _store_lock:
+            _store = None
+
+
+def stats():
+    """Количество пропущенных и отклонённых запросов по scope."""
+    result = {}
+    for name, value in sorted(get_store().stats().items()):
+        scope, outcome = name.rsplit(':', 1)
+        result.setdefault(scope, {'allowed': 0, 'throttled': 0})
+        result[scope][outcome] = value
+    return result
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """Ограничение частоты запросов по алгоритму корзины токенов.
+
+    Лимит "N/период" из DEFAULT_THROTTLE_RATES задаёт размер корзины N
+    и скорость её пополнения N токенов за период: допускается всплеск
+    до N запросов, дальше - не чаще одного запроса в период / N.
+    """
+
+    def get_rate(self):
+        # THROTTLE_RATES в DRF читается один раз при импорте модуля.
+        self.THROTTLE_RATES = api_settings.DEFAULT_THROTTLE_RATES
+        return super().get_rate()
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        store = get_store()
+        self.wait_time = store.consume(
+            self.key, self.num_requests, self.num_requests / self.duration
+        )
+        outcome = 'throttled' if self.wait_time else 'allowed'
+        store.count(f'{self.scope}:{outcome}')
+        return not self.wait_time
+
+    def wait(self):
+        return self.wait_time
+
+    def get_identity(self, request):
+        """Идентификатор клиента для ключа корзины или None."""
+        raise NotImplementedError
+
+    def get_cache_key(self, request, view):
+        identity = self.get_identity(request)
+        if not identity:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': identity}
+
+
+class IPThrottle(TokenBucketThrottle):
+    """Лимит по IP-адресу клиента."""
+
+    def get_identity(self, request):
+        return self.get_ident(request)
+
+
+class IdentityThrottle(TokenBucketThrottle):
+    """Лимит по username/email из тела запроса."""
+    identity_fields = ('username', 'email')
+
+    def get_identity(self, request):
+        data = request.data if hasattr(request.data, 'get') else {}
+        values = [
+            str(data.get(field, '')).strip().lower()
+            for field in self.identity_fields
+        ]
+        if not any(values):
+            return None
+        return hashlib.md5('|'.join(values).encode()).hexdigest()
+
+
+class SignupIPThrottle(IPThrottle):
+    scope = 'signup_ip'
+
+
+class SignupIdentityThrottle(IdentityThrottle):
+    scope = 'signup_identity'
+
+
+class TokenIPThrottle(IPThrottle):
+    scope = 'token_ip'
+
+
+class TokenIdentityThrottle(IdentityThrottle):
+    scope = 'token_identity'
+    identity_fields = ('username',)
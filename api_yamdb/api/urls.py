@@ -1,8 +1,13 @@
+from django.conf import settings
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from .async_views import async_urls
+
 from .views import (AuthViewSet, UsersViewSet, CommentViewSet,
-                    CategoryViewSet, GenreViewSet, TitleViewSet, ReviewViewSet)
+                    CategoryViewSet, GenreViewSet, TitleViewSet, ReviewViewSet,
+                    MetricsView, ExportViewSet, ReviewSearchViewSet,
+                    BatchViewSet)
 
 app_name = 'api'
 
@@ -21,8 +26,20 @@ router_v1.register(
     CommentViewSet,
     basename='comments'
 )
+router_v1.register(
+    r'search/reviews', ReviewSearchViewSet, basename='review-search'
+)
 router_v1.register(r'auth', AuthViewSet, basename='auth')
+router_v1.register(r'export', ExportViewSet, basename='export')
+router_v1.register(r'batch', BatchViewSet, basename='batch')
+
+router_v1_urls = router_v1.urls
+if settings.ASYNC_READ_VIEWS:
+    router_v1_urls = async_urls(
+        router_v1_urls, (TitleViewSet, ReviewViewSet, CommentViewSet)
+    )
 
 urlpatterns = [
-    path('v1/', include(router_v1.urls)),
+    path('v1/metrics/', MetricsView.as_view(), name='metrics'),
+    path('v1/', include(router_v1_urls)),
 ]
@@ -1,9 +1,15 @@
 from django.core.mail import send_mail
 
+from api_yamdb.tasks import get_queue
+
 
 def send_mail_confirmation_code(user, confirmation_code):
-    """Отправка кода подтверждения пользователю на почту."""
-    send_mail(
+    """Отправка кода подтверждения пользователю на почту.
+
+    Письмо ставится в очередь фоновых задач, запрос не ждёт отправки.
+    """
+    get_queue().submit(
+        send_mail,
         subject='Код подтверждения для доступа к API.',
         message=(
             f'Доброе время суток, {user.username}.\n'
@@ -11,5 +17,4 @@ def send_mail_confirmation_code(user, confirmation_code):
         ),
         recipient_list=[user.email],
         from_email='test@mail.ru',
-        fail_silently=True,
     )
@@ -1,14 +1,21 @@
-from django.db.models import Avg
 from django.contrib.auth.tokens import default_token_generator
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
 from rest_framework import status, viewsets, filters
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
 
-from reviews.models import User, Category, Genre, Title, Review, Comment
-from .filters import TitleFilter
+from api_yamdb.tasks import get_queue
+from reviews.models import (
+    User, Category, Genre, Title, TitleGenre, Review, Comment
+)
+from reviews.search import get_search_backend
+from .filters import TitleFilter, TopTitleFilter
 from .permissions import (
     AdminOnly, IsAdminOrReadOnly,
     IsAuthorAdminModerOrReadOnly
@@ -16,13 +23,21 @@ from .permissions import (
 from .serializers import (
     UsersSerializer, NotAdminSerializer, GetTokenSerializer, SignUpSerializer,
     CategorySerializer, GenreSerializer, TitleSerializer, TitleSerializerGet,
-    ReviewSerializers, CommentSerializer
+    ReviewSerializers, ReviewSearchSerializer, CommentSerializer,
+    TitleBatchSerializer, ReviewBatchSerializer, CommentBatchSerializer
+)
+from . import cache, export, metrics, throttling
+from .batch import bulk_insert, prefetch_related_values
+from .authentication import get_access_token, load_full_user
+from .mixins import (
+    CachedResponseMixin, CategoryGenreMixin, NestedParentMixin,
+    SerializerTimingMixin, SparseQuerysetMixin
 )
-from .mixins import CategoryGenreMixin
+from .pagination import ReviewCommentPagination
 from .utils import send_mail_confirmation_code
 
 
-class UsersViewSet(viewsets.ModelViewSet):
+class UsersViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     """Вьюсет для модели Пользователя."""
     queryset = User.objects.all()
     serializer_class = UsersSerializer
@@ -38,16 +53,17 @@ class UsersViewSet(viewsets.ModelViewSet):
         permission_classes=(IsAuthenticated,),
         url_path='me')
     def get_current_user_info(self, request):
-        serializer = UsersSerializer(request.user)
+        user = load_full_user(request.user)
+        serializer = UsersSerializer(user)
         if request.method == 'GET':
             return Response(serializer.data)
         serializer = NotAdminSerializer(
-            request.user,
+            user,
             data=request.data,
             partial=True
         )
         serializer.is_valid(raise_exception=True)
-        serializer.save(role=request.user.role)
+        serializer.save(role=user.role)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -56,6 +72,9 @@ class AuthViewSet(viewsets.GenericViewSet):
     @action(
         methods=['POST'],
         detail=False,
+        throttle_classes=(
+            throttling.TokenIPThrottle, throttling.TokenIdentityThrottle
+        ),
         url_path='token')
     def get_token(self, request):
         serializer = GetTokenSerializer(data=request.data)
@@ -66,7 +85,7 @@ class AuthViewSet(viewsets.GenericViewSet):
             user,
             data.get('confirmation_code')
         ):
-            token = RefreshToken.for_user(user).access_token
+            token = get_access_token(user)
             return Response({'token': str(token)},
                             status=status.HTTP_200_OK)
         return Response(
@@ -77,6 +96,9 @@ class AuthViewSet(viewsets.GenericViewSet):
         methods=['POST'],
         detail=False,
         permission_classes=(AllowAny,),
+        throttle_classes=(
+            throttling.SignupIPThrottle, throttling.SignupIdentityThrottle
+        ),
         url_path='signup')
     def signup(self, request):
         user = User.objects.filter(
@@ -100,22 +122,68 @@ class CategoryViewSet(CategoryGenreMixin):
     """Вьюсет для модели Категория."""
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_namespace = 'categories'
 
 
 class GenreViewSet(CategoryGenreMixin):
     """Вьюсет для модели Жанр."""
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_namespace = 'genres'
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(CachedResponseMixin, SparseQuerysetMixin,
+                   SerializerTimingMixin, viewsets.ModelViewSet):
     """Вьюсет для модели Произведение."""
-    queryset = Title.objects.annotate(rating=Avg('reviews__score'))
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre')
     serializer_class = TitleSerializer
     permission_classes = (IsAdminOrReadOnly,)
     filterset_class = TitleFilter
     search_fields = ('year',)
     http_method_names = ['get', 'post', 'patch', 'delete']
+    cache_namespace = 'titles'
+    top_limit = 10
+    top_max_limit = 100
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    @action(methods=['GET'], detail=False)
+    def top(self, request):
+        """Произведения с наивысшим рейтингом.
+
+        Параметры: category, genre, year_min, year_max, min_reviews
+        (по умолчанию 1) и limit (до top_max_limit). Порядок совпадает
+        с индексом по сохранённому рейтингу, поэтому время ответа не
+        зависит от общего числа Произведений.
+        """
+        return self.get_cached_response(self.get_top, request)
+
+    def get_top(self, request):
+        filterset = TopTitleFilter(
+            request.query_params,
+            queryset=self.get_queryset().filter(rating__isnull=False),
+            request=request,
+        )
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        limit = request.query_params.get('limit', self.top_limit)
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            limit = 0
+        if not 0 < limit <= self.top_max_limit:
+            raise ValidationError({'limit': [
+                f'Ожидается число от 1 до {self.top_max_limit}.'
+            ]})
+        titles = filterset.qs.order_by(
+            '-rating', '-reviews_count', 'pk'
+        )[:limit]
+        return Response(self.get_serializer(titles, many=True).data)
 
     def get_serializer_class(self):
         if self.request.method == 'GET':
@@ -123,23 +191,24 @@ class TitleViewSet(viewsets.ModelViewSet):
         return TitleSerializer
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(CachedResponseMixin, SparseQuerysetMixin,
+                    NestedParentMixin, SerializerTimingMixin,
+                    viewsets.ModelViewSet):
     """ViewSet модели Отзывы."""
     queryset = Review.objects.all()
     serializer_class = ReviewSerializers
     permission_classes = (IsAuthorAdminModerOrReadOnly,)
+    pagination_class = ReviewCommentPagination
     http_method_names = ['get', 'post', 'patch', 'delete']
+    parent_model = Title
+    parent_field = 'title'
+    parent_lookups = {'pk': 'title_id'}
 
-    def get_title(self):
-        title_id = self.kwargs.get('title_id')
-        return get_object_or_404(
-            Title,
-            pk=title_id
-        )
+    def get_cache_namespaces(self):
+        return ('reviews', f'reviews:{self.kwargs.get("title_id")}')
 
-    def get_queryset(self):
-        title = self.get_title()
-        return title.reviews.all()
+    def get_title(self):
+        return self.get_parent()
 
     def perform_create(self, serializer):
         title = self.get_title()
@@ -149,25 +218,24 @@ class ReviewViewSet(viewsets.ModelViewSet):
         )
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(CachedResponseMixin, SparseQuerysetMixin,
+                     NestedParentMixin, SerializerTimingMixin,
+                     viewsets.ModelViewSet):
     """ViewSet модели Комментарии."""
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
     permission_classes = (IsAuthorAdminModerOrReadOnly,)
+    pagination_class = ReviewCommentPagination
     http_method_names = ['get', 'post', 'patch', 'delete']
+    parent_model = Review
+    parent_field = 'review'
+    parent_lookups = {'pk': 'reviews_id', 'title_id': 'title_id'}
 
-    def get_review(self):
-        title_id = self.kwargs.get('title_id')
-        review_id = self.kwargs.get('reviews_id')
-        return get_object_or_404(
-            Review,
-            pk=review_id,
-            title__id=title_id
-        )
+    def get_cache_namespaces(self):
+        return ('comments', f'comments:{self.kwargs.get("reviews_id")}')
 
-    def get_queryset(self):
-        review = self.get_review()
-        return review.comments.all()
+    def get_review(self):
+        return self.get_parent()
 
     def perform_create(self, serializer):
         review = self.get_review()
@@ -175,3 +243,196 @@ class CommentViewSet(viewsets.ModelViewSet):
             review=review,
             author=self.request.user
         )
+
+
+class ReviewSearchViewSet(SerializerTimingMixin,
+                          viewsets.mixins.ListModelMixin,
+                          viewsets.GenericViewSet):
+    """Полнотекстовый поиск по Отзывам.
+
+    Обязательный параметр q - строка поиска, title - id Произведения.
+    Результаты отсортированы по релевантности.
+    """
+    queryset = Review.objects.select_related('author')
+    serializer_class = ReviewSearchSerializer
+
+    def get_queryset(self):
+        query = self.request.query_params.get('q', '')
+        if not query.strip():
+            raise ValidationError({'q': ['Обязательный параметр.']})
+        queryset = super().get_queryset()
+        title_id = self.request.query_params.get('title')
+        if title_id:
+            if not title_id.isdigit():
+                raise ValidationError({'title': ['Ожидается id.']})
+            queryset = queryset.filter(title_id=title_id)
+        return get_search_backend().search(queryset, query)
+
+
+class BatchViewSet(SerializerTimingMixin, viewsets.GenericViewSet):
+    """Пакетное создание Произведений, Отзывов и Комментариев.
+
+    Тело запроса - список элементов (не больше max_batch_size). Пакет
+    проверяется целиком: при ошибках ответ 400 содержит список ошибок
+    в порядке элементов ({} для корректных) и ничего не создаётся.
+    Связанные объекты всех элементов загружаются одним запросом на
+    поле, созданные объекты вставляются через bulk_create в одной
+    транзакции.
+    """
+    permission_classes = (IsAuthenticated,)
+    max_batch_size = 1000
+    serializer_classes = {
+        'titles': TitleBatchSerializer,
+        'reviews': ReviewBatchSerializer,
+        'comments': CommentBatchSerializer,
+    }
+
+    def get_serializer_class(self):
+        return self.serializer_classes[self.action]
+
+    def get_valid_serializer(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                'Ожидается непустой список.'
+            ]})
+        if len(items) > self.max_batch_size:
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                f'Не больше {self.max_batch_size} элементов в пакете.'
+            ]})
+        context = self.get_serializer_context()
+        context['prefetched'] = prefetch_related_values(
+            self.get_serializer_class()(), items
+        )
+        if self.action == 'reviews':
+            titles = context['prefetched'].get((Title, 'pk'), {}).values()
+            context['reviewed'] = set(Review.objects.filter(
+                author=request.user, title__in=titles
+            ).values_list('title_id', flat=True))
+        serializer = self.get_serializer(
+            data=items, many=True, context=context
+        )
+        serializer.is_valid(raise_exception=True)
+        return serializer
+
+    @action(methods=['POST'], detail=False, permission_classes=(AdminOnly,))
+    def titles(self, request):
+        serializer = self.get_valid_serializer(request)
+        titles = []
+        genres = []
+        for attrs in serializer.validated_data:
+            attrs = dict(attrs)
+            genres.append(dict.fromkeys(attrs.pop('genre')))
+            titles.append(Title(**attrs))
+        with transaction.atomic():
+            bulk_insert(Title, titles)
+            bulk_insert(TitleGenre, [
+                TitleGenre(title=title, genre=genre)
+                for title, title_genres in zip(titles, genres)
+                for genre in title_genres
+            ])
+        titles = Title.objects.filter(
+            pk__in=[title.pk for title in titles]
+        ).select_related('category').prefetch_related('genre').order_by('pk')
+        return Response(
+            TitleSerializerGet(titles, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
+
+    @action(methods=['POST'], detail=False)
+    def reviews(self, request):
+        serializer = self.get_valid_serializer(request)
+        reviews = [
+            Review(author=request.user, **attrs)
+            for attrs in serializer.validated_data
+        ]
+        try:
+            with transaction.atomic():
+                bulk_insert(Review, reviews)
+        except IntegrityError:
+            # Повторы отсеяны при проверке пакета; здесь остаётся только
+            # отзыв, созданный параллельным запросом. Остальные ошибки
+            # целостности - не ошибки клиента.
+            if not Review.objects.filter(
+                author=request.user,
+                title__in=[review.title for review in reviews],
+            ).exists():
+                raise
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                'Вы уже оставляли отзыв на это произведение.'
+            ]})
+        return Response(
+            self.get_serializer(reviews, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
+
+    @action(methods=['POST'], detail=False)
+    def comments(self, request):
+        serializer = self.get_valid_serializer(request)
+        comments = [
+            Comment(author=request.user, **attrs)
+            for attrs in serializer.validated_data
+        ]
+        with transaction.atomic():
+            bulk_insert(Comment, comments)
+        return Response(
+            self.get_serializer(comments, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
+
+
+class MetricsView(APIView):
+    """Служебные метрики API, доступно только Администратору."""
+    permission_classes = (AdminOnly,)
+
+    def get(self, request):
+        return Response({
+            'requests': metrics.snapshot(),
+            'response_cache': cache.stats(),
+            'task_queue': get_queue().stats(),
+            'throttling': throttling.stats(),
+        })
+
+
+class ExportViewSet(viewsets.ViewSet):
+    """Потоковая выгрузка данных в CSV/NDJSON, только для Администратора.
+
+    Формат задаётся параметром output (csv по умолчанию).
+    """
+    permission_classes = (AdminOnly,)
+    chunk_size = 2000
+    formats = {
+        'csv': (export.render_csv, 'text/csv; charset=utf-8'),
+        'ndjson': (export.render_ndjson, 'application/x-ndjson'),
+    }
+
+    def stream(self, request, name, rows, fields):
+        output = request.query_params.get('output', 'csv')
+        if output not in self.formats:
+            supported = ', '.join(self.formats)
+            return Response(
+                {'output': f'Поддерживаемые форматы: {supported}.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        render, content_type = self.formats[output]
+        response = StreamingHttpResponse(
+            render(rows, fields), content_type=content_type
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{name}.{output}"'
+        )
+        return response
+
+    @action(methods=['GET'], detail=False)
+    def titles(self, request):
+        return self.stream(
+            request, 'titles',
+            export.iter_titles(self.chunk_size), export.TITLE_FIELDS
+        )
+
+    @action(methods=['GET'], detail=False)
+    def reviews(self, request):
+        return self.stream(
+            request, 'reviews',
+            export.iter_reviews(self.chunk_size), export.REVIEW_FIELDS
+        )
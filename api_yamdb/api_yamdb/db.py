@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def set_sqlite_pragmas(sender, connection, **kwargs):
+    """PRAGMA из settings.SQLITE_PRAGMAS для нового соединения SQLite.
+
+    Выполняются на соединении sqlite3 напрямую, как PRAGMA foreign_keys
+    в самом Django, и не попадают в счётчики запросов.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(request_started)
+def check_connections(**kwargs):
+    """Закрытие оборвавшихся постоянных соединений перед запросом.
+
+    Замена CONN_HEALTH_CHECKS из Django 4.1: соединение с
+    CONN_HEALTH_CHECKS в настройках БД проверяется is_usable(), и
+    нерабочее закрывается, чтобы запрос открыл новое, а не получил
+    ошибку. Проверяются только уже открытые соединения вне транзакции.
+    is_usable() - обращение к БД на каждый запрос, поэтому проверка
+    включается явно (DB_CONN_HEALTH_CHECKS=1).
+    """
+    for connection in connections.all():
+        if (
+            connection.settings_dict.get('CONN_HEALTH_CHECKS')
+            and connection.connection is not None
+            and not connection.in_atomic_block
+            and not connection.is_usable()
+        ):
+            connection.close()
@@ -1,3 +1,5 @@
+import os
+
 from django.core.validators import RegexValidator
 
 from datetime import timedelta
@@ -22,6 +24,7 @@ REGEX_ME = RegexValidator(r'[^m][^e]', 'Имя пользователя не м
 NAME_MAX_LENGTH = 150
 TEXT_NAME_MAX_LENGTH = 256
 ROLE_MAX_LENGTH = 64
+CHOICE_MAX_LENGTH = 16
 SLUG_MAX_LENGTH = 50
 MAX_LIMIT_VALUE = 10
 MIN_LIMIT_VALUE = 1
@@ -37,12 +40,12 @@ INSTALLED_APPS = [
     'rest_framework',
     'api.apps.ApiConfig',
     'reviews.apps.ReviewsConfig',
-    'import_export',
     'rest_framework_simplejwt',
     'django_filters'
 ]
 
 MIDDLEWARE = [
+    'api.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -75,13 +78,68 @@ WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 # Database
 
+# SQLite by default; DB_ENGINE=django.db.backends.postgresql with
+# DB_NAME/DB_USER/DB_PASSWORD/DB_HOST/DB_PORT for a server database.
+# Behind a transaction-mode pooler (pgbouncer) set
+# DB_DISABLE_SERVER_SIDE_CURSORS=1!
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'ENGINE': os.getenv('DB_ENGINE', 'django.db.backends.sqlite3'),
+        'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+        'USER': os.getenv('DB_USER', ''),
+        'PASSWORD': os.getenv('DB_PASSWORD', ''),
+        'HOST': os.getenv('DB_HOST', ''),
+        'PORT': os.getenv('DB_PORT', ''),
+        # Persistent connections: seconds to keep a connection open.
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        # Drop broken persistent connections before each request
+        # (see api_yamdb.db). Costs a round trip per request, so off by
+        # default.
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', '0') == '1',
+        'DISABLE_SERVER_SIDE_CURSORS': (
+            os.getenv('DB_DISABLE_SERVER_SIDE_CURSORS', '0') == '1'
+        ),
     }
 }
 
+# PRAGMA statements run on every new SQLite connection: WAL lets readers
+# work alongside the single writer, NORMAL sync is safe with WAL!
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+}
+
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Response cache for the catalogue (titles, categories, genres)!
+# Cache generations also drive ETag/Last-Modified. LocMemCache is per
+# process: with several workers a write is seen by other workers only
+# after RESPONSE_CACHE_TIMEOUT, so point the alias at a shared cache
+# (Redis, Memcached, database) in multi-process deployments!
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = 60 * 5
+
+# Seconds to remember that a title/review in a nested URL exists, so
+# review and comment lists skip the parent check (0 - always check)!
+PARENT_LOOKUP_CACHE_ALIAS = 'default'
+PARENT_LOOKUP_CACHE_TIMEOUT = int(
+    os.getenv('PARENT_LOOKUP_CACHE_TIMEOUT', '0')
+)
+
+# Under ASGI serve title/review/comment reads from async views that run
+# in a thread pool instead of the single sync thread (api.async_views)!
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', '0') == '1'
+
+# Rolling window of per-view request metrics (samples per view/action)!
+REQUEST_METRICS_WINDOW = 1000
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -117,14 +175,20 @@ STATIC_URL = '/static/'
 
 STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
+# Uploaded and exported files (import/export jobs)!
+MEDIA_URL = '/media/'
+
+MEDIA_ROOT = BASE_DIR / 'media'
+
 AUTH_USER_MODEL = 'reviews.User'
 
 DATETIME_INPUT_FORMATS = ['%Y-%m-%dT%H:%M:%S.%fZ']
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessJWTAuthentication',
     ],
+    'EXCEPTION_HANDLER': 'api.exceptions.exception_handler',
 
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 10,
@@ -132,8 +196,29 @@ REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': (
         'django_filters.rest_framework.DjangoFilterBackend',
     ),
+
+    # Token bucket: "N/period" = burst of N, refilled N per period.
+    'DEFAULT_THROTTLE_RATES': {
+        'signup_ip': '20/hour',
+        'signup_identity': '5/hour',
+        'token_ip': '60/min',
+        'token_identity': '10/min',
+    },
 }
 
+# Full-text search: FTS5SearchBackend (SQLite, falls back to LIKE on
+# other databases) or LikeSearchBackend!
+SEARCH_BACKEND = 'reviews.search.FTS5SearchBackend'
+
+# Throttle bucket store: LocalBucketStore (per process) or
+# CacheBucketStore (shared by all workers through a Django cache)!
+THROTTLE_STORE = {
+    'BACKEND': 'api.throttling.LocalBucketStore',
+}
+
+# Users are rebuilt from access token claims without a query: a deleted
+# or deactivated user keeps API access until the token expires, so
+# keep ACCESS_TOKEN_LIFETIME short!
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=50),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
@@ -143,3 +228,17 @@ SIMPLE_JWT = {
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+# Import/export jobs: rows per chunk (one transaction, one progress update)!
+DATA_JOB_CHUNK_SIZE = 2000
+
+# Background task queue (confirmation emails, import/export jobs)!
+TASK_QUEUE = {
+    'BACKEND': 'api_yamdb.tasks.ThreadPoolTaskQueue',
+    'OPTIONS': {
+        'max_workers': 4,
+        'max_size': 1000,
+        'retries': 3,
+        'retry_delay': 1,
+    },
+}
@@ -0,0 +1,146 @@
+import logging
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import close_old_connections
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+class BaseTaskQueue:
+    """Очередь фоновых задач с повторами и списком неудачных задач.
+
+    Задача, не выполненная за retries повторов, попадает в
+    dead_letters и записывается в лог.
+    """
+
+    def __init__(self, retries=3, retry_delay=1, dead_letters_size=100):
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.dead_letters = deque(maxlen=dead_letters_size)
+        self.counters = Counter()
+        self.lock = threading.Lock()
+
+    def submit(self, func, *args, **kwargs):
+        raise NotImplementedError
+
+    @property
+    def depth(self):
+        """Количество задач, ожидающих или выполняющихся сейчас."""
+        return 0
+
+    def count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def run(self, func, args, kwargs):
+        """Выполнение задачи с повторами при ошибке."""
+        for attempt in range(self.retries + 1):
+            try:
+                func(*args, **kwargs)
+            except Exception as error:
+                if attempt < self.retries:
+                    self.count('retried')
+                    time.sleep(self.retry_delay * 2 ** attempt)
+                    continue
+                self.count('failed')
+                self.dead_letters.append({
+                    'task': getattr(func, '__qualname__', repr(func)),
+                    'args': repr(args),
+                    'error': repr(error),
+                    'failed_at': timezone.now().isoformat(),
+                })
+                logger.exception(
+                    'Задача %r не выполнена после %d попыток.',
+                    func, attempt + 1
+                )
+            else:
+                self.count('completed')
+            return
+
+    def stats(self):
+        with self.lock:
+            counters = dict(self.counters)
+        return {
+            'depth': self.depth,
+            'dead_letters': list(self.dead_letters),
+            **counters,
+        }
+
+
+class ImmediateTaskQueue(BaseTaskQueue):
+    """Выполнение задач сразу в вызывающем потоке (разработка, тесты)."""
+
+    def submit(self, func, *args, **kwargs):
+        self.count('submitted')
+        self.run(func, args, kwargs)
+
+
+class ThreadPoolTaskQueue(BaseTaskQueue):
+    """Ограниченный пул потоков внутри процесса.
+
+    В очереди не больше max_size задач; если она заполнена, задача
+    выполняется в вызывающем потоке.
+    """
+
+    def __init__(self, max_workers=4, max_size=1000, **options):
+        super().__init__(**options)
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='task-queue'
+        )
+        self.slots = threading.BoundedSemaphore(max_size)
+        self.pending = 0
+
+    @property
+    def depth(self):
+        return self.pending
+
+    def submit(self, func, *args, **kwargs):
+        self.count('submitted')
+        if not self.slots.acquire(blocking=False):
+            self.count('overflow')
+            logger.warning(
+                'Очередь задач заполнена, %r выполняется синхронно.', func
+            )
+            self.run(func, args, kwargs)
+            return
+        with self.lock:
+            self.pending += 1
+        self.executor.submit(self.work, func, args, kwargs)
+
+    def work(self, func, args, kwargs):
+        try:
+            self.run(func, args, kwargs)
+        finally:
+            close_old_connections()
+            with self.lock:
+                self.pending -= 1
+            self.slots.release()
+
+
+def get_queue():
+    """Очередь задач, настроенная в settings.TASK_QUEUE."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            backend = import_string(settings.TASK_QUEUE['BACKEND'])
+            _queue = backend(**settings.TASK_QUEUE.get('OPTIONS', {}))
+        return _queue
+
+
+@receiver(setting_changed)
+def reset_queue(setting, **kwargs):
+    global _queue
+    if setting == 'TASK_QUEUE':
+        with _queue_lock:
+            _queue = None
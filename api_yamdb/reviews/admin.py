@@ -1,7 +1,17 @@
 from django.contrib import admin
-from import_export.admin import ImportExportActionModelAdmin
+from django.contrib.admin import helpers
+from django.core.exceptions import PermissionDenied
+from django.db.models import Q
+from django.http import FileResponse, Http404, HttpResponseRedirect
+from django.urls import path, reverse
+from django.utils.html import format_html, format_html_join
 
-from .models import User, Category, Genre, Title, TitleGenre, Review, Comment
+from .jobs import submit_job
+from .models import (
+    EXPORT, IMPORT, JOB_MODELS, User, Category, Genre, Title, TitleGenre,
+    Review, Comment, DataJob
+)
+from .search import get_search_backend
 
 
 @admin.display(description='Текст')
@@ -10,25 +20,88 @@ def trim_field_text(obj):
     return f"{obj.text[:150]}..."
 
 
-@admin.display(description='Комментариев')
+@admin.display(description='Комментариев', ordering='comments_count')
 def comment_count(obj):
-    """Количество комментариев в отзыве."""
-    return obj.comments.count()
+    """Количество комментариев в отзыве (сохранённый счётчик)."""
+    return obj.comments_count
 
 
-@admin.display(description='Отзывов')
+@admin.display(description='Отзывов', ordering='reviews_count')
 def review_count(obj):
-    """Количество отзывов в произведении."""
-    return obj.reviews.count()
+    """Количество отзывов в произведении (сохранённый счётчик)."""
+    return obj.reviews_count
 
 
-class ImportExportAdmin(ImportExportActionModelAdmin, admin.ModelAdmin):
+class ImportExportAdmin(admin.ModelAdmin):
     """Добавление возможности импорта/экспорта данных из CSV-файлов
-    в БД из Админки."""
-    ...
+    в БД из Админки.
 
+    Импорт и экспорт выполняются фоновыми задачами DataJob: кнопка
+    IMPORT открывает форму загрузки файла, действие "Экспорт в CSV"
+    ставит выгрузку выбранных объектов в очередь.
+    """
+    change_list_template = 'admin/import_export_change_list.html'
+    actions = ('export_csv',)
 
-class ReviewAdmin(ImportExportAdmin):
+    @admin.action(description='Экспорт в CSV (фоновая задача)')
+    def export_csv(self, request, queryset):
+        """Выгрузка выбранных объектов без их загрузки в запросе.
+
+        В задаче сохраняются id отмеченных объектов, а для "выбрать
+        все" - параметры списка (поиск, фильтры); объекты выбираются
+        уже в фоне.
+        """
+        if request.POST.get('select_across') == '1':
+            selection = {'params': dict(request.GET.lists())}
+        else:
+            selection = {
+                'pks': request.POST.getlist(helpers.ACTION_CHECKBOX_NAME)
+            }
+        job = DataJob.objects.create(
+            kind=EXPORT, model_name=self.model._meta.model_name,
+            selection=selection, created_by=request.user
+        )
+        submit_job(job)
+        self.message_user(
+            request, f'Задача "{job}" поставлена в очередь.'
+        )
+        return HttpResponseRedirect(
+            reverse('admin:reviews_datajob_change', args=(job.pk,))
+        )
+
+
+class IndexedSearchMixin:
+    """Поиск в Админке по полнотекстовому индексу (reviews.search).
+
+    Для таблиц больше indexed_search_min_rows строк (оценка по
+    максимальному id) поиск по search_fields заменяется поиском по
+    индексу моделей из indexed_search: {модель: путь к ней от модели
+    Админки}. Без индекса (не SQLite) работает обычный поиск.
+    """
+    indexed_search = {}
+    indexed_search_min_rows = 10000
+
+    def use_indexed_search(self):
+        if not get_search_backend().is_indexed():
+            return False
+        max_pk = self.model.objects.order_by('-pk').values_list(
+            'pk', flat=True
+        ).first()
+        return (max_pk or 0) >= self.indexed_search_min_rows
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip() or not self.use_indexed_search():
+            return super().get_search_results(
+                request, queryset, search_term
+            )
+        backend = get_search_backend()
+        condition = Q()
+        for model, lookup in self.indexed_search.items():
+            condition |= backend.condition(model, search_term, lookup)
+        return queryset.filter(condition), False
+
+
+class ReviewAdmin(IndexedSearchMixin, ImportExportAdmin):
     """Настройка Админки-Отзывов + добавление возможности импорта/экспорта
     данных из CSV-файлов в БД из Админки."""
     list_display = (
@@ -41,7 +114,9 @@ class ReviewAdmin(ImportExportAdmin):
         comment_count
     )
     list_filter = ('pub_date',)
+    list_select_related = ('author', 'title')
     search_fields = ('title__name', 'text')
+    indexed_search = {Title: 'title', Review: 'pk'}
     ordering = ('-pub_date',)
 
 
@@ -56,6 +131,7 @@ class CommentAdmin(ImportExportAdmin):
         'pub_date',
     )
     list_filter = ('pub_date',)
+    list_select_related = ('author', 'review__author', 'review__title')
     search_fields = ('text',)
     ordering = ('-pub_date',)
 
@@ -66,7 +142,7 @@ class TitleGenreInline(admin.TabularInline):
     min_num = 1
 
 
-class TitleAdmin(ImportExportAdmin):
+class TitleAdmin(IndexedSearchMixin, ImportExportAdmin):
     """Настройка Админки-Произведений + добавление возможности импорта/экспорта
     данных из CSV-файлов в БД из Админки."""
 
@@ -84,10 +160,117 @@ class TitleAdmin(ImportExportAdmin):
         'get_genres',
         review_count
     )
+    list_select_related = ('category',)
     search_fields = ('name',)
+    indexed_search = {Title: 'pk'}
     list_filter = ('category',)
     empty_value_display = 'Не задано'
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related('genre')
+
+
+class DataJobAdmin(admin.ModelAdmin):
+    """Задачи импорта/экспорта: прогресс, ошибки строк и скачивание
+    результата. Новая задача здесь - импорт загруженного CSV-файла."""
+    list_display = (
+        'id',
+        'kind',
+        'model_name',
+        'status',
+        'progress',
+        'failed',
+        'created_at',
+        'download',
+    )
+    list_filter = ('kind', 'status', 'model_name')
+    list_select_related = ('created_by',)
+    readonly_fields = (
+        'kind', 'model_name', 'status', 'progress', 'failed', 'error_list',
+        'message', 'download', 'created_by', 'created_at', 'finished_at',
+    )
+
+    @admin.display(description='Прогресс')
+    def progress(self, obj):
+        if not obj.total:
+            return f'{obj.processed}'
+        return (
+            f'{obj.processed} / {obj.total} '
+            f'({obj.processed * 100 // obj.total}%)'
+        )
+
+    @admin.display(description='Ошибки строк')
+    def error_list(self, obj):
+        return format_html_join(
+            '\n', '<div>Строка {}: {}</div>',
+            ((error['line'], error['error']) for error in obj.errors)
+        )
+
+    @admin.display(description='Файл')
+    def download(self, obj):
+        if not obj.result:
+            return '-'
+        return format_html(
+            '<a href="{}">Скачать</a>',
+            reverse('admin:reviews_datajob_download', args=(obj.pk,))
+        )
+
+    def get_fields(self, request, obj=None):
+        if obj is None:
+            return ('model_name', 'source')
+        return self.readonly_fields
+
+    def get_readonly_fields(self, request, obj=None):
+        return () if obj is None else self.readonly_fields
+
+    def can_import(self, request, model_name):
+        """Импорт в модель - только с правом добавления её объектов."""
+        model_admin = self.admin_site._registry.get(JOB_MODELS[model_name])
+        return model_admin is not None and model_admin.has_add_permission(
+            request
+        )
+
+    def get_form(self, request, obj=None, **kwargs):
+        form = super().get_form(request, obj, **kwargs)
+        if obj is None:
+            form.base_fields['source'].required = True
+            field = form.base_fields['model_name']
+            field.choices = [
+                (name, label) for name, label in field.choices
+                if name and self.can_import(request, name)
+            ]
+        return form
+
+    def save_model(self, request, obj, form, change):
+        if change:
+            return
+        if not self.can_import(request, obj.model_name):
+            raise PermissionDenied
+        obj.kind = IMPORT
+        obj.created_by = request.user
+        super().save_model(request, obj, form, change)
+        submit_job(obj)
+
+    def get_urls(self):
+        return [
+            path(
+                '<int:job_id>/download/',
+                self.admin_site.admin_view(self.download_view),
+                name='reviews_datajob_download',
+            ),
+        ] + super().get_urls()
+
+    def download_view(self, request, job_id):
+        job = self.get_object(request, job_id)
+        if job is None or not job.result:
+            raise Http404('Результат задачи не найден.')
+        if not self.has_view_permission(request, job):
+            raise Http404('Результат задачи не найден.')
+        return FileResponse(
+            job.result.open('rb'), as_attachment=True,
+            filename=f'{job.model_name}-{job.pk}.csv'
+        )
+
 
 admin.site.register(Review, ReviewAdmin)
 admin.site.register(Comment, CommentAdmin)
@@ -96,3 +279,4 @@ admin.site.register(User, ImportExportAdmin)
 admin.site.register(Category, ImportExportAdmin)
 admin.site.register(Genre, ImportExportAdmin)
 admin.site.register(TitleGenre, ImportExportAdmin)
+admin.site.register(DataJob, DataJobAdmin)
@@ -0,0 +1,121 @@
+from django.db.models import Case, Count, F, FloatField, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce, Greatest
+
+from .models import Review, Title
+
+
+def update_rating(title_id, score_delta=0, count_delta=0):
+    """Инкрементальное изменение счётчиков рейтинга Произведения.
+
+    Средняя оценка пересчитывается в том же UPDATE: F-выражения
+    ссылаются на значения до обновления. Счётчики не опускаются ниже
+    нуля: расхождение (например, после прерванного импорта) не должно
+    ломать удаление, его исправляет rebuild_counters.
+    """
+    rating_sum = Greatest(F('rating_sum') + score_delta, 0)
+    reviews_count = Greatest(F('reviews_count') + count_delta, 0)
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=rating_sum,
+        reviews_count=reviews_count,
+        rating=Case(
+            When(
+                reviews_count__gt=-count_delta,
+                then=Cast(rating_sum, FloatField()) / reviews_count,
+            ),
+            default=Value(None),
+            output_field=FloatField(),
+        ),
+    )
+
+
+def update_comments_count(review_id, delta):
+    """Инкрементальное изменение счётчика комментариев Отзыва
+    (не ниже нуля, как в update_rating)."""
+    Review.objects.filter(pk=review_id).update(
+        comments_count=Greatest(F('comments_count') + delta, 0)
+    )
+
+
+def update_comments_counts(deltas):
+    """Изменение счётчиков комментариев нескольких Отзывов одним UPDATE.
+
+    deltas - словарь {id отзыва: изменение}.
+    """
+    if not deltas:
+        return
+    Review.objects.filter(pk__in=deltas).update(
+        comments_count=Greatest(F('comments_count') + Case(
+            *(
+                When(pk=review_id, then=Value(delta))
+                for review_id, delta in deltas.items()
+            ),
+            default=Value(0),
+        ), 0)
+    )
+
+
+def get_rating(rating_sum, reviews_count):
+    """Средняя оценка по счётчикам, без отзывов - None."""
+    return rating_sum / reviews_count if reviews_count else None
+
+
+def rebuild_counters(title_ids=None, fix=True):
+    """Пересчёт счётчиков рейтинга с нуля.
+
+    Возвращает список расхождений в виде
+    (id произведения, (сумма, количество) сохранённые, (сумма, количество)
+    фактические). Сохранённая средняя оценка проверяется и исправляется
+    вместе со счётчиками. title_ids ограничивает пересчёт указанными
+    произведениями, при fix=False расхождения только выявляются.
+    """
+    drift = []
+    titles = Title.objects.all()
+    if title_ids is not None:
+        titles = titles.filter(pk__in=title_ids)
+    titles = titles.annotate(
+        actual_sum=Coalesce(Sum('reviews__score'), 0),
+        actual_count=Count('reviews'),
+    ).values_list(
+        'id', 'rating_sum', 'reviews_count', 'rating',
+        'actual_sum', 'actual_count'
+    ).order_by('id')
+    for (title_id, stored_sum, stored_count, stored_rating,
+         actual_sum, actual_count) in titles.iterator():
+        if (
+            (stored_sum, stored_count) == (actual_sum, actual_count)
+            and stored_rating == get_rating(actual_sum, actual_count)
+        ):
+            continue
+        drift.append(
+            (title_id, (stored_sum, stored_count), (actual_sum, actual_count))
+        )
+        if fix:
+            Title.objects.filter(pk=title_id).update(
+                rating_sum=actual_sum,
+                reviews_count=actual_count,
+                rating=get_rating(actual_sum, actual_count),
+            )
+    return drift
+
+
+def rebuild_comment_counters(review_ids=None, fix=True):
+    """Пересчёт счётчиков комментариев Отзывов с нуля.
+
+    Возвращает список расхождений (id отзыва, сохранено, фактически);
+    review_ids и fix - как у rebuild_counters. Расхождения отбираются
+    в БД (HAVING), в память читаются только они.
+    """
+    reviews = Review.objects.all()
+    if review_ids is not None:
+        reviews = reviews.filter(pk__in=review_ids)
+    drift = list(reviews.annotate(
+        actual_count=Count('comments'),
+    ).exclude(
+        comments_count=F('actual_count'),
+    ).values_list('id', 'comments_count', 'actual_count').order_by('id'))
+    if fix:
+        for review_id, _, actual_count in drift:
+            Review.objects.filter(pk=review_id).update(
+                comments_count=actual_count
+            )
+    return drift
@@ -0,0 +1,328 @@
+import csv
+import io
+import logging
+import tempfile
+from functools import partial
+from itertools import islice
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.files import File
+from django.core.management.color import no_style
+from django.db import DatabaseError, connection, models, transaction
+from django.http import HttpRequest
+from django.utils import timezone
+
+from api_yamdb.tasks import get_queue
+from .models import (
+    DONE, EXPORT, FAILED, IMPORT, JOB_MODELS, PENDING, RUNNING, DataJob, User
+)
+from .signals import bulk_loaded
+
+logger = logging.getLogger(__name__)
+
+# Сколько ошибок строк сохраняется в задаче (остальные только считаются).
+MAX_ERRORS = 100
+
+
+def csv_fields(model, columns):
+    """Поля модели по заголовку CSV, FieldDoesNotExist для чужих колонок."""
+    fields = {column: model._meta.get_field(column) for column in columns}
+    for column, field in fields.items():
+        if not field.concrete:
+            raise FieldDoesNotExist(
+                f'{model.__name__} has no column named {column!r}'
+            )
+    return fields
+
+
+def build_object(model, fields, row):
+    """Объект модели из строки CSV, внешние ключи - по id.
+
+    Ошибка преобразования - ValidationError {колонка: сообщения}.
+    """
+    values = {}
+    for column, field in fields.items():
+        value = row[column]
+        try:
+            if field.is_relation:
+                value = field.target_field.to_python(value or None)
+            elif value == '' and field.null:
+                value = None
+            elif value == '' and field.has_default():
+                # Например, pub_date: значение по умолчанию - текущее время.
+                value = field.get_default()
+            else:
+                value = field.to_python(value)
+        except ValidationError as error:
+            raise ValidationError({column: error.messages})
+        values[field.attname] = value
+    if model is User and 'password' not in values:
+        values['password'] = make_password(None)
+    return model(**values)
+
+
+def export_fields(model):
+    """Поля для выгрузки: все, кроме вычисляемых и пароля.
+
+    Заголовок - имена полей, как в static/data, поэтому выгрузку можно
+    загрузить обратно импортом или командой load_csv.
+    """
+    return [
+        field for field in model._meta.concrete_fields
+        if field.name != 'password' and (
+            field.editable or field.primary_key
+            or isinstance(field, models.DateField)
+        )
+    ]
+
+
+def submit_job(job):
+    """Постановка задачи в очередь после фиксации транзакции."""
+    transaction.on_commit(partial(get_queue().submit, run_job, job.pk))
+
+
+def update_job(job, **fields):
+    """Запись прогресса одним UPDATE, без перезаписи остальных полей."""
+    for name, value in fields.items():
+        setattr(job, name, value)
+    DataJob.objects.filter(pk=job.pk).update(**fields)
+
+
+def run_job(job_id):
+    """Выполнение задачи импорта/экспорта из очереди.
+
+    Ошибка не пробрасывается в очередь: повтор импорта продублировал бы
+    уже зафиксированные пачки, поэтому задача просто помечается
+    неудачной. Задача запускается, только если она ещё в очереди:
+    повторная отправка (например, recover_jobs) её не продублирует.
+    """
+    claimed = DataJob.objects.filter(pk=job_id, status=PENDING).update(
+        status=RUNNING
+    )
+    if not claimed:
+        return
+    job = DataJob.objects.get(pk=job_id)
+    model = JOB_MODELS[job.model_name]
+    try:
+        if job.kind == EXPORT:
+            export_csv(job, model)
+        else:
+            import_csv(job, model)
+    except Exception as error:
+        logger.exception('Задача %s завершилась ошибкой.', job)
+        update_job(
+            job, status=FAILED, message=str(error),
+            finished_at=timezone.now()
+        )
+    else:
+        update_job(job, status=DONE, finished_at=timezone.now())
+
+
+def export_csv(job, model):
+    """Потоковая выгрузка во временный файл пачками по chunk_size строк."""
+    chunk_size = settings.DATA_JOB_CHUNK_SIZE
+    fields = export_fields(model)
+    queryset = export_queryset(job, model).order_by('pk')
+    update_job(job, total=queryset.count())
+    rows = queryset.values_list(
+        *(field.attname for field in fields)
+    ).iterator(chunk_size=chunk_size)
+    with tempfile.TemporaryFile() as output:
+        text = io.TextIOWrapper(output, encoding='utf-8', newline='')
+        writer = csv.writer(text)
+        writer.writerow(field.name for field in fields)
+        processed = 0
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            writer.writerows(chunk)
+            processed += len(chunk)
+            update_job(job, processed=processed)
+        text.flush()
+        output.seek(0)
+        job.result.save(f'{model._meta.model_name}.csv', File(output))
+
+
+def export_queryset(job, model):
+    """Объекты для выгрузки по job.selection (см. DataJob.selection)."""
+    selection = job.selection or {}
+    if 'pks' in selection:
+        return model.objects.filter(pk__in=selection['pks'])
+    if 'params' in selection:
+        return changelist_queryset(
+            model, selection['params'], job.created_by
+        )
+    return model.objects.all()
+
+
+def changelist_queryset(model, params, user):
+    """Объекты списка Админки модели с поиском и фильтрами из params."""
+    request = HttpRequest()
+    for name, values in params.items():
+        request.GET.setlist(name, values)
+    request.user = user or AnonymousUser()
+    model_admin = admin.site._registry[model]
+    return model_admin.get_changelist_instance(request).get_queryset(request)
+
+
+def import_csv(job, model):
+    """Загрузка CSV пачками: одна транзакция и bulk_create на пачку.
+
+    Строки с ошибками (преобразование, валидаторы полей, несуществующие
+    внешние ключи, нарушение уникальности) пропускаются и попадают в
+    job.errors, остальные строки загружаются.
+    """
+    chunk_size = settings.DATA_JOB_CHUNK_SIZE
+    with job.source.open('rb') as source:
+        text = io.TextIOWrapper(source, encoding='utf-8', newline='')
+        update_job(job, total=sum(1 for _ in csv.DictReader(text)))
+        text.seek(0)
+        reader = csv.DictReader(text)
+        try:
+            fields = csv_fields(model, reader.fieldnames or ())
+        except FieldDoesNotExist as error:
+            raise ValueError(f'Неизвестная колонка: {error}')
+        if model is User and 'password' in fields:
+            # Готовый хеш из файла дал бы вход под загруженным
+            # пользователем, поэтому пароли импортом не задаются.
+            raise ValueError(
+                'Колонка password не поддерживается: пароль задаётся '
+                'пользователем через восстановление доступа.'
+            )
+        rows = numbered_rows(reader)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            objs, errors = build_objects(model, fields, chunk)
+            with transaction.atomic():
+                errors += check_relations(model, fields, objs)
+                errors += insert_objects(model, objs)
+            update_job(
+                job,
+                processed=job.processed + len(chunk),
+                failed=job.failed + len(errors),
+                errors=(job.errors + [
+                    {'line': line, 'error': error}
+                    for line, error in sorted(errors)
+                ])[:MAX_ERRORS],
+            )
+    finish_import(model)
+
+
+def finish_import(model):
+    """Сброс последовательности id и пересчёт счётчиков, статистики и
+    поискового индекса после загрузки (в том числе прерванной)."""
+    sequence_sql = connection.ops.sequence_reset_sql(no_style(), [model])
+    if sequence_sql:
+        with connection.cursor() as cursor:
+            for sql in sequence_sql:
+                cursor.execute(sql)
+    bulk_loaded.send(sender=model, objs=None)
+
+
+def recover_jobs():
+    """Задачи, прерванные остановкой процесса (очередь живёт в памяти).
+
+    Прерванный импорт помечается неудачным: зафиксированные пачки
+    остаются, счётчики, статистика и индекс его модели пересчитываются.
+    Прерванный экспорт возвращается в очередь. Возвращает
+    (число неудачных, id задач в очереди).
+    """
+    interrupted = DataJob.objects.filter(status=RUNNING)
+    imports = interrupted.filter(kind=IMPORT)
+    models = {
+        JOB_MODELS[name]
+        for name in imports.values_list('model_name', flat=True)
+    }
+    failed = imports.update(
+        status=FAILED, finished_at=timezone.now(),
+        message='Задача прервана перезапуском, загружена частично.'
+    )
+    interrupted.filter(kind=EXPORT).update(status=PENDING, processed=0)
+    for model in models:
+        finish_import(model)
+    pending = list(DataJob.objects.filter(status=PENDING).order_by(
+        'created_at'
+    ).values_list('pk', flat=True))
+    return failed, pending
+
+
+def numbered_rows(reader):
+    """Строки CSV с номером первой строки записи в файле."""
+    line = reader.line_num + 1
+    for row in reader:
+        yield line, row
+        line = reader.line_num + 1
+
+
+def build_objects(model, fields, chunk):
+    """Объекты пачки {строка: объект} и ошибки [(строка, текст)]."""
+    objs, errors = {}, []
+    exclude = [
+        field.name for field in fields.values()
+        if field.is_relation or field.primary_key
+    ]
+    for line, row in chunk:
+        try:
+            obj = build_object(model, fields, row)
+            obj.clean_fields(exclude=exclude)
+        except ValidationError as error:
+            errors.append((line, format_error(error)))
+            continue
+        objs[line] = obj
+    return objs, errors
+
+
+def check_relations(model, fields, objs):
+    """Строки со ссылками на несуществующие объекты - один запрос на поле.
+
+    Внешние ключи SQLite проверяются только при фиксации транзакции, и
+    одна неверная ссылка откатила бы всю пачку.
+    """
+    errors = []
+    for column, field in fields.items():
+        if not field.is_relation:
+            continue
+        values = {
+            getattr(obj, field.attname) for obj in objs.values()
+        } - {None}
+        existing = set(field.related_model._default_manager.filter(
+            **{f'{field.target_field.name}__in': values}
+        ).values_list(field.target_field.name, flat=True))
+        for line, obj in list(objs.items()):
+            value = getattr(obj, field.attname)
+            if value is not None and value not in existing:
+                errors.append((line, f'{column}: объект {value} не найден.'))
+                del objs[line]
+    return errors
+
+
+def insert_objects(model, objs):
+    """Вставка пачки; при ошибке БД - построчно, чтобы найти виновных."""
+    try:
+        with transaction.atomic():
+            model.objects.bulk_create(objs.values())
+        return []
+    except DatabaseError:
+        pass
+    errors = []
+    for line, obj in objs.items():
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create([obj])
+        except DatabaseError as error:
+            errors.append((line, str(error)))
+    return errors
+
+
+def format_error(error):
+    return '; '.join(
+        f'{column}: {" ".join(messages)}'
+        for column, messages in error.message_dict.items()
+    )
@@ -0,0 +1,182 @@
+import csv
+from contextlib import nullcontext
+from itertools import islice
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DatabaseError, connection, transaction
+from django.db.models import CASCADE, SET_NULL
+
+from reviews.jobs import build_object, csv_fields
+from reviews.models import (
+    User, Category, Genre, Title, TitleGenre, Review, Comment
+)
+from reviews.signals import bulk_loaded
+
+# Файлы в порядке зависимостей по внешним ключам.
+CSV_FILES = (
+    ('users.csv', User),
+    ('category.csv', Category),
+    ('genre.csv', Genre),
+    ('titles.csv', Title),
+    ('genre_title.csv', TitleGenre),
+    ('review.csv', Review),
+    ('comments.csv', Comment),
+)
+
+
+class Command(BaseCommand):
+    """Массовая загрузка данных из CSV-файлов в БД."""
+    help = (
+        'Загружает CSV-файлы (users, category, genre, titles, genre_title, '
+        'review, comments) пачками через bulk_create.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            type=Path,
+            default=settings.BASE_DIR / 'static' / 'data',
+            help='Каталог с CSV-файлами.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Количество строк в одной вставке.',
+        )
+        parser.add_argument(
+            '--truncate',
+            action='store_true',
+            help='Очистить таблицы загружаемых моделей перед загрузкой.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Проверить и вставить данные, затем откатить транзакцию.',
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть больше нуля.')
+        with transaction.atomic() if options['dry_run'] else nullcontext():
+            # Внутри транзакции пробного запуска, чтобы откат отменил
+            # и очистку таблиц.
+            if options['truncate']:
+                with transaction.atomic():
+                    self.truncate([model for _, model in CSV_FILES])
+            for filename, model in CSV_FILES:
+                path = options['path'] / filename
+                if not path.exists():
+                    self.stdout.write(f'{path}: файл не найден, пропущен.')
+                    continue
+                with open(path, encoding='utf-8', newline='') as csv_file:
+                    with transaction.atomic():
+                        count = self.load(
+                            csv_file, model, options['batch_size']
+                        )
+                        bulk_loaded.send(sender=model, objs=None)
+                self.stdout.write(f'{path}: загружено строк - {count}.')
+            if options['dry_run']:
+                transaction.set_rollback(True)
+                self.stdout.write(
+                    self.style.WARNING('Пробный запуск: изменения отменены.')
+                )
+                return
+        self.stdout.write(self.style.SUCCESS('Загрузка завершена.'))
+
+    def load(self, csv_file, model, batch_size):
+        """Потоковое чтение файла и вставка пачками."""
+        reader = csv.DictReader(csv_file)
+        try:
+            fields = csv_fields(model, reader.fieldnames or ())
+        except FieldDoesNotExist as error:
+            raise CommandError(f'{csv_file.name}: {error}')
+        rows = self.read_rows(csv_file.name, reader, fields, model)
+        count = 0
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            try:
+                model.objects.bulk_create(batch, batch_size=batch_size)
+            except DatabaseError as error:
+                raise CommandError(
+                    f'{csv_file.name}: ошибка вставки записей '
+                    f'{count + 1}-{count + len(batch)}: {error}'
+                )
+            count += len(batch)
+        sequence_sql = connection.ops.sequence_reset_sql(no_style(), [model])
+        if sequence_sql:
+            with connection.cursor() as cursor:
+                for sql in sequence_sql:
+                    cursor.execute(sql)
+        return count
+
+    def read_rows(self, name, reader, fields, model):
+        """Объекты модели из строк CSV, внешние ключи - по id."""
+        for row in reader:
+            try:
+                yield build_object(model, fields, row)
+            except ValidationError as error:
+                column, messages = next(iter(error.message_dict.items()))
+                raise CommandError(
+                    f'{name}, строка {reader.line_num}, поле {column}: '
+                    f'{" ".join(messages)}'
+                )
+
+    def truncate(self, models):
+        """Очистка таблиц без загрузки объектов в память.
+
+        Таблицы очищаются DELETE в обратном порядке зависимостей, ссылки
+        из других таблиц обрабатываются по их on_delete (см.
+        clear_references). Затем сбрасываются последовательности id и
+        пересчитываются поисковый индекс, счётчики и статистика.
+        """
+        with connection.cursor() as cursor:
+            for model in reversed(models):
+                self.clear_references(model, models)
+                cursor.execute(
+                    'DELETE FROM '
+                    f'{connection.ops.quote_name(model._meta.db_table)}'
+                )
+            for sql in connection.ops.sequence_reset_by_name_sql(
+                no_style(), [
+                    {'table': model._meta.db_table,
+                     'column': model._meta.pk.column}
+                    for model in models
+                ]
+            ):
+                cursor.execute(sql)
+        for model in models:
+            bulk_loaded.send(sender=model, objs=None)
+
+    def clear_references(self, model, models):
+        """Ссылки на очищаемую модель из моделей вне models.
+
+        SET_NULL - ссылки обнуляются, CASCADE - удаляются только
+        ссылающиеся строки; при других on_delete очистка прерывается.
+        """
+        for related in apps.get_models(include_auto_created=True):
+            if related in models:
+                continue
+            for field in related._meta.concrete_fields:
+                if not field.is_relation or field.related_model is not model:
+                    continue
+                referencing = related._base_manager.filter(
+                    **{f'{field.name}__isnull': False}
+                )
+                on_delete = field.remote_field.on_delete
+                if on_delete is SET_NULL:
+                    referencing.update(**{field.name: None})
+                elif on_delete is CASCADE:
+                    referencing.delete()
+                elif referencing.exists():
+                    raise CommandError(
+                        f'{related._meta.label}.{field.name} ссылается на '
+                        f'{model._meta.label}, очистите эти записи вручную.'
+                    )
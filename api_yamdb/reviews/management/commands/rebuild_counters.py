@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.counters import rebuild_comment_counters, rebuild_counters
+
+
+class Command(BaseCommand):
+    """Пересчёт сохранённых счётчиков Произведений и Отзывов."""
+    help = (
+        'Пересчитывает счётчики рейтинга и отзывов Произведений, счётчики '
+        'комментариев Отзывов и сообщает о расхождениях.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только показать расхождения, не исправляя их.',
+        )
+
+    def handle(self, *args, **options):
+        fix = not options['check']
+        with transaction.atomic():
+            drift = rebuild_counters(fix=fix)
+            comments_drift = rebuild_comment_counters(fix=fix)
+        for title_id, stored, actual in drift:
+            self.stdout.write(
+                f'Произведение {title_id}: сохранено (сумма, количество) '
+                f'{stored}, фактически {actual}'
+            )
+        for review_id, stored, actual in comments_drift:
+            self.stdout.write(
+                f'Отзыв {review_id}: сохранено комментариев {stored}, '
+                f'фактически {actual}'
+            )
+        total = len(drift) + len(comments_drift)
+        if not total:
+            self.stdout.write(self.style.SUCCESS('Расхождений не найдено.'))
+        elif options['check']:
+            self.stdout.write(self.style.WARNING(
+                f'Найдено расхождений: {total}.'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'Исправлено расхождений: {total}.'
+            ))
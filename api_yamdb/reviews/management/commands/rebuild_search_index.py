@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.search import SEARCH_FIELDS, get_search_backend
+
+
+class Command(BaseCommand):
+    """Переиндексация полнотекстового поиска."""
+    help = 'Заново строит поисковый индекс Произведений и Отзывов.'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        for model in SEARCH_FIELDS:
+            with transaction.atomic():
+                backend.rebuild(model)
+            self.stdout.write(
+                f'{model._meta.verbose_name_plural}: индекс перестроен.'
+            )
+        self.stdout.write(self.style.SUCCESS('Готово.'))
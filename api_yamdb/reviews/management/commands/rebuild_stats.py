@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.counters import rebuild_counters
+from reviews.stats import rebuild_stats
+
+
+class Command(BaseCommand):
+    """Пересчёт статистики Категорий и Жанров."""
+    help = (
+        'Пересчитывает статистику Категорий и Жанров по счётчикам '
+        'рейтинга Произведений и сообщает о расхождениях.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только показать расхождения, не исправляя их.',
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if not options['check']:
+                rebuild_counters()
+            drift = rebuild_stats(fix=not options['check'])
+        for stats_model, pk, stored, actual in drift:
+            self.stdout.write(
+                f'{stats_model._meta.verbose_name} {pk}: сохранено '
+                f'(произведений, отзывов, сумма оценок) {stored}, '
+                f'фактически {actual}'
+            )
+        if not drift:
+            self.stdout.write(self.style.SUCCESS('Расхождений не найдено.'))
+        elif options['check']:
+            self.stdout.write(self.style.WARNING(
+                f'Найдено расхождений: {len(drift)}.'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'Исправлено расхождений: {len(drift)}.'
+            ))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from reviews.jobs import recover_jobs, run_job
+
+
+class Command(BaseCommand):
+    """Восстановление задач импорта/экспорта после перезапуска."""
+    help = (
+        'Помечает неудачными импорты, прерванные остановкой процесса, '
+        'пересчитывает данные их моделей и выполняет задачи, оставшиеся '
+        'в очереди. Запускается до старта процессов приложения.'
+    )
+
+    def handle(self, *args, **options):
+        failed, pending = recover_jobs()
+        if failed:
+            self.stdout.write(self.style.WARNING(
+                f'Прерванных импортов: {failed}.'
+            ))
+        for job_id in pending:
+            run_job(job_id)
+        self.stdout.write(self.style.SUCCESS(
+            f'Выполнено задач из очереди: {len(pending)}.'
+        ))
@@ -0,0 +1,50 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+# Таблицы FTS5: (таблица модели, индексируемые поля).
+SEARCH_TABLES = (
+    ('reviews_title', ('name', 'description')),
+    ('reviews_review', ('text',)),
+)
+
+
+def create_search_index(apps, schema_editor):
+    """Таблицы FTS5 для SQLite, на других БД поиск работает через LIKE."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for table, fields in SEARCH_TABLES:
+            try:
+                cursor.execute(
+                    f'CREATE VIRTUAL TABLE {table}_fts USING fts5('
+                    f'{", ".join(fields)}, '
+                    "tokenize = 'unicode61 remove_diacritics 2')"
+                )
+            except OperationalError:
+                # SQLite собран без FTS5.
+                return
+            cursor.execute(
+                f'INSERT INTO {table}_fts (rowid, {", ".join(fields)}) '
+                'SELECT id, '
+                + ', '.join(f"COALESCE({field}, '')" for field in fields)
+                + f' FROM {table}'
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for table, _ in SEARCH_TABLES:
+            cursor.execute(f'DROP TABLE IF EXISTS {table}_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
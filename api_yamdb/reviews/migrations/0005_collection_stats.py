@@ -0,0 +1,63 @@
+# Generated by Django 3.2 on 2026-10-18 19:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models.functions import Coalesce
+
+
+def fill_collection_stats(apps, schema_editor):
+    for group, stats in (('Category', 'CategoryStats'),
+                         ('Genre', 'GenreStats')):
+        Group = apps.get_model('reviews', group)
+        Stats = apps.get_model('reviews', stats)
+        rows = Group.objects.annotate(
+            titles_count=models.Count('titles'),
+            reviews_count=Coalesce(models.Sum('titles__rating_count'), 0),
+            rating_sum=Coalesce(models.Sum('titles__rating_sum'), 0),
+        ).values_list('pk', 'titles_count', 'reviews_count', 'rating_sum')
+        Stats.objects.bulk_create(
+            Stats(
+                pk=pk, titles_count=titles_count,
+                reviews_count=reviews_count, rating_sum=rating_sum
+            )
+            for pk, titles_count, reviews_count, rating_sum in rows.iterator()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryStats',
+            fields=[
+                ('titles_count', models.PositiveIntegerField(default=0, verbose_name='Количество произведений')),
+                ('reviews_count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('rating_sum', models.PositiveIntegerField(default=0, verbose_name='Сумма оценок')),
+                ('category', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='reviews.category', verbose_name='Категория')),
+            ],
+            options={
+                'verbose_name': 'Статистика категории',
+                'verbose_name_plural': 'Статистика категорий',
+            },
+        ),
+        migrations.CreateModel(
+            name='GenreStats',
+            fields=[
+                ('titles_count', models.PositiveIntegerField(default=0, verbose_name='Количество произведений')),
+                ('reviews_count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('rating_sum', models.PositiveIntegerField(default=0, verbose_name='Сумма оценок')),
+                ('genre', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='reviews.genre', verbose_name='Жанр')),
+            ],
+            options={
+                'verbose_name': 'Статистика жанра',
+                'verbose_name_plural': 'Статистика жанров',
+            },
+        ),
+        migrations.RunPython(
+            fill_collection_stats, migrations.RunPython.noop
+        ),
+    ]
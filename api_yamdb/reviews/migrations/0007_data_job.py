@@ -0,0 +1,40 @@
+# Generated by Django 3.2 on 2026-10-18 19:47
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_rating'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('import', 'Импорт'), ('export', 'Экспорт')], default='import', max_length=16, verbose_name='Тип задачи')),
+                ('model_name', models.CharField(choices=[('user', 'Пользователи'), ('category', 'Категории'), ('genre', 'Жанры'), ('title', 'Произведения'), ('titlegenre', 'Произведение - Жанр'), ('review', 'Отзывы'), ('comment', 'Комментарии')], max_length=16, verbose_name='Данные')),
+                ('status', models.CharField(choices=[('pending', 'В очереди'), ('running', 'Выполняется'), ('done', 'Готово'), ('failed', 'Ошибка')], default='pending', max_length=16, verbose_name='Статус')),
+                ('source', models.FileField(blank=True, help_text='Первая строка - имена полей модели, внешние ключи - по id', upload_to='jobs/import/', verbose_name='CSV-файл для импорта')),
+                ('result', models.FileField(blank=True, upload_to='jobs/export/', verbose_name='Результат экспорта')),
+                ('pks', models.JSONField(blank=True, help_text='id экспортируемых объектов, пусто - вся таблица', null=True, verbose_name='Выбранные объекты')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Всего строк')),
+                ('processed', models.PositiveIntegerField(default=0, verbose_name='Обработано строк')),
+                ('failed', models.PositiveIntegerField(default=0, verbose_name='Строк с ошибками')),
+                ('errors', models.JSONField(blank=True, default=list, verbose_name='Ошибки строк')),
+                ('message', models.TextField(blank=True, verbose_name='Сообщение')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создана')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Завершена')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='data_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+            ],
+            options={
+                'verbose_name': 'Импорт/экспорт',
+                'verbose_name_plural': 'Импорт/экспорт',
+                'ordering': ('-created_at',),
+            },
+        ),
+    ]
@@ -0,0 +1,55 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_comments_count(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Comment = apps.get_model('reviews', 'Comment')
+    Review.objects.update(comments_count=Coalesce(Subquery(
+        Comment.objects.filter(review=OuterRef('pk')).order_by().values(
+            'review'
+        ).annotate(total=Count('pk')).values('total')
+    ), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_data_job'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='title',
+            name='title_rating_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='title',
+            name='title_category_rating_idx',
+        ),
+        migrations.RenameField(
+            model_name='title',
+            old_name='rating_count',
+            new_name='reviews_count',
+        ),
+        migrations.AlterField(
+            model_name='title',
+            name='reviews_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Количество отзывов (и оценок) произведения', verbose_name='Количество отзывов'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['-rating', '-reviews_count', 'id'], name='title_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', '-rating', '-reviews_count', 'id'], name='title_category_rating_idx'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество комментариев'),
+        ),
+        migrations.RunPython(fill_comments_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 3.2 on 2026-10-18 20:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_pub_date_default'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='datajob',
+            name='pks',
+        ),
+        migrations.AddField(
+            model_name='datajob',
+            name='query',
+            field=models.BinaryField(help_text='Сериализованный (pickle) запрос выбранных объектов, пусто - вся таблица', null=True, verbose_name='Запрос экспорта'),
+        ),
+    ]
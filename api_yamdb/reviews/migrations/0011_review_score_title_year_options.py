@@ -0,0 +1,25 @@
+# Generated by Django 3.2 on 2026-10-18 20:19
+
+import django.core.validators
+from django.db import migrations, models
+import reviews.validate
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_data_job_query'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='review',
+            name='score',
+            field=models.PositiveSmallIntegerField(help_text='Оцените произведение, в диапазоне от 1до 10', validators=[django.core.validators.MaxValueValidator(limit_value=10, message='Оценка больше 10.'), django.core.validators.MinValueValidator(limit_value=1, message='Оценка меньше 1.')], verbose_name='Оценка'),
+        ),
+        migrations.AlterField(
+            model_name='title',
+            name='year',
+            field=models.SmallIntegerField(help_text='Укажите год выпуска произведения', validators=[reviews.validate.validate_year], verbose_name='Год издания'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 3.2 on 2026-10-18 20:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_review_score_title_year_options'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='datajob',
+            name='query',
+        ),
+        migrations.AddField(
+            model_name='datajob',
+            name='selection',
+            field=models.JSONField(blank=True, help_text='{"pks": [id]} - отмеченные объекты, {"params": {...}} - параметры списка Админки (поиск, фильтры), пусто - вся таблица', null=True, verbose_name='Выбранные объекты'),
+        ),
+    ]
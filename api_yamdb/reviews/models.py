@@ -1,11 +1,13 @@
 
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
+from django.utils import timezone
 
 from api_yamdb.settings import (
     REGEX_SIGNS, REGEX_ME,
     NAME_MAX_LENGTH, TEXT_NAME_MAX_LENGTH, ROLE_MAX_LENGTH, SLUG_MAX_LENGTH,
+    CHOICE_MAX_LENGTH,
     MAX_LIMIT_VALUE, MIN_LIMIT_VALUE
 )
 from .validate import validate_year
@@ -155,15 +157,55 @@ class Title(models.Model):
         related_name='titles',
         verbose_name='Жанр произведения',
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок',
+    )
+    reviews_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество отзывов',
+        help_text='Количество отзывов (и оценок) произведения',
+    )
+    rating = models.FloatField(
+        null=True,
+        editable=False,
+        verbose_name='Рейтинг',
+        help_text='Средняя оценка, обновляется вместе со счётчиками',
+    )
 
     class Meta:
         ordering = ["-year"]
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(fields=['-year'], name='title_year_idx'),
+            models.Index(
+                fields=['category', '-year'],
+                name='title_category_year_idx'
+            ),
+            # Порядок полей совпадает с сортировкой топа Произведений.
+            models.Index(
+                fields=['-rating', '-reviews_count', 'id'],
+                name='title_rating_idx'
+            ),
+            models.Index(
+                fields=['category', '-rating', '-reviews_count', 'id'],
+                name='title_category_rating_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминаем загруженные значения для пересчёта статистики."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
 
 class TitleGenre(models.Model):
     """Вспомогательная модель: Произведение - Жанр."""
@@ -185,10 +227,24 @@ class TitleGenre(models.Model):
     class Meta:
         verbose_name = 'Произведение - Жанр'
         verbose_name_plural = verbose_name
+        constraints = [models.UniqueConstraint(
+            fields=['title', 'genre'],
+            name='unique_title_genre'
+        )]
+        indexes = [
+            models.Index(fields=['genre', 'title'], name='genre_title_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.genre}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминаем загруженные значения для пересчёта статистики."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
 
 class Review(models.Model):
     """Модель отзыва."""
@@ -226,9 +282,15 @@ class Review(models.Model):
                    f'до {MAX_LIMIT_VALUE}')
     )
     pub_date = models.DateTimeField(
-        auto_now_add=True,
+        default=timezone.now,
+        editable=False,
         verbose_name='Дата публикации',
     )
+    comments_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев',
+    )
 
     class Meta:
         ordering = ('-pub_date',)
@@ -238,10 +300,28 @@ class Review(models.Model):
             fields=['title', 'author'],
             name='unique_review'
         )]
+        indexes = [
+            models.Index(
+                fields=['title', '-pub_date', '-id'],
+                name='review_title_pub_date_idx'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.author}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминаем загруженные значения для пересчёта рейтинга."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Сохранение отзыва и счётчиков рейтинга в одной транзакции."""
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     """Модель комментариев."""
@@ -264,7 +344,8 @@ class Comment(models.Model):
         help_text='Укажите автора'
     )
     pub_date = models.DateTimeField(
-        auto_now_add=True,
+        default=timezone.now,
+        editable=False,
         verbose_name='Дата публикации'
     )
 
@@ -272,6 +353,203 @@ class Comment(models.Model):
         ordering = ('-pub_date',)
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=['review', '-pub_date', '-id'],
+                name='comment_review_pub_date_idx'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.review} - {self.author}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминаем загруженные значения для пересчёта счётчиков."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+
+class CollectionStats(models.Model):
+    """Сводная статистика Произведений группы (Категории или Жанра)."""
+    titles_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество произведений',
+    )
+    reviews_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество отзывов',
+    )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Сумма оценок',
+    )
+
+    class Meta:
+        abstract = True
+
+    @property
+    def rating(self):
+        """Средняя оценка по всем отзывам группы, без отзывов - None."""
+        if not self.reviews_count:
+            return None
+        return self.rating_sum / self.reviews_count
+
+
+class CategoryStats(CollectionStats):
+    """Статистика Произведений Категории."""
+    category = models.OneToOneField(
+        Category,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Категория',
+    )
+
+    class Meta:
+        verbose_name = 'Статистика категории'
+        verbose_name_plural = 'Статистика категорий'
+
+    def __str__(self):
+        return str(self.category)
+
+
+class GenreStats(CollectionStats):
+    """Статистика Произведений Жанра."""
+    genre = models.OneToOneField(
+        Genre,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Жанр',
+    )
+
+    class Meta:
+        verbose_name = 'Статистика жанра'
+        verbose_name_plural = 'Статистика жанров'
+
+    def __str__(self):
+        return str(self.genre)
+
+
+IMPORT = 'import'
+EXPORT = 'export'
+
+JOB_KIND_CHOICES = [
+    (IMPORT, 'Импорт'),
+    (EXPORT, 'Экспорт'),
+]
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+JOB_STATUS_CHOICES = [
+    (PENDING, 'В очереди'),
+    (RUNNING, 'Выполняется'),
+    (DONE, 'Готово'),
+    (FAILED, 'Ошибка'),
+]
+
+# Модели, которые можно импортировать и экспортировать фоновыми задачами.
+JOB_MODELS = {
+    model._meta.model_name: model
+    for model in (User, Category, Genre, Title, TitleGenre, Review, Comment)
+}
+
+
+class DataJob(models.Model):
+    """Фоновая задача импорта/экспорта CSV (см. reviews.jobs)."""
+    kind = models.CharField(
+        choices=JOB_KIND_CHOICES,
+        default=IMPORT,
+        max_length=CHOICE_MAX_LENGTH,
+        verbose_name='Тип задачи',
+    )
+    model_name = models.CharField(
+        choices=[
+            (name, model._meta.verbose_name_plural)
+            for name, model in JOB_MODELS.items()
+        ],
+        max_length=CHOICE_MAX_LENGTH,
+        verbose_name='Данные',
+    )
+    status = models.CharField(
+        choices=JOB_STATUS_CHOICES,
+        default=PENDING,
+        max_length=CHOICE_MAX_LENGTH,
+        verbose_name='Статус',
+    )
+    source = models.FileField(
+        upload_to='jobs/import/',
+        blank=True,
+        verbose_name='CSV-файл для импорта',
+        help_text=(
+            'Первая строка - имена полей модели, внешние ключи - по id'
+        ),
+    )
+    result = models.FileField(
+        upload_to='jobs/export/',
+        blank=True,
+        verbose_name='Результат экспорта',
+    )
+    selection = models.JSONField(
+        null=True,
+        blank=True,
+        verbose_name='Выбранные объекты',
+        help_text=(
+            '{"pks": [id]} - отмеченные объекты, {"params": {...}} - '
+            'параметры списка Админки (поиск, фильтры), пусто - вся таблица'
+        ),
+    )
+    total = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Всего строк',
+    )
+    processed = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Обработано строк',
+    )
+    failed = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Строк с ошибками',
+    )
+    errors = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name='Ошибки строк',
+    )
+    message = models.TextField(
+        blank=True,
+        verbose_name='Сообщение',
+    )
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='data_jobs',
+        verbose_name='Автор',
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Создана',
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Завершена',
+    )
+
+    class Meta:
+        ordering = ('-created_at',)
+        verbose_name = 'Импорт/экспорт'
+        verbose_name_plural = 'Импорт/экспорт'
+
+    def __str__(self):
+        return (
+            f'{self.get_kind_display()} {self.get_model_name_display()} '
+            f'#{self.pk}'
+        )
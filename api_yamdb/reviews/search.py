@@ -0,0 +1,204 @@
+import re
+import threading
+from functools import reduce
+from operator import add, and_, or_
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connection
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .models import Review, Title
+
+# Индексируемые поля моделей и их веса в ранжировании.
+SEARCH_FIELDS = {
+    Title: {'name': 10.0, 'description': 1.0},
+    Review: {'text': 1.0},
+}
+TERM_RE = re.compile(r'\w+')
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_terms(query):
+    """Слова поискового запроса без служебных символов."""
+    return TERM_RE.findall(query)
+
+
+class LikeSearchBackend:
+    """Поиск через icontains, работает на любой БД без индексов.
+
+    Каждое слово запроса должно встретиться хотя бы в одном поле,
+    ранг - сумма весов полей, в которых найдены слова.
+    """
+
+    def is_indexed(self):
+        """Поиск идёт по индексу, а не перебором строк."""
+        return False
+
+    def index(self, model, objs):
+        pass
+
+    def remove(self, model, pks):
+        pass
+
+    def rebuild(self, model):
+        pass
+
+    def condition(self, model, query, path='pk'):
+        """Q-условие "path входит в найденные объекты model" без ранга.
+
+        Подходит для фильтрации связанных моделей, например отзывов по
+        названию произведения: path='title'.
+        """
+        return Q(**{f'{path}__in': self.search(
+            model.objects.all(), query
+        ).order_by().values('pk')})
+
+    def search(self, queryset, query):
+        terms = get_terms(query)
+        if not terms:
+            return queryset.none()
+        fields = SEARCH_FIELDS[queryset.model]
+        queryset = queryset.filter(reduce(and_, (
+            reduce(or_, (
+                Q(**{f'{field}__icontains': term}) for field in fields
+            ))
+            for term in terms
+        )))
+        rank = reduce(add, (
+            Case(
+                When(**{f'{field}__icontains': term}, then=Value(-weight)),
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+            for field, weight in fields.items()
+            for term in terms
+        ))
+        return queryset.annotate(search_rank=rank).order_by(
+            'search_rank', 'pk'
+        )
+
+
+class FTS5SearchBackend(LikeSearchBackend):
+    """Полнотекстовый поиск SQLite FTS5.
+
+    Для каждой модели из SEARCH_FIELDS есть виртуальная таблица
+    <таблица модели>_fts с rowid, равным первичному ключу объекта
+    (создаётся миграцией 0004_search_index). Если БД не SQLite или
+    таблиц нет, используется поиск LikeSearchBackend.
+    """
+
+    def __init__(self):
+        self.available = None
+
+    def is_available(self):
+        if self.available is None:
+            tables = set(connection.introspection.table_names())
+            self.available = connection.vendor == 'sqlite' and all(
+                self.table(model) in tables for model in SEARCH_FIELDS
+            )
+        return self.available
+
+    def is_indexed(self):
+        return self.is_available()
+
+    def table(self, model):
+        return f'{model._meta.db_table}_fts'
+
+    def index(self, model, objs):
+        """Добавление или обновление объектов в индексе."""
+        if not self.is_available() or not objs:
+            return
+        fields = list(SEARCH_FIELDS[model])
+        table = self.table(model)
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT OR REPLACE INTO {table} (rowid, {", ".join(fields)}) '
+                f'VALUES (%s{", %s" * len(fields)})',
+                [
+                    (obj.pk, *(getattr(obj, field) or '' for field in fields))
+                    for obj in objs
+                ]
+            )
+
+    def remove(self, model, pks):
+        if not self.is_available() or not pks:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {self.table(model)} WHERE rowid = %s',
+                [(pk,) for pk in pks]
+            )
+
+    def rebuild(self, model):
+        """Переиндексация всей таблицы модели одним INSERT ... SELECT."""
+        if not self.is_available():
+            return
+        fields = list(SEARCH_FIELDS[model])
+        table = self.table(model)
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {table}')
+            cursor.execute(
+                f'INSERT INTO {table} (rowid, {", ".join(fields)}) '
+                f'SELECT {model._meta.pk.column}, '
+                + ', '.join(f"COALESCE({field}, '')" for field in fields)
+                + f' FROM {model._meta.db_table}'
+            )
+
+    def match(self, terms):
+        return ' '.join(f'"{term}"*' for term in terms)
+
+    def condition(self, model, query, path='pk'):
+        """Подзапрос к индексу: join с таблицей модели здесь не нужен."""
+        terms = get_terms(query)
+        if not self.is_available() or not terms:
+            return super().condition(model, query, path)
+        table = self.table(model)
+        return Q(**{f'{path}__in': RawSQL(
+            f'SELECT rowid FROM {table} WHERE {table} MATCH %s',
+            [self.match(terms)],
+        )})
+
+    def search(self, queryset, query):
+        """Отбор по MATCH и сортировка по bm25 с весами полей."""
+        if not self.is_available():
+            return super().search(queryset, query)
+        terms = get_terms(query)
+        if not terms:
+            return queryset.none()
+        model = queryset.model
+        table = self.table(model)
+        weights = ', '.join(map(str, SEARCH_FIELDS[model].values()))
+        return queryset.extra(
+            tables=[table],
+            where=[
+                f'{table}.rowid = {model._meta.db_table}.'
+                f'{model._meta.pk.column}',
+                f'{table} MATCH %s',
+            ],
+            params=[self.match(terms)],
+            select={'search_rank': f'bm25({table}, {weights})'},
+            order_by=['search_rank', 'pk'],
+        )
+
+
+def get_search_backend():
+    """Поисковый бэкенд, настроенный в settings.SEARCH_BACKEND."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = import_string(settings.SEARCH_BACKEND)()
+        return _backend
+
+
+@receiver(setting_changed)
+def reset_backend(setting, **kwargs):
+    global _backend
+    if setting in ('SEARCH_BACKEND', 'DATABASES'):
+        with _backend_lock:
+            _backend = None
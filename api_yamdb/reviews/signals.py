@@ -0,0 +1,296 @@
+import threading
+from collections import Counter
+
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import Signal, receiver
+
+from .counters import (
+    rebuild_comment_counters, rebuild_counters, update_comments_count,
+    update_comments_counts, update_rating
+)
+from .models import Category, Comment, Genre, Review, Title, TitleGenre
+from .search import SEARCH_FIELDS, get_search_backend
+from .stats import (
+    STATS_MODELS, rebuild_stats, title_totals, update_category_stats,
+    update_genre_stats, update_title_stats
+)
+
+# Внешние ключи, от которых зависит статистика Категорий и Жанров.
+STATS_FIELDS = {
+    Title: ('category_id',),
+    TitleGenre: ('title_id', 'genre_id'),
+}
+
+# Отзывы в процессе удаления: pre_delete всех удаляемых объектов
+# срабатывает раньше post_delete каскадно удаляемых Комментариев.
+_deleting = threading.local()
+
+# Массовая загрузка объектов модели в обход save(): objs - список
+# загруженных объектов или None, если затронута вся таблица.
+bulk_loaded = Signal()
+
+
+def change_rating(title_id, score_delta, count_delta=0):
+    """Счётчики рейтинга Произведения и статистика его Категории/Жанров."""
+    update_rating(title_id, score_delta, count_delta)
+    update_title_stats(title_id, reviews=count_delta, score=score_delta)
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    """Обновление рейтинга Произведения при создании/изменении Отзыва."""
+    loaded = getattr(instance, '_loaded_values', {})
+    if created:
+        change_rating(instance.title_id, instance.score, 1)
+    elif 'score' not in loaded or 'title_id' not in loaded:
+        rebuild_counters(title_ids=(instance.title_id,))
+        rebuild_stats(title_ids=(instance.title_id,))
+    elif loaded['title_id'] != instance.title_id:
+        change_rating(loaded['title_id'], -loaded['score'], -1)
+        change_rating(instance.title_id, instance.score, 1)
+    elif loaded['score'] != instance.score:
+        change_rating(instance.title_id, instance.score - loaded['score'])
+    instance._loaded_values = {
+        'title_id': instance.title_id,
+        'score': instance.score,
+    }
+
+
+def deleting_reviews():
+    """id Отзывов, удаляемых в текущем потоке."""
+    if not hasattr(_deleting, 'reviews'):
+        _deleting.reviews = set()
+    return _deleting.reviews
+
+
+@receiver(pre_delete, sender=Review)
+def review_deleting(sender, instance, **kwargs):
+    deleting_reviews().add(instance.pk)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """Обновление рейтинга Произведения при удалении Отзыва."""
+    deleting_reviews().discard(instance.pk)
+    change_rating(instance.title_id, -instance.score, -1)
+
+
+@receiver(bulk_loaded, sender=Review)
+def reviews_bulk_loaded(sender, objs, **kwargs):
+    """Пересчёт рейтинга Произведений после массовой загрузки Отзывов."""
+    title_ids = None
+    if objs is not None:
+        title_ids = {review.title_id for review in objs}
+    rebuild_counters(title_ids=title_ids)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    """Счётчик комментариев Отзыва при создании/переносе Комментария."""
+    loaded = getattr(instance, '_loaded_values', {})
+    if created:
+        update_comments_count(instance.review_id, 1)
+    elif 'review_id' not in loaded:
+        rebuild_comment_counters(review_ids=(instance.review_id,))
+    elif loaded['review_id'] != instance.review_id:
+        update_comments_count(loaded['review_id'], -1)
+        update_comments_count(instance.review_id, 1)
+    instance._loaded_values = {'review_id': instance.review_id}
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    """Счётчик комментариев Отзыва при удалении Комментария.
+
+    При каскадном удалении вместе с Отзывом счётчик не меняется: Отзыв
+    удаляется следом.
+    """
+    if instance.review_id not in deleting_reviews():
+        update_comments_count(instance.review_id, -1)
+
+
+@receiver(bulk_loaded, sender=Comment)
+def comments_bulk_loaded(sender, objs, **kwargs):
+    """Счётчики комментариев после массовой загрузки.
+
+    Для загруженных объектов - приращения одним UPDATE, для всей таблицы
+    - полный пересчёт.
+    """
+    if objs is None:
+        rebuild_comment_counters()
+    else:
+        update_comments_counts(
+            Counter(comment.review_id for comment in objs)
+        )
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Genre)
+def group_saved(sender, instance, created, **kwargs):
+    """Пустая статистика для новой Категории/Жанра."""
+    if created:
+        STATS_MODELS[sender].objects.get_or_create(pk=instance.pk)
+
+
+@receiver(pre_save, sender=Title)
+@receiver(pre_save, sender=TitleGenre)
+def load_original_values(sender, instance, **kwargs):
+    """Исходные внешние ключи объекта, не загруженные из БД.
+
+    Нужны для приращений статистики в post_save, если объект получен
+    через only()/defer() или создан вручную с существующим pk.
+    """
+    if instance.pk is None:
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    missing = [field for field in STATS_FIELDS[sender] if field not in loaded]
+    if not missing:
+        return
+    original = sender.objects.filter(pk=instance.pk).values(*missing).first()
+    if original is not None:
+        instance._loaded_values = {**loaded, **original}
+
+
+def saved_values(instance):
+    """Исходные и сохранённые внешние ключи объекта после save().
+
+    Отложенные поля не сохраняются, их значения остаются исходными.
+    Возвращает (None, сохранённые), если исходные неизвестны.
+    """
+    loaded = getattr(instance, '_loaded_values', {})
+    deferred = instance.get_deferred_fields()
+    fields = STATS_FIELDS[type(instance)]
+    if not all(field in loaded for field in fields):
+        return None, None
+    saved = {
+        field: loaded[field] if field in deferred else getattr(
+            instance, field
+        )
+        for field in fields
+    }
+    instance._loaded_values = {**loaded, **saved}
+    return {field: loaded[field] for field in fields}, saved
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, created, **kwargs):
+    """Статистика Категорий при создании Произведения или смене Категории.
+
+    Отзывы и Жанры у нового Произведения появляются позже и учитываются
+    своими обработчиками.
+    """
+    if created:
+        update_category_stats(instance.category_id, titles=1)
+        instance._loaded_values = {'category_id': instance.category_id}
+        return
+    original, saved = saved_values(instance)
+    if original != saved:
+        update_category_stats(
+            original['category_id'], titles=-1,
+            **title_totals(instance.pk, -1)
+        )
+        update_category_stats(
+            saved['category_id'], titles=1, **title_totals(instance.pk)
+        )
+
+
+@receiver(post_delete, sender=Title)
+def title_deleted(sender, instance, **kwargs):
+    """Статистика Категории при удалении Произведения.
+
+    Отзывы удаляются каскадно раньше Произведения и уже вычтены из
+    статистики своими обработчиками.
+    """
+    update_category_stats(instance.category_id, titles=-1)
+
+
+def link_genres(title_id, genre_ids, sign):
+    """Учёт Произведения в статистике Жанров при связывании (sign=1)
+    или отвязывании (sign=-1)."""
+    update_genre_stats(
+        genre_ids, titles=sign, **title_totals(title_id, sign)
+    )
+
+
+@receiver(post_save, sender=TitleGenre)
+def title_genre_saved(sender, instance, created, **kwargs):
+    """Статистика Жанров при создании или изменении связи."""
+    if created:
+        link_genres(instance.title_id, (instance.genre_id,), 1)
+        instance._loaded_values = {
+            'title_id': instance.title_id, 'genre_id': instance.genre_id
+        }
+        return
+    original, saved = saved_values(instance)
+    if original != saved:
+        link_genres(original['title_id'], (original['genre_id'],), -1)
+        link_genres(saved['title_id'], (saved['genre_id'],), 1)
+
+
+@receiver(post_delete, sender=TitleGenre)
+def title_genre_deleted(sender, instance, **kwargs):
+    link_genres(instance.title_id, (instance.genre_id,), -1)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_added(sender, instance, action, reverse, pk_set, **kwargs):
+    """Статистика Жанров при добавлении связей через Title.genre.
+
+    add() создаёт связи через bulk_create без post_save; remove() и
+    clear() удаляют их с отправкой post_delete для TitleGenre.
+    """
+    if action != 'post_add':
+        return
+    if not reverse:
+        link_genres(instance.pk, pk_set, 1)
+        return
+    for title_id in pk_set:
+        link_genres(title_id, (instance.pk,), 1)
+
+
+@receiver(bulk_loaded)
+def stats_bulk_loaded(sender, objs, **kwargs):
+    """Пересчёт статистики после массовой загрузки.
+
+    Подключён после reviews_bulk_loaded, поэтому счётчики рейтинга
+    Произведений к этому моменту уже пересчитаны.
+    """
+    if sender not in (Category, Genre, Title, TitleGenre, Review):
+        return
+    title_ids = None
+    if objs is not None and sender in (Title, TitleGenre, Review):
+        title_ids = {
+            obj.pk if sender is Title else obj.title_id for obj in objs
+        }
+    rebuild_stats(title_ids=title_ids)
+
+
+def search_index_saved(sender, instance, **kwargs):
+    """Обновление поискового индекса при сохранении объекта."""
+    get_search_backend().index(sender, [instance])
+
+
+def search_index_deleted(sender, instance, **kwargs):
+    """Удаление объекта из поискового индекса."""
+    get_search_backend().remove(sender, [instance.pk])
+
+
+# Подключение к каждой модели отдельно: обработчик post_delete без
+# sender отключил бы быстрое удаление (Collector.can_fast_delete) для
+# всех моделей проекта.
+for model in SEARCH_FIELDS:
+    post_save.connect(search_index_saved, sender=model)
+    post_delete.connect(search_index_deleted, sender=model)
+
+
+@receiver(bulk_loaded)
+def search_index_bulk_loaded(sender, objs, **kwargs):
+    """Индексация объектов после массовой загрузки."""
+    if sender not in SEARCH_FIELDS:
+        return
+    if objs is None:
+        get_search_backend().rebuild(sender)
+    else:
+        get_search_backend().index(sender, objs)
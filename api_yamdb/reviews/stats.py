@@ -0,0 +1,127 @@
+from django.db.models import (
+    Count, ExpressionWrapper, F, IntegerField, Subquery, Sum
+)
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import (
+    Category, CategoryStats, Genre, GenreStats, Title, TitleGenre
+)
+
+# Группы Произведений и модели их статистики.
+STATS_MODELS = {
+    Category: CategoryStats,
+    Genre: GenreStats,
+}
+
+
+def title_totals(title_id, sign=1):
+    """Счётчики отзывов Произведения как выражения для UPDATE.
+
+    Значения берутся из БД в момент обновления, поэтому не зависят от
+    устаревших данных объекта в памяти.
+    """
+    titles = Title.objects.filter(pk=title_id)
+    return {
+        'reviews': ExpressionWrapper(
+            Subquery(titles.values('reviews_count')) * sign,
+            output_field=IntegerField(),
+        ),
+        'score': ExpressionWrapper(
+            Subquery(titles.values('rating_sum')) * sign,
+            output_field=IntegerField(),
+        ),
+    }
+
+
+def update_stats(stats, titles=0, reviews=0, score=0):
+    """Инкрементальное изменение статистики через F-выражения.
+
+    Значения не опускаются ниже нуля, расхождения исправляет
+    rebuild_stats.
+    """
+    deltas = {
+        'titles_count': titles,
+        'reviews_count': reviews,
+        'rating_sum': score,
+    }
+    changes = {
+        field: Greatest(F(field) + delta, 0)
+        for field, delta in deltas.items() if delta != 0
+    }
+    if changes:
+        stats.update(**changes)
+
+
+def update_category_stats(category_id, **deltas):
+    if category_id is not None:
+        update_stats(
+            CategoryStats.objects.filter(category_id=category_id), **deltas
+        )
+
+
+def update_genre_stats(genre_ids, **deltas):
+    update_stats(GenreStats.objects.filter(genre_id__in=genre_ids), **deltas)
+
+
+def update_title_stats(title_id, reviews=0, score=0):
+    """Изменение статистики Категории и Жанров Произведения.
+
+    Категория и Жанры определяются подзапросами, поэтому обновление
+    занимает два UPDATE без предварительного чтения.
+    """
+    update_category_stats(
+        Subquery(Title.objects.filter(pk=title_id).values('category_id')),
+        reviews=reviews, score=score,
+    )
+    update_genre_stats(
+        TitleGenre.objects.filter(title_id=title_id).values('genre_id'),
+        reviews=reviews, score=score,
+    )
+
+
+def rebuild_stats(title_ids=None, fix=True):
+    """Пересчёт статистики Категорий и Жанров по счётчикам Произведений.
+
+    Возвращает список расхождений в виде (модель статистики, id группы,
+    (произведений, отзывов, сумма оценок) сохранённые или None, если
+    записи нет, (произведений, отзывов, сумма оценок) фактические).
+    title_ids ограничивает пересчёт группами указанных произведений.
+    """
+    drift = []
+    for model, stats_model in STATS_MODELS.items():
+        groups = model.objects.all()
+        if title_ids is not None:
+            groups = groups.filter(pk__in=model.objects.filter(
+                titles__pk__in=title_ids
+            ).values('pk'))
+        actual = groups.annotate(
+            actual_titles=Count('titles'),
+            actual_reviews=Coalesce(Sum('titles__reviews_count'), 0),
+            actual_sum=Coalesce(Sum('titles__rating_sum'), 0),
+        ).values_list(
+            'pk', 'actual_titles', 'actual_reviews', 'actual_sum'
+        ).order_by('pk')
+        stored = {
+            pk: tuple(values) for pk, *values in stats_model.objects.filter(
+                pk__in=groups.values('pk')
+            ).values_list(
+                'pk', 'titles_count', 'reviews_count', 'rating_sum'
+            )
+        }
+        missing = []
+        for pk, *values in actual.iterator():
+            values = tuple(values)
+            if stored.get(pk) == values:
+                continue
+            drift.append((stats_model, pk, stored.get(pk), values))
+            if not fix:
+                continue
+            fields = dict(zip(
+                ('titles_count', 'reviews_count', 'rating_sum'), values
+            ))
+            if pk in stored:
+                stats_model.objects.filter(pk=pk).update(**fields)
+            else:
+                missing.append(stats_model(pk=pk, **fields))
+        stats_model.objects.bulk_create(missing)
+    return drift
@@ -0,0 +1,44 @@
+"""Сравнение двух отчётов run.py.
+
+Пример:
+    python benchmarks/compare.py before.json after.json
+"""
+import argparse
+import json
+from pathlib import Path
+
+METRICS = (
+    ('p50, мс', lambda row: row['latency_ms']['p50']),
+    ('p95, мс', lambda row: row['latency_ms']['p95']),
+    ('p99, мс', lambda row: row['latency_ms']['p99']),
+    ('req/s', lambda row: row['rps']),
+    ('запросов к БД', lambda row: row['queries_per_request']),
+)
+
+
+def change(before, after):
+    if before in (None, 0) or after is None:
+        return ''
+    return f'{(after - before) / before * 100:+.1f}%'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('before', type=Path)
+    parser.add_argument('after', type=Path)
+    options = parser.parse_args()
+    before = json.loads(options.before.read_text(encoding='utf-8'))
+    after = json.loads(options.after.read_text(encoding='utf-8'))
+    for name in sorted(set(before['workloads']) & set(after['workloads'])):
+        print(name)
+        for title, metric in METRICS:
+            old = metric(before['workloads'][name])
+            new = metric(after['workloads'][name])
+            print(
+                f'  {title:15} {old!s:>10} -> {new!s:>10} '
+                f'{change(old, new)}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""Генерация CSV-файлов заданного размера по образцу static/data.
+
+Пример:
+    python benchmarks/generate_data.py --out /tmp/yamdb-1m \
+        --users 10000 --titles 10000 --reviews 1000000 --comments 5000000
+
+Результат загружается командой:
+    python api_yamdb/manage.py load_csv --path /tmp/yamdb-1m --truncate
+"""
+import argparse
+import csv
+import random
+import shutil
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+DATA_DIR = Path(__file__).resolve().parent.parent / 'api_yamdb/static/data'
+START_DATE = datetime(2015, 1, 1, tzinfo=timezone.utc)
+
+
+def read_column(filename, column):
+    with open(DATA_DIR / filename, encoding='utf-8', newline='') as file:
+        return [row[column] for row in csv.DictReader(file)]
+
+
+def writer(path, header):
+    file = open(path, 'w', encoding='utf-8', newline='')
+    csv_writer = csv.writer(file)
+    csv_writer.writerow(header)
+    return file, csv_writer
+
+
+def pub_date(index):
+    return (START_DATE + timedelta(seconds=index * 7)).strftime(
+        '%Y-%m-%dT%H:%M:%S.000Z'
+    )
+
+
+def generate(out, users, titles, reviews, comments, seed):
+    if reviews > users * titles:
+        raise SystemExit(
+            'Отзывов не может быть больше, чем users * titles: на одно '
+            'произведение пользователь оставляет один отзыв.'
+        )
+    if comments and not reviews:
+        raise SystemExit('Для комментариев нужны отзывы.')
+    rnd = random.Random(seed)
+    out.mkdir(parents=True, exist_ok=True)
+    for filename in ('category.csv', 'genre.csv'):
+        shutil.copy(DATA_DIR / filename, out / filename)
+    category_ids = read_column('category.csv', 'id')
+    genre_ids = read_column('genre.csv', 'id')
+    title_names = read_column('titles.csv', 'name')
+    review_texts = read_column('review.csv', 'text')
+    comment_texts = read_column('comments.csv', 'text')
+
+    file, rows = writer(
+        out / 'users.csv',
+        ('id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name')
+    )
+    with file:
+        for user_id in range(1, users + 1):
+            rows.writerow((
+                user_id, f'user{user_id}', f'user{user_id}@yamdb.fake',
+                'user', '', '', ''
+            ))
+
+    file, rows = writer(out / 'titles.csv', ('id', 'name', 'year', 'category'))
+    links, link_rows = writer(
+        out / 'genre_title.csv', ('id', 'title', 'genre')
+    )
+    with file, links:
+        link_id = 0
+        for title_id in range(1, titles + 1):
+            rows.writerow((
+                title_id,
+                f'{title_names[title_id % len(title_names)]} #{title_id}',
+                rnd.randint(1900, 2023),
+                rnd.choice(category_ids),
+            ))
+            for genre_id in rnd.sample(genre_ids, rnd.randint(1, 3)):
+                link_id += 1
+                link_rows.writerow((link_id, title_id, genre_id))
+
+    # Отзыв k: произведение k % titles, автор k // titles - пары
+    # (произведение, автор) не повторяются.
+    file, rows = writer(
+        out / 'review.csv',
+        ('id', 'title', 'text', 'author', 'score', 'pub_date')
+    )
+    with file:
+        for index in range(reviews):
+            rows.writerow((
+                index + 1,
+                index % titles + 1,
+                review_texts[index % len(review_texts)],
+                index // titles + 1,
+                rnd.randint(1, 10),
+                pub_date(index),
+            ))
+
+    file, rows = writer(
+        out / 'comments.csv', ('id', 'review', 'text', 'author', 'pub_date')
+    )
+    with file:
+        for index in range(comments):
+            rows.writerow((
+                index + 1,
+                rnd.randint(1, reviews),
+                comment_texts[index % len(comment_texts)],
+                rnd.randint(1, users),
+                pub_date(reviews + index),
+            ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--out', type=Path, required=True)
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--titles', type=int, default=10000)
+    parser.add_argument('--reviews', type=int, default=1000000)
+    parser.add_argument('--comments', type=int, default=5000000)
+    parser.add_argument('--seed', type=int, default=0)
+    options = parser.parse_args()
+    generate(
+        options.out, options.users, options.titles, options.reviews,
+        options.comments, options.seed
+    )
+
+
+if __name__ == '__main__':
+    main()
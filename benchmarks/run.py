@@ -0,0 +1,433 @@
+"""Нагрузочный прогон сценариев API с отчётом в JSON.
+
+Пример:
+    BENCH_DB=/tmp/yamdb-1m.sqlite3 python benchmarks/run.py \
+        --load /tmp/yamdb-1m --requests 500 --output before.json
+
+Без --url запросы выполняются тестовым клиентом Django в этом же
+процессе (--asgi - через ASGI-обработчик). С --url запросы идут по HTTP
+на запущенный сервер, который должен работать с той же базой (BENCH_DB
+и DJANGO_SETTINGS_MODULE=benchmarks.settings).
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import re
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / 'api_yamdb')]
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.tokens import default_token_generator  # noqa: E402
+from django.core.cache import caches  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connections  # noqa: E402
+from django.db.backends.signals import connection_created  # noqa: E402
+from django.test import AsyncClient, Client  # noqa: E402
+from api.authentication import get_access_token  # noqa: E402
+
+from reviews.models import (  # noqa: E402
+    Category, Genre, Review, Title, User
+)
+
+QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+BATCH_SIZE = 50
+WORKLOADS = {}
+
+
+def workload(name):
+    """Регистрация сценария: функция возвращает (метод, путь, данные)
+    или (метод, путь, данные, пользователь) для запроса от его имени."""
+    def decorator(func):
+        WORKLOADS[name] = func
+        return func
+    return decorator
+
+
+class Fixtures:
+    """Случайные, но воспроизводимые по seed объекты для сценариев."""
+
+    def __init__(self, seed):
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.max_title = Title.objects.order_by('-pk').values_list(
+            'pk', flat=True
+        ).first() or 0
+        self.max_review = Review.objects.order_by('-pk').values_list(
+            'pk', flat=True
+        ).first() or 0
+        self.categories = list(
+            Category.objects.values_list('slug', flat=True)
+        )
+        self.genres = list(Genre.objects.values_list('slug', flat=True))
+        self.users = list(User.objects.order_by('pk')[:200])
+        if not (self.max_title and self.max_review and self.users):
+            raise SystemExit(
+                'В базе нет данных: загрузите их через --load или '
+                'manage.py load_csv.'
+            )
+        self.tokens = {}
+        self.reviewed = set()
+        self.review_titles = dict(
+            Review.objects.filter(
+                pk__in=[self.randint(1, self.max_review) for _ in range(500)]
+            ).values_list('pk', 'title_id')
+        )
+
+    def randint(self, low, high):
+        with self.lock:
+            return self.random.randint(low, high)
+
+    def choice(self, values):
+        with self.lock:
+            return self.random.choice(values)
+
+    def token(self, user):
+        with self.lock:
+            if user.pk not in self.tokens:
+                self.tokens[user.pk] = str(get_access_token(user))
+            return self.tokens[user.pk]
+
+    def new_review(self):
+        """Пользователь и Произведение, на которое он ещё не писал отзыв."""
+        while True:
+            user = self.choice(self.users)
+            title_id = self.randint(1, self.max_title)
+            with self.lock:
+                if (user.pk, title_id) in self.reviewed:
+                    continue
+                self.reviewed.add((user.pk, title_id))
+            if not Review.objects.filter(
+                author=user, title_id=title_id
+            ).exists():
+                return user, title_id
+
+
+@workload('titles_list')
+def titles_list(fixtures):
+    return 'get', '/api/v1/titles/', None
+
+
+@workload('titles_list_sparse')
+def titles_list_sparse(fixtures):
+    return 'get', '/api/v1/titles/?fields=id,name,year,rating', None
+
+
+@workload('titles_filtered')
+def titles_filtered(fixtures):
+    query = fixtures.choice((
+        f'genre={fixtures.choice(fixtures.genres)}',
+        f'category={fixtures.choice(fixtures.categories)}',
+        'name=отец',
+        f'genre={fixtures.choice(fixtures.genres)}'
+        f'&category={fixtures.choice(fixtures.categories)}',
+    ))
+    return 'get', f'/api/v1/titles/?{query}', None
+
+
+@workload('titles_top')
+def titles_top(fixtures):
+    query = fixtures.choice((
+        '',
+        f'category={fixtures.choice(fixtures.categories)}',
+        f'genre={fixtures.choice(fixtures.genres)}',
+        'year_min=1990&year_max=2000&min_reviews=5',
+    ))
+    return 'get', f'/api/v1/titles/top/?{query}', None
+
+
+@workload('reviews_list')
+def reviews_list(fixtures):
+    title_id = fixtures.randint(1, fixtures.max_title)
+    return 'get', f'/api/v1/titles/{title_id}/reviews/', None
+
+
+@workload('reviews_create')
+def reviews_create(fixtures):
+    user, title_id = fixtures.new_review()
+    return 'post', f'/api/v1/titles/{title_id}/reviews/', {
+        'text': 'Отзыв из бенчмарка', 'score': fixtures.randint(1, 10),
+    }, user
+
+
+@workload('comments_list')
+def comments_list(fixtures):
+    review_id = fixtures.choice(list(fixtures.review_titles))
+    title_id = fixtures.review_titles[review_id]
+    return 'get', (
+        f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    ), None
+
+
+@workload('comments_create')
+def comments_create(fixtures):
+    review_id = fixtures.choice(list(fixtures.review_titles))
+    title_id = fixtures.review_titles[review_id]
+    return 'post', (
+        f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    ), {'text': 'Комментарий из бенчмарка'}
+
+
+@workload('comments_batch')
+def comments_batch(fixtures):
+    return 'post', '/api/v1/batch/comments/', [
+        {
+            'review': fixtures.choice(list(fixtures.review_titles)),
+            'text': 'Комментарий из бенчмарка',
+        }
+        for _ in range(BATCH_SIZE)
+    ]
+
+
+@workload('token_issue')
+def token_issue(fixtures):
+    user = fixtures.choice(fixtures.users)
+    return 'post', '/api/v1/auth/token/', {
+        'username': user.username,
+        'confirmation_code': default_token_generator.make_token(user),
+    }
+
+
+class LocalTransport:
+    """Запросы тестовым клиентом Django внутри процесса."""
+
+    def __init__(self, token, cold_cache):
+        self.token = token
+        self.cold_cache = cold_cache
+        self.local = threading.local()
+
+    def request(self, method, path, data, token=None):
+        if not hasattr(self.local, 'client'):
+            self.local.client = Client()
+        if self.cold_cache:
+            caches[settings.RESPONSE_CACHE_ALIAS].clear()
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {token or self.token}'}
+        if data is not None:
+            headers['content_type'] = 'application/json'
+        response = getattr(self.local.client, method)(
+            path, data=data, **headers
+        )
+        return response.status_code, response.get('Server-Timing', '')
+
+    def close(self):
+        connections.close_all()
+
+
+class AsgiTransport:
+    """Запросы через ASGI-обработчик Django в одном цикле событий.
+
+    Синхронный код, вызываемый через sync_to_async(thread_sensitive=
+    False), выполняется в пуле из workers потоков - столько же, сколько
+    потоков у LocalTransport при той же --concurrency.
+    """
+
+    def __init__(self, token, cold_cache, workers):
+        self.token = token
+        self.cold_cache = cold_cache
+        self.client = AsyncClient()
+        self.loop = asyncio.new_event_loop()
+        self.loop.set_default_executor(ThreadPoolExecutor(workers))
+        self.thread = threading.Thread(
+            target=self.loop.run_forever, daemon=True
+        )
+        self.thread.start()
+
+    def request(self, method, path, data, token=None):
+        if self.cold_cache:
+            caches[settings.RESPONSE_CACHE_ALIAS].clear()
+        kwargs = {'authorization': f'Bearer {token or self.token}'}
+        if data is not None:
+            kwargs.update(data=data, content_type='application/json')
+        response = asyncio.run_coroutine_threadsafe(
+            getattr(self.client, method)(path, **kwargs), self.loop
+        ).result()
+        return response.status_code, response.get('Server-Timing', '')
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        connections.close_all()
+
+
+class HttpTransport:
+    """Запросы по HTTP к запущенному серверу."""
+
+    def __init__(self, url, token):
+        import requests
+
+        self.url = url.rstrip('/')
+        self.token = token
+        self.requests = requests
+        self.local = threading.local()
+
+    def request(self, method, path, data, token=None):
+        if not hasattr(self.local, 'session'):
+            self.local.session = self.requests.Session()
+        response = self.local.session.request(
+            method, f'{self.url}{path}', json=data,
+            headers={'Authorization': f'Bearer {token or self.token}'},
+        )
+        return response.status_code, response.headers.get(
+            'Server-Timing', ''
+        )
+
+    def close(self):
+        pass
+
+
+def add_db_latency(latency_ms):
+    """Задержка перед каждым запросом к БД, имитирующая сетевую БД."""
+    def delay(execute, sql, params, many, context):
+        time.sleep(latency_ms / 1000)
+        return execute(sql, params, many, context)
+
+    def connected(sender, connection, **kwargs):
+        connection.execute_wrappers.append(delay)
+
+    connection_created.connect(connected, weak=False)
+
+
+def percentile(values, share):
+    return values[max(0, math.ceil(share * len(values)) - 1)]
+
+
+def run_workload(func, fixtures, transport, count, concurrency):
+    """Выполнение сценария и сводка по задержкам, RPS и запросам к БД."""
+    def one(_):
+        method, path, data, *user = func(fixtures)
+        token = fixtures.token(user[0]) if user else None
+        start = time.perf_counter()
+        status, timing = transport.request(method, path, data, token)
+        elapsed = (time.perf_counter() - start) * 1000
+        match = QUERIES_RE.search(timing)
+        return elapsed, status, int(match.group(1)) if match else None
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(one, range(count)))
+    wall = time.perf_counter() - started
+    latencies = sorted(result[0] for result in results)
+    queries = [result[2] for result in results if result[2] is not None]
+    errors = [result[1] for result in results if result[1] >= 400]
+    return {
+        'requests': count,
+        'errors': len(errors),
+        'error_statuses': sorted(set(errors)),
+        'rps': round(count / wall, 2),
+        'latency_ms': {
+            'p50': round(percentile(latencies, 0.5), 3),
+            'p95': round(percentile(latencies, 0.95), 3),
+            'p99': round(percentile(latencies, 0.99), 3),
+            'max': round(latencies[-1], 3),
+        },
+        'queries_per_request': (
+            round(statistics.mean(queries), 2) if queries else None
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--workload', action='append', choices=sorted(WORKLOADS),
+        help='Сценарий (можно несколько раз), по умолчанию - все.'
+    )
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--load', type=Path,
+        help='Каталог с CSV: перед прогоном выполнить migrate и load_csv.'
+    )
+    parser.add_argument('--url', help='Адрес сервера для HTTP-режима.')
+    parser.add_argument(
+        '--asgi', action='store_true',
+        help='Запросы через ASGI-обработчик вместо WSGI (без --url).'
+    )
+    parser.add_argument(
+        '--cold-cache', action='store_true',
+        help='Очищать кэш ответов перед каждым запросом (без --url).'
+    )
+    parser.add_argument(
+        '--db-latency-ms', type=float, default=0,
+        help='Имитация сетевой БД: задержка каждого запроса к БД (мс).'
+    )
+    parser.add_argument('--output', type=Path, help='Файл для отчёта.')
+    options = parser.parse_args()
+
+    if options.load:
+        call_command('migrate', verbosity=0)
+        call_command('load_csv', path=options.load, truncate=True)
+    fixtures = Fixtures(options.seed)
+    if options.db_latency_ms:
+        connections.close_all()
+        add_db_latency(options.db_latency_ms)
+    token = str(get_access_token(fixtures.users[0]))
+    if options.url:
+        transport = HttpTransport(options.url, token)
+    elif options.asgi:
+        transport = AsgiTransport(
+            token, options.cold_cache, options.concurrency
+        )
+    else:
+        transport = LocalTransport(token, options.cold_cache)
+
+    report = {
+        'meta': {
+            'started_at': datetime.now(timezone.utc).isoformat(),
+            'mode': 'http' if options.url else (
+                'in-process-asgi' if options.asgi else 'in-process'
+            ),
+            'async_read_views': settings.ASYNC_READ_VIEWS,
+            'url': options.url,
+            'database': str(settings.DATABASES['default']['NAME']),
+            'vendor': connections['default'].vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'requests': options.requests,
+            'concurrency': options.concurrency,
+            'cold_cache': options.cold_cache,
+            'db_latency_ms': options.db_latency_ms,
+            'seed': options.seed,
+            'sizes': {
+                'titles': Title.objects.count(),
+                'reviews': Review.objects.count(),
+                'users': User.objects.count(),
+            },
+        },
+        'workloads': {},
+    }
+    try:
+        for name in options.workload or sorted(WORKLOADS):
+            report['workloads'][name] = run_workload(
+                WORKLOADS[name], fixtures, transport, options.requests,
+                options.concurrency
+            )
+            print(f'{name}: {report["workloads"][name]}', file=sys.stderr)
+    finally:
+        transport.close()
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if options.output:
+        options.output.write_text(output, encoding='utf-8')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
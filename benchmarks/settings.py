@@ -0,0 +1,37 @@
+"""Настройки для прогонов бенчмарков.
+
+База данных задаётся переменной окружения BENCH_DB (путь к файлу SQLite),
+чтобы не трогать рабочую db.sqlite3.
+"""
+import os
+
+from api_yamdb.settings import *  # noqa: F401,F403
+from api_yamdb.settings import BASE_DIR, CACHES, DATABASES, REST_FRAMEWORK
+
+DEBUG = False
+
+DATABASES['default']['NAME'] = os.getenv(
+    'BENCH_DB', str(BASE_DIR / 'bench.sqlite3')
+)
+
+# BENCH_SQLITE_DEFAULTS=1 - замер без настроек SQLite из
+# SQLITE_PRAGMAS (журнал rollback, synchronous=FULL, без mmap).
+if os.getenv('BENCH_SQLITE_DEFAULTS') == '1':
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'delete',
+        'synchronous': 'full',
+        'mmap_size': 0,
+    }
+
+# Ограничение частоты исказило бы замеры token_issue.
+REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] = dict.fromkeys(
+    REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']
+)
+
+# Отдельный кэш родителей вложенных URL, чтобы --cold-cache очищал
+# только кэш ответов.
+CACHES['parents'] = {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'parents',
+}
+PARENT_LOOKUP_CACHE_ALIAS = 'parents'
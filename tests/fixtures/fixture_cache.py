@@ -0,0 +1,10 @@
+import pytest
+from django.core.cache import caches
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Кэши не должны переживать очистку БД между тестами."""
+    for cache in caches.all():
+        cache.clear()
+    yield
@@ -0,0 +1,10 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def immediate_task_queue(settings):
+    """Фоновые задачи в тестах выполняются сразу, без пула потоков."""
+    settings.TASK_QUEUE = {
+        'BACKEND': 'api_yamdb.tasks.ImmediateTaskQueue',
+        'OPTIONS': {'retry_delay': 0},
+    }
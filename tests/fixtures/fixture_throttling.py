@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def fresh_throttle_store(settings):
+    """Каждый тест начинает с пустыми корзинами ограничения частоты."""
+    settings.THROTTLE_STORE = {'BACKEND': 'api.throttling.LocalBucketStore'}
@@ -0,0 +1,61 @@
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    # COUNT для пагинации, выборка произведений с категориями, жанры.
+    LIST_QUERIES = 3
+    # Выборка произведения с категорией, жанры.
+    DETAIL_QUERIES = 2
+
+    def test_01_list_queries_do_not_depend_on_page_size(self, client,
+                                                       admin_client,
+                                                       django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        with django_assert_num_queries(self.LIST_QUERIES):
+            response = client.get(self.TITLES_URL)
+        assert len(response.json()['results']) == len(titles)
+
+        create_titles_count = 5
+        for idx in range(create_titles_count):
+            admin_client.post(self.TITLES_URL, data={
+                'name': f'Произведение {idx}',
+                'year': 2000 + idx,
+                'genre': [titles[0]['genre'][0]],
+                'category': titles[0]['category'],
+            })
+        with django_assert_num_queries(self.LIST_QUERIES):
+            response = client.get(self.TITLES_URL)
+        assert len(response.json()['results']) == (
+            len(titles) + create_titles_count
+        ), (
+            f'Проверьте, что количество запросов к БД при GET-запросе к '
+            f'`{self.TITLES_URL}` не зависит от количества произведений.'
+        )
+
+    def test_02_detail_queries(self, client, admin_client,
+                               django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        with django_assert_num_queries(self.DETAIL_QUERIES):
+            client.get(
+                self.TITLES_DETAIL_URL_TEMPLATE.format(
+                    title_id=titles[0]['id']
+                )
+            )
+
+    @pytest.mark.parametrize('query', (
+        'genre=horror', 'category=films', 'name=Терминатор',
+        'genre=comedy&category=films'
+    ))
+    def test_03_filtered_list_queries(self, client, admin_client, query,
+                                      django_assert_num_queries):
+        create_titles(admin_client)
+        with django_assert_num_queries(self.LIST_QUERIES):
+            response = client.get(f'{self.TITLES_URL}?{query}')
+        assert response.json()['count'] == 1
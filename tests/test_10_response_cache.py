@@ -0,0 +1,83 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    CATEGORIES_URL = '/api/v1/categories/'
+    METRICS_URL = '/api/v1/metrics/'
+
+    def test_01_repeated_get_is_cached(self, client, admin_client,
+                                       django_assert_num_queries):
+        create_titles(admin_client)
+        response = client.get(f'{self.TITLES_URL}?limit=5&offset=0')
+        assert response['X-Cache'] == 'MISS'
+        with django_assert_num_queries(0):
+            cached = client.get(f'{self.TITLES_URL}?offset=0&limit=5')
+        assert cached['X-Cache'] == 'HIT', (
+            'Проверьте, что повторный GET-запрос к каталогу с теми же '
+            'параметрами (в любом порядке) отдаётся из кэша.'
+        )
+        assert cached.json() == response.json()
+
+        other = client.get(
+            f'{self.TITLES_URL}?limit=1', HTTP_HOST='api.example.com',
+            secure=True
+        )
+        assert other.json()['next'].startswith('https://api.example.com/')
+        response = client.get(
+            f'{self.TITLES_URL}?limit=1', HTTP_HOST='internal.local'
+        )
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что ключ кэша учитывает схему и хост: ссылки '
+            'пагинации в ответе абсолютные.'
+        )
+        assert response.json()['next'].startswith('http://internal.local/')
+
+    def test_02_writes_invalidate_cache(self, client, admin_client,
+                                        user_client):
+        titles, categories, _ = create_titles(admin_client)
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        client.get(self.TITLES_URL)
+        client.get(detail_url)
+        client.get(self.CATEGORIES_URL)
+
+        admin_client.patch(detail_url, data={'name': 'Новое название'})
+        response = client.get(detail_url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['name'] == 'Новое название', (
+            'Проверьте, что изменение произведения сбрасывает кэш ответов.'
+        )
+
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 8)
+        assert client.get(detail_url).json()['rating'] == 8, (
+            'Проверьте, что новый отзыв сбрасывает кэш произведений.'
+        )
+
+        admin_client.delete(f'{self.CATEGORIES_URL}{categories[0]["slug"]}/')
+        response = client.get(self.CATEGORIES_URL)
+        assert response.json()['count'] == len(categories) - 1
+        assert client.get(detail_url).json()['category'] is None, (
+            'Проверьте, что удаление категории сбрасывает кэш произведений.'
+        )
+
+    def test_03_cache_stats(self, client, admin_client, user_client):
+        create_titles(admin_client)
+        client.get(self.TITLES_URL)
+        client.get(self.TITLES_URL)
+
+        response = user_client.get(self.METRICS_URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        response = admin_client.get(self.METRICS_URL)
+        assert response.status_code == HTTPStatus.OK
+        stats = response.json()['response_cache']
+        assert stats['hits'] == 1
+        assert stats['misses'] >= 1
@@ -0,0 +1,93 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments, create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11KeysetPagination:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def walk(self, client, url, link='next'):
+        ids = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            ids.extend(obj['id'] for obj in data['results'])
+            url = data[link]
+        return ids, data
+
+    def test_01_reviews_keyset(self, client, admin_client, admin, user_client,
+                               user, moderator_client, moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        expected = [obj['id'] for obj in client.get(url).json()['results']]
+
+        ids, last_page = self.walk(
+            client, f'{url}?pagination=cursor&limit=1'
+        )
+        assert ids == expected, (
+            f'Проверьте, что keyset-пагинация `{url}?pagination=cursor` '
+            'возвращает все отзывы в порядке `-pub_date` без повторов.'
+        )
+        assert last_page['count'] == len(reviews)
+
+        previous_ids, _ = self.walk(
+            client, last_page['previous'], link='previous'
+        )
+        assert previous_ids == [
+            expected[idx] for idx in (1, 0)
+        ], 'Проверьте ссылку `previous` в keyset-режиме пагинации.'
+
+    def test_02_comments_without_count(self, client, admin_client, admin,
+                                       user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        for query in (
+            '?count=false&limit=1', '?pagination=cursor&count=false&limit=1'
+        ):
+            response = client.get(f'{url}{query}')
+            data = response.json()
+            assert 'count' not in data, (
+                f'Проверьте, что параметр `count=false` для `{url}` '
+                'отключает подсчёт общего количества.'
+            )
+            ids, _ = self.walk(client, f'{url}{query}')
+            assert sorted(ids) == sorted(obj['id'] for obj in comments)
+
+    def test_03_invalid_cursor(self, client, admin_client, admin):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = client.get(f'{url}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_browsable_api(self, client, admin_client, admin, user_client,
+                              user):
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        for query in (
+            'limit=1', 'count=false&limit=1', 'pagination=cursor&limit=1',
+            'pagination=cursor&count=false&limit=1',
+        ):
+            response = client.get(f'{url}?{query}&format=api')
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что `{url}?{query}` открывается в Browsable API.'
+            )
+            assert 'class="pager"' in response.content.decode() or (
+                'class="pagination"' in response.content.decode()
+            ), 'Проверьте, что в Browsable API выводятся ссылки пагинации.'
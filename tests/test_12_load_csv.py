@@ -0,0 +1,85 @@
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12LoadCsv:
+
+    def test_01_dry_run_does_not_write(self):
+        from reviews.models import Review
+
+        call_command('load_csv', '--dry-run')
+        assert not Review.objects.exists(), (
+            'Проверьте, что `load_csv --dry-run` откатывает изменения.'
+        )
+
+    def test_02_load_static_data(self, client):
+        from reviews.counters import rebuild_counters
+        from reviews.models import Comment, Review, Title, TitleGenre
+
+        call_command('load_csv', '--batch-size', '10')
+        assert Title.objects.count() == 32
+        assert TitleGenre.objects.count() == 42
+        assert Review.objects.count() == 72
+        assert Comment.objects.count() == 3
+        assert str(Review.objects.get(pk=1).pub_date.date()) == '2019-09-24', (
+            'Проверьте, что `load_csv` сохраняет даты публикации из CSV.'
+        )
+        assert rebuild_counters(fix=False) == [], (
+            'Проверьте, что после `load_csv` счётчики рейтинга '
+            'произведений пересчитаны.'
+        )
+        response = client.get('/api/v1/titles/1/')
+        assert response.json()['rating'] == 10
+
+        call_command('load_csv', '--truncate')
+        assert Review.objects.count() == 72, (
+            'Проверьте, что `load_csv --truncate` очищает таблицы перед '
+            'загрузкой.'
+        )
+
+    def test_03_truncate_dry_run_keeps_data(self):
+        from reviews.models import Review, User
+
+        call_command('load_csv')
+        reviews, users = Review.objects.count(), User.objects.count()
+        call_command('load_csv', '--truncate', '--dry-run')
+        assert (Review.objects.count(), User.objects.count()) == (
+            reviews, users
+        ), 'Проверьте, что `load_csv --truncate --dry-run` не очищает таблицы.'
+
+    def test_04_truncate_keeps_other_tables(self, client, tmp_path):
+        from django.contrib.admin.models import ADDITION, LogEntry
+        from reviews.models import (
+            EXPORT, CategoryStats, DataJob, Review, User
+        )
+
+        call_command('load_csv')
+        user = User.objects.get(pk=Review.objects.first().author_id)
+        job = DataJob.objects.create(
+            kind=EXPORT, model_name='review', created_by=user
+        )
+        orphan = DataJob.objects.create(kind=EXPORT, model_name='review')
+        LogEntry.objects.log_action(
+            user.pk, None, None, 'review', ADDITION
+        )
+        assert client.get(
+            '/api/v1/search/reviews/?q=звёзд'
+        ).json()['count'] > 0
+
+        call_command('load_csv', '--truncate', '--path', str(tmp_path))
+        assert not Review.objects.exists()
+        job.refresh_from_db()
+        assert job.created_by is None
+        assert DataJob.objects.filter(pk=orphan.pk).exists(), (
+            'Проверьте, что `load_csv --truncate` не очищает таблицы '
+            'других моделей.'
+        )
+        assert not LogEntry.objects.exists()
+        assert not CategoryStats.objects.exists()
+        assert client.get(
+            '/api/v1/search/reviews/?q=звёзд'
+        ).json()['count'] == 0, (
+            'Проверьте, что после очистки таблиц перестраивается '
+            'поисковый индекс.'
+        )
@@ -0,0 +1,66 @@
+import csv
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13Export:
+
+    TITLES_EXPORT_URL = '/api/v1/export/titles/'
+    REVIEWS_EXPORT_URL = '/api/v1/export/reviews/'
+
+    def read(self, response):
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            'Проверьте, что выгрузка отдаётся потоковым ответом.'
+        )
+        return b''.join(response.streaming_content).decode()
+
+    def test_01_export_admin_only(self, client, user_client):
+        for url in (self.TITLES_EXPORT_URL, self.REVIEWS_EXPORT_URL):
+            assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+            assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN
+
+    def test_02_export_titles(self, admin_client, admin, user_client, user):
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        content = self.read(admin_client.get(self.TITLES_EXPORT_URL))
+        rows = {int(row['id']): row for row in csv.DictReader(
+            io.StringIO(content)
+        )}
+        assert set(rows) == {title['id'] for title in titles}
+        first = rows[titles[0]['id']]
+        assert first['genre'] == ','.join(sorted(titles[0]['genre']))
+        assert first['category'] == titles[0]['category']
+        assert float(first['rating']) == 5
+
+        content = self.read(
+            admin_client.get(f'{self.TITLES_EXPORT_URL}?output=ndjson')
+        )
+        rows = [json.loads(line) for line in content.splitlines()]
+        assert {row['id'] for row in rows} == {
+            title['id'] for title in titles
+        }
+        second = next(row for row in rows if row['id'] == titles[1]['id'])
+        assert second['genre'] == titles[1]['genre']
+        assert second['rating'] is None
+
+    def test_03_export_reviews(self, admin_client, admin, user_client, user):
+        reviews, _ = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        content = self.read(
+            admin_client.get(f'{self.REVIEWS_EXPORT_URL}?output=ndjson')
+        )
+        rows = [json.loads(line) for line in content.splitlines()]
+        assert [(row['id'], row['author']) for row in rows] == [
+            (review['id'], review['author']) for review in reviews
+        ]
+        response = admin_client.get(f'{self.REVIEWS_EXPORT_URL}?output=xml')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
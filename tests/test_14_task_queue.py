@@ -0,0 +1,73 @@
+import threading
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+
+from api_yamdb.tasks import ImmediateTaskQueue, ThreadPoolTaskQueue
+
+
+class Test14TaskQueue:
+
+    def test_01_retry_and_dead_letters(self):
+        queue = ImmediateTaskQueue(retries=2, retry_delay=0)
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) < 2:
+                raise ConnectionError('smtp недоступен')
+
+        def broken():
+            raise ConnectionError('smtp недоступен')
+
+        queue.submit(flaky)
+        assert len(calls) == 2, 'Проверьте повтор задачи после ошибки.'
+        queue.submit(broken)
+        stats = queue.stats()
+        assert stats['completed'] == 1
+        assert stats['failed'] == 1
+        assert stats['retried'] == 3
+        assert len(stats['dead_letters']) == 1, (
+            'Проверьте, что неудачная задача попадает в dead_letters.'
+        )
+
+    def test_02_thread_pool_depth(self):
+        queue = ThreadPoolTaskQueue(max_workers=1, max_size=2, retries=0)
+        release = threading.Event()
+        done = threading.Event()
+        queue.submit(release.wait)
+        queue.submit(done.set)
+        assert queue.depth == 2, (
+            'Проверьте, что глубина очереди учитывает ожидающие задачи.'
+        )
+        ran_inline = []
+        queue.submit(ran_inline.append, 1)
+        assert ran_inline == [1], (
+            'Проверьте, что при заполненной очереди задача выполняется '
+            'в вызывающем потоке.'
+        )
+        release.set()
+        assert done.wait(timeout=5)
+        queue.executor.shutdown(wait=True)
+        assert queue.depth == 0
+        assert queue.stats()['overflow'] == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_signup_mail_is_queued(self, client, settings):
+        from api_yamdb.tasks import get_queue
+
+        settings.TASK_QUEUE = {
+            'BACKEND': 'api_yamdb.tasks.ThreadPoolTaskQueue',
+            'OPTIONS': {'max_workers': 1, 'retries': 0},
+        }
+        outbox_before = len(mail.outbox)
+        response = client.post('/api/v1/auth/signup/', data={
+            'email': 'queued@yamdb.fake', 'username': 'queued'
+        })
+        assert response.status_code == HTTPStatus.OK
+        get_queue().executor.shutdown(wait=True)
+        assert len(mail.outbox) == outbox_before + 1, (
+            'Проверьте, что письмо с кодом подтверждения отправляется '
+            'через очередь фоновых задач.'
+        )
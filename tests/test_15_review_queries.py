@@ -0,0 +1,65 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ReviewQueries:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    # Пользователь из токена, произведение, INSERT отзыва, UPDATE
+    # счётчиков рейтинга, UPDATE статистики категории и жанров и запись
+    # в поисковый индекс внутри одной транзакции.
+    CREATE_QUERIES = 7
+
+    def test_01_create_review_queries(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(
+                url, data={'text': 'Отзыв', 'score': 7}
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        statements = [
+            query['sql'] for query in context.captured_queries
+            if not query['sql'].startswith(('BEGIN', 'SAVEPOINT', 'RELEASE'))
+        ]
+        assert len(statements) == self.CREATE_QUERIES, (
+            'Проверьте, что создание отзыва не выполняет лишних запросов '
+            f'к БД: {statements}'
+        )
+
+    def test_02_duplicate_review_rejected(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 7)
+        response = user_client.post(url, data={'text': 'Ещё', 'score': 1})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв на произведение возвращает '
+            'ответ со статусом 400.'
+        )
+        assert 'non_field_errors' in response.json()
+        response = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.json()['rating'] == 7, (
+            'Проверьте, что отклонённый отзыв не меняет рейтинг.'
+        )
+
+    def test_03_other_integrity_errors_raised(self, admin_client,
+                                              user_client, monkeypatch):
+        from django.db import IntegrityError
+
+        from reviews import signals
+
+        def broken_rating(*args, **kwargs):
+            raise IntegrityError('CHECK constraint failed')
+
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        monkeypatch.setattr(signals, 'change_rating', broken_rating)
+        with pytest.raises(IntegrityError):
+            user_client.post(url, data={'text': 'Отзыв', 'score': 7})
@@ -0,0 +1,40 @@
+import pytest
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16RequestMetrics:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    METRICS_URL = '/api/v1/metrics/'
+
+    def test_01_server_timing_header(self, client, admin_client, admin):
+        create_reviews(admin_client, {admin: admin_client})
+        response = client.get(self.TITLES_URL)
+        timing = response['Server-Timing']
+        for metric in ('db;', 'serializer;', 'total;'):
+            assert metric in timing, (
+                f'Проверьте, что заголовок `Server-Timing` содержит {metric}'
+            )
+
+    def test_02_per_view_histogram(self, client, admin_client, admin):
+        from api import metrics
+
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        metrics.reset()
+        client.get(self.TITLES_URL)
+        client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        )
+        requests = admin_client.get(self.METRICS_URL).json()['requests']
+        assert set(requests) == {'TitleViewSet.list', 'ReviewViewSet.list'}
+        title_list = requests['TitleViewSet.list']
+        assert title_list['count'] == 1
+        assert title_list['queries']['p50'] == 3
+        for field in ('total_ms', 'db_ms', 'serializer_ms'):
+            assert set(title_list[field]) == {'p50', 'p95', 'p99', 'max'}
+        assert title_list['serializer_ms']['max'] > 0, (
+            'Проверьте, что время сериализации учитывается в метриках.'
+        )
@@ -0,0 +1,95 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+def claims_client(user):
+    from api.authentication import get_access_token
+
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {get_access_token(user)}'
+    )
+    return client
+
+
+def user_queries(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if 'FROM "reviews_user"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17StatelessAuth:
+
+    def test_01_token_contains_role_claims(self, client, django_user_model):
+        from django.contrib.auth.tokens import default_token_generator
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        user = django_user_model.objects.create_user(
+            username='claims', email='claims@yamdb.fake', role='moderator'
+        )
+        response = client.post('/api/v1/auth/token/', data={
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        })
+        assert response.status_code == HTTPStatus.OK
+        token = AccessToken(response.json()['token'])
+        assert token['role'] == 'moderator', (
+            'Проверьте, что access-токен содержит роль пользователя.'
+        )
+
+    def test_02_permissions_without_user_query(self, admin, user):
+        admin_client = claims_client(admin)
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(
+                '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'}
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert user_queries(context) == [], (
+            'Проверьте, что права администратора определяются по токену '
+            'без запроса к таблице пользователей.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = claims_client(user).post(
+                '/api/v1/genres/', data={'name': 'Драма', 'slug': 'drama'}
+            )
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        assert user_queries(context) == []
+
+    def test_03_current_user_loaded_lazily(self, user):
+        client = claims_client(user)
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['email'] == user.email, (
+            'Проверьте, что `/users/me/` возвращает полные данные '
+            'пользователя при аутентификации по токену с claims.'
+        )
+        response = client.patch('/api/v1/users/me/', data={'bio': 'новое'})
+        assert response.status_code == HTTPStatus.OK
+        user.refresh_from_db()
+        assert user.bio == 'новое'
+        assert response.json()['email'] == user.email
+
+    def test_04_deleted_user(self, admin_client, user):
+        from tests.utils import create_titles
+
+        titles, _, _ = create_titles(admin_client)
+        client = claims_client(user)
+        user.delete()
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токен удалённого пользователя получает 401.'
+        )
+        response = client.post(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            data={'text': 'Отзыв', 'score': 5}
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что запись от удалённого пользователя получает 401.'
+        )
@@ -0,0 +1,100 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Throttling:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+    METRICS_URL = '/api/v1/metrics/'
+
+    def test_01_signup_identity_limit(self, client, settings):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {
+                **settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'],
+                'signup_identity': '2/hour',
+            },
+        }
+        data = {'username': 'spam', 'email': 'spam@yamdb.fake'}
+        for _ in range(2):
+            response = client.post(self.URL_SIGNUP, data=data)
+            assert response.status_code == HTTPStatus.OK
+        response = client.post(self.URL_SIGNUP, data=data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что частые запросы к `{self.URL_SIGNUP}` с одними '
+            'и теми же данными ограничиваются.'
+        )
+        assert int(response['Retry-After']) > 0, (
+            'Проверьте, что ответ 429 содержит заголовок `Retry-After`.'
+        )
+        other = {'username': 'other', 'email': 'other@yamdb.fake'}
+        response = client.post(self.URL_SIGNUP, data=other)
+        assert response.status_code == HTTPStatus.OK, (
+            'Лимит по имени пользователя не должен затрагивать других.'
+        )
+
+    def test_02_token_ip_limit(self, client, settings):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {
+                **settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'],
+                'token_ip': '3/min',
+            },
+        }
+        statuses = [
+            client.post(self.URL_TOKEN, data={
+                'username': f'user{number}', 'confirmation_code': '1'
+            }).status_code
+            for number in range(4)
+        ]
+        assert statuses[:3] == [HTTPStatus.NOT_FOUND] * 3
+        assert statuses[3] == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что запросы к `{self.URL_TOKEN}` ограничиваются '
+            'по IP-адресу.'
+        )
+
+    def test_03_bucket_refill(self):
+        from api.throttling import CacheBucketStore, LocalBucketStore
+
+        for store in (LocalBucketStore(), CacheBucketStore()):
+            assert store.consume('key', 2, 1000) == 0
+            assert store.consume('key', 2, 1000) == 0
+            wait = store.consume('key', 2, 0.001)
+            assert 0 < wait <= 1000
+            store.count('scope:allowed')
+            store.count('scope:allowed')
+            assert store.stats() == {'scope:allowed': 2}
+
+    def test_04_metrics(self, client, admin_client, settings):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {
+                **settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'],
+                'token_identity': '1/min',
+            },
+        }
+        data = {'username': 'nobody', 'confirmation_code': '1'}
+        client.post(self.URL_TOKEN, data=data)
+        client.post(self.URL_TOKEN, data=data)
+        throttling = admin_client.get(self.METRICS_URL).json()['throttling']
+        assert throttling['token_identity'] == {
+            'allowed': 1, 'throttled': 1
+        }, 'Проверьте, что метрики показывают пропущенные и отклонённые.'
+        assert throttling['token_ip'] == {'allowed': 2, 'throttled': 0}
+
+    def test_05_local_store_eviction(self):
+        import time
+
+        from api.throttling import LocalBucketStore
+
+        store = LocalBucketStore(sweep_interval=0)
+        for number in range(100):
+            store.consume(f'spam{number}', 1, 1000)
+        time.sleep(0.01)
+        store.consume('key', 2, 0.001)
+        assert set(store.buckets) == {'key'}, (
+            'Проверьте, что восстановившиеся корзины удаляются из памяти.'
+        )
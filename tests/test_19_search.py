@@ -0,0 +1,113 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19Search:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_SEARCH_URL = '/api/v1/search/reviews/'
+
+    def create_data(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.post(self.TITLES_URL, data={
+            'name': 'Хроники',
+            'year': 1990,
+            'genre': ['drama'],
+            'category': 'books',
+            'description': 'Фильм про Терминатора',
+        })
+        return titles
+
+    def test_01_titles_ranked_search(self, client, admin_client):
+        titles = self.create_data(admin_client)
+        response = client.get(f'{self.TITLES_URL}?q=терминатор')
+        assert response.status_code == HTTPStatus.OK
+        names = [title['name'] for title in response.json()['results']]
+        assert names == ['Терминатор', 'Хроники'], (
+            'Проверьте, что `?q=` ищет по названию и описанию, и совпадение '
+            'в названии ранжируется выше.'
+        )
+        response = client.get(f'{self.TITLES_URL}?q=креп оре')
+        names = [title['name'] for title in response.json()['results']]
+        assert names == ['Крепкий орешек'], (
+            'Проверьте поиск по началу слов.'
+        )
+
+        admin_client.patch(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[1]['id']),
+            data={'name': 'Орешек'}
+        )
+        response = client.get(f'{self.TITLES_URL}?q=крепкий')
+        assert response.json()['count'] == 0, (
+            'Проверьте, что поисковый индекс обновляется при изменении.'
+        )
+        admin_client.delete(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        )
+        response = client.get(f'{self.TITLES_URL}?q=терминатор')
+        names = [title['name'] for title in response.json()['results']]
+        assert names == ['Хроники']
+
+    def test_02_special_characters(self, client, admin_client):
+        self.create_data(admin_client)
+        for query in ('"', 'AND OR', '*', 'ki-yay"'):
+            response = client.get(self.TITLES_URL, {'q': query})
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что служебные символы в `q` не ломают поиск.'
+            )
+
+    def test_03_review_search(self, client, admin_client, user_client):
+        titles = self.create_data(admin_client)
+        create_single_review(
+            admin_client, titles[0]['id'], 'Отличный боевик', 9
+        )
+        create_single_review(user_client, titles[0]['id'], 'Скучно', 3)
+        create_single_review(
+            user_client, titles[1]['id'], 'Боевик на все времена', 10
+        )
+        response = client.get(self.REVIEW_SEARCH_URL, {'q': 'боевик'})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Эндпоинт `{self.REVIEW_SEARCH_URL}` не найден.'
+        )
+        data = response.json()
+        assert data['count'] == 2
+        assert {review['title'] for review in data['results']} == {
+            titles[0]['id'], titles[1]['id']
+        }
+        response = client.get(
+            self.REVIEW_SEARCH_URL,
+            {'q': 'боевик', 'title': titles[1]['id']}
+        )
+        assert [
+            review['text'] for review in response.json()['results']
+        ] == ['Боевик на все времена']
+        response = client.get(self.REVIEW_SEARCH_URL)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_like_backend(self, client, admin_client, settings):
+        self.create_data(admin_client)
+        settings.SEARCH_BACKEND = 'reviews.search.LikeSearchBackend'
+        response = client.get(f'{self.TITLES_URL}?q=Терминатор')
+        names = [title['name'] for title in response.json()['results']]
+        assert names == ['Терминатор', 'Хроники'], (
+            'Проверьте поиск без FTS5 через LIKE.'
+        )
+
+    def test_05_fast_delete_unrelated_models(self):
+        from django.contrib.admin.models import LogEntry
+        from django.contrib.sessions.models import Session
+        from django.db.models.deletion import Collector
+        from reviews.models import Review
+
+        collector = Collector(using='default')
+        assert collector.can_fast_delete(Session.objects.all()), (
+            'Проверьте, что обработчики индекса и кэша подключены только '
+            'к своим моделям и не отключают быстрое удаление остальных.'
+        )
+        assert collector.can_fast_delete(LogEntry.objects.all())
+        assert not collector.can_fast_delete(Review.objects.all())
@@ -0,0 +1,139 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_single_review, create_titles
+
+
+def assert_no_drift():
+    from reviews.stats import rebuild_stats
+
+    drift = rebuild_stats(fix=False)
+    assert drift == [], (
+        'Проверьте, что статистика Категорий и Жанров обновляется '
+        f'инкрементально без расхождений: {drift}'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20CollectionStats:
+
+    CATEGORY_STATS_URL = '/api/v1/categories/{slug}/stats/'
+    GENRE_STATS_URL = '/api/v1/genres/{slug}/stats/'
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_URL = '/api/v1/titles/{title_id}/'
+    REVIEW_URL = '/api/v1/titles/{title_id}/reviews/{review_id}/'
+
+    def test_01_stats_endpoints(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(admin_client, titles[0]['id'], 'Отлично', 10)
+        create_single_review(user_client, titles[0]['id'], 'Неплохо', 7)
+        create_single_review(user_client, titles[1]['id'], 'Так себе', 4)
+
+        response = client.get(self.CATEGORY_STATS_URL.format(slug='films'))
+        assert response.status_code == HTTPStatus.OK, (
+            'Эндпоинт `/api/v1/categories/{slug}/stats/` не найден.'
+        )
+        assert response.json() == {
+            'titles_count': 1,
+            'reviews_count': 2,
+            'rating': 8,
+            'top_titles': [{
+                'id': titles[0]['id'], 'name': 'Терминатор',
+                'year': 1984, 'rating': 8,
+            }],
+        }
+        response = client.get(self.GENRE_STATS_URL.format(slug='drama'))
+        assert response.json()['titles_count'] == 1
+        assert response.json()['rating'] == 4
+
+        create_single_review(admin_client, titles[1]['id'], 'Шедевр', 10)
+        response = client.get(self.GENRE_STATS_URL.format(slug='drama'))
+        assert response.json()['rating'] == 7, (
+            'Проверьте, что статистика обновляется после нового отзыва.'
+        )
+        response = client.get(self.GENRE_STATS_URL.format(slug='unknown'))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_incremental_updates(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        review = create_single_review(
+            user_client, titles[0]['id'], 'Отзыв', 6
+        ).json()
+        create_single_review(admin_client, titles[0]['id'], 'Отзыв', 9)
+        assert_no_drift()
+
+        title_url = self.TITLE_URL.format(title_id=titles[0]['id'])
+        response = admin_client.patch(title_url, data={'category': 'books'})
+        assert response.status_code == HTTPStatus.OK
+        assert_no_drift()
+        response = admin_client.patch(
+            title_url, data={'genre': ['drama', 'comedy']}, format='json'
+        )
+        assert response.json()['genre'][0]['slug'] in ('drama', 'comedy')
+        assert_no_drift()
+        response = user_client.patch(
+            self.REVIEW_URL.format(
+                title_id=titles[0]['id'], review_id=review['id']
+            ),
+            data={'score': 2}
+        )
+        assert response.json()['score'] == 2
+        assert_no_drift()
+        user_client.delete(self.REVIEW_URL.format(
+            title_id=titles[0]['id'], review_id=review['id']
+        ))
+        assert_no_drift()
+        admin_client.delete('/api/v1/genres/comedy/')
+        assert_no_drift()
+        admin_client.delete(title_url)
+        assert_no_drift()
+
+    def test_03_rebuild_command(self, admin_client, user_client):
+        from reviews.models import CategoryStats
+
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 6)
+        CategoryStats.objects.update(titles_count=100)
+        out = StringIO()
+        call_command('rebuild_stats', '--check', stdout=out)
+        assert 'Найдено расхождений: 2.' in out.getvalue()
+        call_command('rebuild_stats', stdout=StringIO())
+        assert_no_drift()
+
+    def test_04_deferred_and_link_changes(self, admin_client, user_client):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from reviews.models import Category, Genre, Title, TitleGenre
+
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Отлично', 9)
+        books = Category.objects.get(slug='books')
+        title = Title.objects.only('name').get(pk=titles[0]['id'])
+        title.category = books
+        with CaptureQueriesContext(connection) as context:
+            title.save()
+        assert_no_drift()
+        assert not any(
+            'reviews_categorystats' in query['sql']
+            and 'GROUP BY' in query['sql']
+            for query in context.captured_queries
+        ), 'Смена Категории не должна пересчитывать всю статистику.'
+
+        link = TitleGenre.objects.filter(title_id=titles[0]['id']).first()
+        used = TitleGenre.objects.filter(
+            title_id=titles[0]['id']
+        ).values_list('genre_id', flat=True)
+        link.genre = Genre.objects.exclude(pk__in=used).first()
+        link.save()
+        assert_no_drift()
+
+        link = TitleGenre.objects.defer('genre').get(pk=link.pk)
+        link.title = Title.objects.create(
+            name='Без жанров', year=2000, category=books
+        )
+        link.save()
+        assert_no_drift()
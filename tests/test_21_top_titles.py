@@ -0,0 +1,80 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21TopTitles:
+
+    TOP_URL = '/api/v1/titles/top/'
+    TITLES_URL = '/api/v1/titles/'
+
+    def create_data(self, admin_client, user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Новинка', 'year': 2020, 'genre': ['comedy'],
+            'category': 'films',
+        })
+        titles.append(response.json())
+        create_single_review(admin_client, titles[0]['id'], 'Отзыв', 6)
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 8)
+        create_single_review(admin_client, titles[1]['id'], 'Отзыв', 9)
+        create_single_review(moderator_client, titles[1]['id'], 'Отзыв', 9)
+        create_single_review(user_client, titles[2]['id'], 'Отзыв', 10)
+        return titles
+
+    def get_names(self, client, params=None):
+        response = client.get(self.TOP_URL, params or {})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Эндпоинт `{self.TOP_URL}` не найден.'
+        )
+        return [title['name'] for title in response.json()]
+
+    def test_01_ranking_and_filters(self, client, admin_client, user_client,
+                                    moderator_client):
+        self.create_data(admin_client, user_client, moderator_client)
+        assert self.get_names(client) == [
+            'Новинка', 'Крепкий орешек', 'Терминатор'
+        ], 'Проверьте сортировку топа по убыванию рейтинга.'
+        assert self.get_names(client, {'min_reviews': 2}) == [
+            'Крепкий орешек', 'Терминатор'
+        ], 'Проверьте параметр `min_reviews`.'
+        assert self.get_names(client, {'category': 'films'}) == [
+            'Новинка', 'Терминатор'
+        ]
+        assert self.get_names(client, {'genre': 'drama'}) == [
+            'Крепкий орешек'
+        ]
+        assert self.get_names(
+            client, {'year_min': 1985, 'year_max': 2000}
+        ) == ['Крепкий орешек']
+        assert self.get_names(client, {'limit': 1}) == ['Новинка']
+
+    def test_02_rating_stored_and_updated(self, client, admin_client,
+                                          user_client, moderator_client):
+        from reviews.models import Title
+
+        titles = self.create_data(admin_client, user_client, moderator_client)
+        assert Title.objects.get(pk=titles[0]['id']).rating == 7.0, (
+            'Проверьте, что средняя оценка хранится в поле `rating`.'
+        )
+        self.get_names(client)
+        create_single_review(moderator_client, titles[0]['id'], 'Отзыв', 10)
+        assert self.get_names(client, {'limit': 2}) == [
+            'Новинка', 'Крепкий орешек'
+        ]
+        assert Title.objects.get(pk=titles[0]['id']).rating == 8.0
+        top = client.get(self.TOP_URL, {'category': 'films'}).json()
+        assert top[1]['rating'] == 8, (
+            'Проверьте, что топ обновляется после нового отзыва.'
+        )
+
+    def test_03_invalid_params(self, client):
+        for params in ({'limit': 0}, {'limit': 1000}, {'limit': 'abc'},
+                       {'year_min': 'abc'}):
+            response = client.get(self.TOP_URL, params)
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте обработку некорректных параметров: {params}'
+            )
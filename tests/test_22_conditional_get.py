@@ -0,0 +1,142 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import (
+    create_reviews, create_single_comment, create_single_review,
+    create_titles
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22ConditionalGet:
+
+    TITLE_URL = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL = '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    CATEGORIES_URL = '/api/v1/categories/'
+
+    def assert_not_modified(self, client, url, etag):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным ETag '
+            'возвращает 304.'
+        )
+        assert response['ETag'] == etag
+
+    def test_01_title_detail(self, client, admin_client,
+                             django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLE_URL.format(title_id=titles[0]['id'])
+        response = client.get(url)
+        etag = response['ETag']
+        assert etag and response['Last-Modified'], (
+            'Проверьте, что ответ содержит заголовки ETag и Last-Modified.'
+        )
+        with django_assert_num_queries(0):
+            self.assert_not_modified(client, url, etag)
+        response = client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        admin_client.patch(url, data={'name': 'Новое название'})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после изменения Произведения ETag меняется.'
+        )
+        assert response['ETag'] != etag
+
+        for name in ('Ещё название', 'Последнее название'):
+            response = client.get(url)
+            last_modified = response['Last-Modified']
+            admin_client.patch(url, data={'name': name})
+            response = client.get(
+                url, HTTP_IF_MODIFIED_SINCE=last_modified
+            )
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что Last-Modified меняется при каждой записи, '
+                'даже нескольких за одну секунду.'
+            )
+            assert response.json()['name'] == name
+
+    def test_02_reviews_and_comments(self, client, admin_client, admin,
+                                     user_client, user,
+                                     django_assert_num_queries):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        reviews_url = self.REVIEWS_URL.format(title_id=titles[0]['id'])
+        comments_url = self.COMMENTS_URL.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        reviews_etag = client.get(reviews_url)['ETag']
+        comments_etag = client.get(comments_url)['ETag']
+        with django_assert_num_queries(0):
+            self.assert_not_modified(client, reviews_url, reviews_etag)
+            self.assert_not_modified(client, comments_url, comments_etag)
+
+        create_single_review(user_client, titles[1]['id'], 'Отзыв', 5)
+        self.assert_not_modified(client, reviews_url, reviews_etag)
+        create_single_comment(
+            user_client, titles[0]['id'], reviews[0]['id'], 'Комментарий'
+        )
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=reviews_etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новый комментарий меняет ETag отзывов: в них '
+            'выводится `comments_count`.'
+        )
+        assert response.json()['results'][0]['comments_count'] == 1
+        reviews_etag = response['ETag']
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=comments_etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новый комментарий меняет ETag комментариев.'
+        )
+        assert len(response.json()['results']) == 1
+
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 7)
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=reviews_etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новый отзыв меняет ETag отзывов произведения.'
+        )
+        reviews_etag = response['ETag']
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'username': 'renamed'}
+        )
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=reviews_etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что смена имени автора меняет ETag отзывов.'
+        )
+        assert 'renamed' in [
+            review['author'] for review in response.json()['results']
+        ]
+
+    def test_03_categories(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get(self.CATEGORIES_URL)
+        etag = response['ETag']
+        self.assert_not_modified(client, self.CATEGORIES_URL, etag)
+        stats_url = f'{self.CATEGORIES_URL}films/stats/'
+        stats_etag = client.get(stats_url)['ETag']
+        self.assert_not_modified(client, stats_url, stats_etag)
+        admin_client.post(
+            self.CATEGORIES_URL, data={'name': 'Музыка', 'slug': 'music'}
+        )
+        response = client.get(self.CATEGORIES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+
+    def test_04_local_generations_expire(self, client, admin_client,
+                                         settings):
+        import time
+
+        settings.RESPONSE_CACHE_TIMEOUT = 1
+        create_titles(admin_client)
+        response = client.get(self.CATEGORIES_URL)
+        time.sleep(1.1)
+        response = client.get(
+            self.CATEGORIES_URL,
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что в LocMemCache поколения живут не дольше '
+            '`RESPONSE_CACHE_TIMEOUT`: запись в другом процессе их не '
+            'сбрасывает.'
+        )
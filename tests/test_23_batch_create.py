@@ -0,0 +1,207 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23BatchCreate:
+
+    TITLES_URL = '/api/v1/batch/titles/'
+    REVIEWS_URL = '/api/v1/batch/reviews/'
+    COMMENTS_URL = '/api/v1/batch/comments/'
+
+    def post(self, client, url, data):
+        return client.post(url, data=data, format='json')
+
+    def test_01_titles(self, admin_client, user_client):
+        from reviews.models import CategoryStats, GenreStats, Title
+
+        create_titles(admin_client)
+        data = [
+            {'name': 'Первое', 'year': 2001, 'category': 'films',
+             'genre': ['comedy', 'drama']},
+            {'name': 'Второе', 'year': 2002, 'category': 'books',
+             'genre': ['drama']},
+        ]
+        response = self.post(user_client, self.TITLES_URL, data)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Пакетное создание Произведений доступно только Администратору.'
+        )
+        response = self.post(admin_client, self.TITLES_URL, data)
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос к `{self.TITLES_URL}` со списком '
+            'Произведений возвращает статус 201.'
+        )
+        created = response.json()
+        assert [title['name'] for title in created] == ['Первое', 'Второе']
+        assert [genre['slug'] for genre in created[0]['genre']] == [
+            'comedy', 'drama'
+        ]
+        assert created[1]['category']['slug'] == 'books'
+        title = Title.objects.get(pk=created[0]['id'])
+        assert set(title.genre.values_list('slug', flat=True)) == {
+            'comedy', 'drama'
+        }
+        assert CategoryStats.objects.get(category__slug='books').titles_count \
+            == 2, 'Проверьте, что пакетное создание обновляет статистику.'
+        assert GenreStats.objects.get(genre__slug='drama').titles_count == 3
+
+    def test_02_per_item_errors(self, admin_client):
+        from reviews.models import Title
+
+        create_titles(admin_client)
+        count = Title.objects.count()
+        response = self.post(admin_client, self.TITLES_URL, [
+            {'name': 'Верное', 'year': 2001, 'category': 'films',
+             'genre': ['comedy']},
+            {'name': 'С ошибкой', 'year': 2001, 'category': 'unknown',
+             'genre': ['comedy', 'unknown']},
+            {'year': 2001, 'category': 'films', 'genre': []},
+        ])
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert isinstance(errors, list) and len(errors) == 3, (
+            'Проверьте, что ошибки возвращаются списком по элементам пакета.'
+        )
+        assert errors[0] == {}
+        assert set(errors[1]) == {'category', 'genre'}
+        assert 'name' in errors[2]
+        assert Title.objects.count() == count, (
+            'Пакет с ошибками не должен создавать объекты.'
+        )
+        for data in ({}, [], [{}] * 1001):
+            response = self.post(admin_client, self.TITLES_URL, data)
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_reviews(self, admin_client, user_client, user):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        ids = [title['id'] for title in titles]
+        ids.append(admin_client.post('/api/v1/titles/', data={
+            'name': 'Новинка', 'year': 2020, 'genre': ['comedy'],
+            'category': 'films',
+        }).json()['id'])
+        response = self.post(user_client, self.REVIEWS_URL, [
+            {'title': ids[0], 'text': 'Отзыв 1', 'score': 4},
+            {'title': ids[1], 'text': 'Отзыв 2', 'score': 8},
+        ])
+        assert response.status_code == HTTPStatus.CREATED
+        created = response.json()
+        assert [review['title'] for review in created] == ids[:2]
+        assert all(review['id'] for review in created)
+        assert {review['author'] for review in created} == {user.username}
+        assert Title.objects.get(pk=ids[1]).rating == 8, (
+            'Проверьте, что пакет Отзывов обновляет рейтинг Произведений.'
+        )
+        response = user_client.get('/api/v1/search/reviews/?q=Отзыв')
+        assert response.json()['count'] == 2, (
+            'Проверьте, что Отзывы из пакета попадают в поисковый индекс.'
+        )
+        response = self.post(user_client, self.REVIEWS_URL, [
+            {'title': ids[0], 'text': 'Повтор', 'score': 5},
+            {'title': ids[2], 'text': 'Новый', 'score': 5},
+            {'title': ids[2], 'text': 'Повтор в пакете', 'score': 5},
+            {'title': 0, 'text': 'Нет произведения', 'score': 11},
+        ])
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert 'non_field_errors' in errors[0]
+        assert errors[1] == {}
+        assert 'non_field_errors' in errors[2]
+        assert set(errors[3]) == {'title', 'score'}
+
+    def test_04_comments(self, admin_client, user_client, user):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from reviews.models import Comment
+
+        reviews, _ = create_reviews(admin_client, {user: user_client})
+        review_id = reviews[0]['id']
+        response = self.post(user_client, self.COMMENTS_URL, [
+            {'review': review_id, 'text': 'Комментарий'},
+            {'review': review_id + 100, 'text': 'Нет отзыва'},
+        ])
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json()[0] == {}
+        assert 'review' in response.json()[1]
+
+        queries = []
+        for size in (2, 20):
+            with CaptureQueriesContext(connection) as context:
+                response = self.post(user_client, self.COMMENTS_URL, [
+                    {'review': review_id, 'text': f'Комментарий {idx}'}
+                    for idx in range(size)
+                ])
+            assert response.status_code == HTTPStatus.CREATED
+            queries.append(len(context.captured_queries))
+        assert queries[0] == queries[1], (
+            'Число запросов к БД при пакетном создании не должно зависеть '
+            'от размера пакета.'
+        )
+        created = response.json()
+        assert len({comment['id'] for comment in created}) == 20
+        assert Comment.objects.filter(review_id=review_id).count() == 22
+        assert list(Comment.objects.filter(
+            pk__in=[comment['id'] for comment in created]
+        ).order_by('pk').values_list('text', flat=True)) == [
+            comment['text'] for comment in created
+        ], 'Проверьте, что id в ответе соответствуют созданным объектам.'
+
+    def test_05_without_returning(self, admin_client, user_client, user,
+                                  monkeypatch):
+        from api import batch
+        from reviews.counters import rebuild_comment_counters, rebuild_counters
+
+        reviews, titles = create_reviews(admin_client, {user: user_client})
+        monkeypatch.setattr(batch, 'returns_bulk_keys', lambda: False)
+        response = self.post(admin_client, self.REVIEWS_URL, [
+            {'title': title['id'], 'text': 'Отзыв', 'score': 7}
+            for title in titles[1:3]
+        ])
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что пакетное создание работает на БД без RETURNING.'
+        )
+        assert all(review['id'] for review in response.json())
+        response = self.post(user_client, self.COMMENTS_URL, [
+            {'review': reviews[0]['id'], 'text': f'Комментарий {idx}'}
+            for idx in range(2)
+        ])
+        assert response.status_code == HTTPStatus.CREATED
+        assert rebuild_counters(fix=False) == []
+        assert rebuild_comment_counters(fix=False) == []
+
+    def test_06_reviews_integrity_errors(self, admin_client, user_client,
+                                         user, monkeypatch):
+        from django.db import IntegrityError
+
+        from api import serializers, views
+        from reviews.models import Review, Title
+
+        def broken_insert(*args, **kwargs):
+            raise IntegrityError('CHECK constraint failed')
+
+        titles, _, _ = create_titles(admin_client)
+        data = [{'title': titles[0]['id'], 'text': 'Отзыв', 'score': 4}]
+        monkeypatch.setattr(views, 'bulk_insert', broken_insert)
+        with pytest.raises(IntegrityError):
+            self.post(user_client, self.REVIEWS_URL, data)
+
+        monkeypatch.undo()
+        # Отзыв, созданный параллельно после проверки пакета.
+        monkeypatch.setattr(
+            serializers.ReviewBatchSerializer, 'validate',
+            lambda self, attrs: attrs
+        )
+        Review.objects.create(
+            author=user, title=Title.objects.get(pk=titles[0]['id']),
+            text='Параллельный отзыв', score=5
+        )
+        response = self.post(user_client, self.REVIEWS_URL, data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что отзыв, созданный параллельно, даёт ошибку '
+            'повторного отзыва.'
+        )
@@ -0,0 +1,97 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24SparseFields:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает статус 200.'
+        )
+        return response.json(), [
+            query['sql'] for query in context.captured_queries
+        ]
+
+    def test_01_titles_fields(self, client, admin_client):
+        create_titles(admin_client)
+        data, queries = self.get(
+            client, f'{self.TITLES_URL}?fields=id,name,year,rating,unknown'
+        )
+        assert [set(title) for title in data['results']] == [
+            {'id', 'name', 'year', 'rating'}
+        ] * 2, 'Проверьте, что параметр `fields` ограничивает поля ответа.'
+        title_id = data['results'][0]['id']
+        titles_sql = [sql for sql in queries if 'reviews_title' in sql]
+        assert not any('description' in sql for sql in titles_sql), (
+            'Проверьте, что невыводимые поля не читаются из БД.'
+        )
+        assert not any('reviews_genre' in sql for sql in queries), (
+            'Проверьте, что Жанры не загружаются, если их нет в `fields`.'
+        )
+
+        data, queries = self.get(client, f'{self.TITLES_URL}?fields=genre')
+        assert [set(title) for title in data['results']] == [{'genre'}] * 2
+        assert data['results'][1]['genre'] == [
+            {'name': 'Ужасы', 'slug': 'horror'},
+            {'name': 'Комедия', 'slug': 'comedy'},
+        ]
+        data, _ = self.get(
+            client, f'{self.TITLES_URL}{title_id}/?fields=name,category'
+        )
+        assert data == {
+            'name': 'Крепкий орешек',
+            'category': {'name': 'Книги', 'slug': 'books'},
+        }
+        data, _ = self.get(client, f'{self.TITLES_URL}?fields=unknown')
+        assert 'description' in data['results'][0], (
+            'Без известных полей в `fields` ответ должен быть полным.'
+        )
+
+    def test_02_reviews_without_n_plus_one(self, admin_client, user_client,
+                                           moderator_client, user,
+                                           moderator, admin):
+        titles, _, _ = create_titles(admin_client)
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 5)
+        _, queries = self.get(user_client, url)
+        create_single_review(moderator_client, titles[0]['id'], 'Отзыв', 6)
+        create_single_review(admin_client, titles[0]['id'], 'Отзыв', 7)
+        data, more_queries = self.get(user_client, url)
+        assert len(more_queries) == len(queries), (
+            'Проверьте, что число запросов к БД для списка отзывов не '
+            'зависит от количества отзывов.'
+        )
+        assert {review['author'] for review in data['results']} == {
+            user.username, moderator.username, admin.username
+        }
+        data, _ = self.get(user_client, f'{url}?fields=score,author')
+        assert [set(review) for review in data['results']] == [
+            {'score', 'author'}
+        ] * 3
+
+    def test_03_comments_fields(self, admin_client, user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client}
+        )
+        url = (
+            f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        data, _ = self.get(user_client, f'{url}?fields=id,author')
+        assert data['results'] == [
+            {'id': comments[0]['id'], 'author': user.username}
+        ]
+        data, _ = self.get(
+            user_client, f'{url}{comments[0]["id"]}/?fields=text'
+        )
+        assert data == {'text': comments[0]['text']}
@@ -0,0 +1,54 @@
+import pytest
+from django.core.signals import request_started
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25Database:
+
+    def get_wrapper(self, tmp_path, **options):
+        return DatabaseWrapper(
+            {
+                **connection.settings_dict,
+                'NAME': str(tmp_path / 'db.sqlite3'),
+                **options,
+            },
+            alias='file',
+        )
+
+    def test_01_sqlite_pragmas(self, tmp_path):
+        wrapper = self.get_wrapper(tmp_path)
+        try:
+            with wrapper.cursor() as cursor:
+                values = {}
+                for name in ('journal_mode', 'synchronous', 'mmap_size'):
+                    cursor.execute(f'PRAGMA {name}')
+                    values[name] = cursor.fetchone()[0]
+        finally:
+            wrapper.close()
+        assert values == {
+            'journal_mode': 'wal',
+            'synchronous': 1,
+            'mmap_size': 256 * 1024 * 1024,
+        }, 'Проверьте, что новое соединение SQLite получает PRAGMA из '
+        '`SQLITE_PRAGMAS`.'
+
+    def test_02_broken_connection_closed(self, tmp_path, monkeypatch):
+        from api_yamdb import db
+
+        wrapper = self.get_wrapper(tmp_path, CONN_HEALTH_CHECKS=True)
+        monkeypatch.setattr(db, 'connections', type(
+            'Connections', (), {'all': staticmethod(lambda: [wrapper])}
+        ))
+        wrapper.ensure_connection()
+        request_started.send(sender=None)
+        assert wrapper.connection is not None, (
+            'Рабочее соединение не должно закрываться перед запросом.'
+        )
+        monkeypatch.setattr(wrapper, 'is_usable', lambda: False)
+        request_started.send(sender=None)
+        assert wrapper.connection is None, (
+            'Проверьте, что нерабочее постоянное соединение закрывается '
+            'перед запросом.'
+        )
@@ -0,0 +1,77 @@
+import asyncio
+import json
+from http import HTTPStatus
+from types import ModuleType
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, override_settings
+from django.urls import include, path
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26AsyncViews:
+
+    def get_urlconf(self):
+        from api.async_views import async_urls
+        from api.urls import router_v1
+        from api.views import CommentViewSet, ReviewViewSet, TitleViewSet
+
+        urlconf = ModuleType('async_urls')
+        urlconf.urlpatterns = [path('api/v1/', include(async_urls(
+            router_v1.urls, (TitleViewSet, ReviewViewSet, CommentViewSet)
+        )))]
+        return urlconf
+
+    @staticmethod
+    @async_to_sync
+    async def request(client, method, *args, **kwargs):
+        return await getattr(client, method)(*args, **kwargs)
+
+    def test_01_async_urls(self):
+        urlconf = self.get_urlconf()
+        callbacks = {
+            pattern.callback.cls.__name__: pattern.callback
+            for pattern in urlconf.urlpatterns[0].url_patterns
+            if hasattr(pattern.callback, 'cls')
+        }
+        for name in ('TitleViewSet', 'ReviewViewSet', 'CommentViewSet'):
+            assert asyncio.iscoroutinefunction(callbacks[name]), (
+                f'Проверьте, что представления {name} асинхронные.'
+            )
+        assert not asyncio.iscoroutinefunction(callbacks['UsersViewSet'])
+
+    def test_02_asgi_read_and_write(self, admin_client, user_client,
+                                    token_admin):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 7)
+        client = AsyncClient()
+        with override_settings(ROOT_URLCONF=self.get_urlconf()):
+            response = self.request(client, 'get', '/api/v1/titles/')
+            assert response.status_code == HTTPStatus.OK
+            assert response.json()['count'] == 2
+            assert 'queries' in response['Server-Timing'], (
+                'Проверьте, что под ASGI учитываются запросы к БД '
+                'асинхронных представлений.'
+            )
+            response = self.request(
+                client, 'get', f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            )
+            assert response.json()['results'][0]['score'] == 7
+            response = self.request(
+                client, 'post', '/api/v1/titles/',
+                data=json.dumps({
+                    'name': 'Новинка', 'year': 2020, 'genre': ['comedy'],
+                    'category': 'films',
+                }),
+                content_type='application/json',
+                authorization=f'Bearer {token_admin["access"]}',
+            )
+            assert response.status_code == HTTPStatus.CREATED, (
+                'Проверьте, что запись работает через асинхронные '
+                'представления.'
+            )
+            response = self.request(client, 'get', '/api/v1/titles/')
+            assert response.json()['count'] == 3
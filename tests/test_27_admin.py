@@ -0,0 +1,95 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import (
+    create_single_comment, create_single_review, create_titles
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27Admin:
+
+    CHANGELISTS = (
+        '/admin/reviews/title/',
+        '/admin/reviews/review/',
+        '/admin/reviews/comment/',
+    )
+
+    @pytest.fixture
+    def staff_client(self, client, user_superuser):
+        client.force_login(user_superuser)
+        return client
+
+    def add_data(self, admin_client, user_client, moderator_client, name):
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': name, 'year': 2000, 'genre': ['comedy', 'drama'],
+            'category': 'films',
+        })
+        title_id = response.json()['id']
+        for client in (user_client, moderator_client):
+            review = create_single_review(
+                client, title_id, f'Отзыв на {name}', 5
+            )
+            create_single_comment(
+                client, title_id, review.json()['id'], 'Комментарий'
+            )
+
+    def count_queries(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что страница `{url}` открывается.'
+        )
+        return len(context.captured_queries), response
+
+    def test_01_changelist_queries(self, staff_client, admin_client,
+                                   user_client, moderator_client):
+        create_titles(admin_client)
+        self.add_data(admin_client, user_client, moderator_client, 'Первое')
+        before = {
+            url: self.count_queries(staff_client, url)[0]
+            for url in self.CHANGELISTS
+        }
+        for idx in range(5):
+            self.add_data(
+                admin_client, user_client, moderator_client, f'Новое {idx}'
+            )
+        for url in self.CHANGELISTS:
+            queries, _ = self.count_queries(staff_client, url)
+            assert queries == before[url], (
+                f'Проверьте, что число запросов к БД на странице `{url}` '
+                'не зависит от количества строк.'
+            )
+        _, response = self.count_queries(
+            staff_client, '/admin/reviews/title/?o=6'
+        )
+        content = response.content.decode()
+        assert 'Комедия Драма' in content, (
+            'Проверьте, что в списке Произведений выводятся Жанры.'
+        )
+        assert '<td class="field-review_count">2</td>' in content
+
+    def test_02_indexed_search(self, staff_client, admin_client,
+                               user_client, moderator_client, monkeypatch):
+        from reviews.admin import ReviewAdmin, TitleAdmin
+
+        create_titles(admin_client)
+        self.add_data(admin_client, user_client, moderator_client, 'Первое')
+        self.add_data(admin_client, user_client, moderator_client, 'Второе')
+        monkeypatch.setattr(ReviewAdmin, 'indexed_search_min_rows', 1)
+        monkeypatch.setattr(TitleAdmin, 'indexed_search_min_rows', 1)
+        _, response = self.count_queries(
+            staff_client, '/admin/reviews/review/?q=Второе'
+        )
+        assert response.context['cl'].result_count == 2, (
+            'Проверьте поиск Отзывов по индексу.'
+        )
+        _, response = self.count_queries(
+            staff_client, '/admin/reviews/title/?q=перв'
+        )
+        assert [
+            title.name for title in response.context['cl'].result_list
+        ] == ['Первое']
@@ -0,0 +1,226 @@
+import csv
+import io
+from http import HTTPStatus
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28DataJobs:
+
+    @pytest.fixture(autouse=True)
+    def job_settings(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+        settings.DATA_JOB_CHUNK_SIZE = 2
+
+    @pytest.fixture
+    def staff_client(self, client, user_superuser):
+        client.force_login(user_superuser)
+        return client
+
+    def read_csv(self, response):
+        content = b''.join(response.streaming_content).decode()
+        return list(csv.DictReader(io.StringIO(content)))
+
+    def test_01_export(self, staff_client, admin_client, user_client,
+                       moderator_client, admin, user, moderator):
+        from reviews.models import DONE, DataJob, Review
+
+        create_reviews(admin_client, {
+            admin: admin_client, user: user_client,
+            moderator: moderator_client,
+        })
+        response = staff_client.get('/admin/reviews/review/')
+        assert '/admin/reviews/datajob/add/?model_name=review' in (
+            response.content.decode()
+        ), 'Проверьте, что в списке Отзывов есть кнопка импорта.'
+
+        selected = list(Review.objects.values_list('pk', flat=True)[:2])
+        response = staff_client.post('/admin/reviews/review/', {
+            'action': 'export_csv', '_selected_action': selected,
+        })
+        job = DataJob.objects.get()
+        assert response.status_code == HTTPStatus.FOUND
+        assert response['Location'] == (
+            f'/admin/reviews/datajob/{job.pk}/change/'
+        )
+        assert job.status == DONE, (
+            'Проверьте, что экспорт выполняется фоновой задачей.'
+        )
+        assert (job.processed, job.total) == (2, 2)
+
+        response = staff_client.get(
+            f'/admin/reviews/datajob/{job.pk}/change/'
+        )
+        assert 'Скачать' in response.content.decode()
+        response = staff_client.get(
+            f'/admin/reviews/datajob/{job.pk}/download/'
+        )
+        assert response.status_code == HTTPStatus.OK
+        rows = self.read_csv(response)
+        assert sorted(int(row['id']) for row in rows) == sorted(selected)
+        assert set(rows[0]) == {
+            'id', 'title', 'text', 'author', 'score', 'pub_date'
+        }, 'Проверьте, что заголовок CSV совпадает с форматом static/data.'
+
+        response = staff_client.post('/admin/reviews/review/', {
+            'action': 'export_csv', '_selected_action': selected,
+            'select_across': '1',
+        })
+        job = DataJob.objects.latest('pk')
+        assert job.total == Review.objects.count()
+
+        review = Review.objects.get(pk=selected[0])
+        response = staff_client.post(
+            f'/admin/reviews/review/?q={review.text}', {
+                'action': 'export_csv', '_selected_action': selected[:1],
+                'select_across': '1',
+            }
+        )
+        job = DataJob.objects.latest('pk')
+        assert job.total == 1, (
+            'Проверьте, что экспорт всех найденных объектов учитывает '
+            'поиск и фильтры списка.'
+        )
+
+    def test_02_import(self, staff_client, admin_client, user_client, user,
+                       moderator, user_superuser):
+        from reviews.counters import rebuild_counters
+        from reviews.models import DONE, DataJob, Review
+
+        _, titles = create_reviews(admin_client, {user: user_client})
+        title_id = titles[0]['id']
+        content = (
+            'title,text,author,score,pub_date\n'
+            f'{title_id},Хорошо,{moderator.pk},8,2020-01-01 10:00:00+00:00\n'
+            f'{title_id},Много,{moderator.pk},11,\n'
+            f'999,Нет произведения,{moderator.pk},5,\n'
+            f'{title_id},Повтор,{user.pk},5,\n'
+            f'{title_id},"Плохо,\nно честно",{user_superuser.pk},2,\n'
+        )
+        response = staff_client.post('/admin/reviews/datajob/add/', {
+            'model_name': 'review',
+            'source': SimpleUploadedFile(
+                'review.csv', content.encode(), content_type='text/csv'
+            ),
+        })
+        assert response.status_code == HTTPStatus.FOUND, (
+            'Проверьте, что задача импорта создаётся из Админки.'
+        )
+        job = DataJob.objects.get()
+        assert job.status == DONE, job.message
+        assert (job.total, job.processed, job.failed) == (5, 5, 3)
+        assert [error['line'] for error in job.errors] == [3, 4, 5], (
+            'Проверьте, что ошибки строк сохраняются с номерами строк.'
+        )
+        assert 'score' in job.errors[0]['error']
+        assert 'title' in job.errors[1]['error']
+        assert Review.objects.filter(text='Хорошо').get().pub_date.year == 2020
+        assert Review.objects.filter(text__startswith='Плохо').exists()
+        assert rebuild_counters(fix=False) == [], (
+            'Проверьте, что после импорта пересчитаны счётчики рейтинга.'
+        )
+
+        response = staff_client.get(
+            f'/admin/reviews/datajob/{job.pk}/change/'
+        )
+        assert 'Строка 4:' in response.content.decode()
+
+    def test_03_import_unknown_column(self, staff_client):
+        from reviews.models import FAILED, DataJob
+
+        staff_client.post('/admin/reviews/datajob/add/', {
+            'model_name': 'genre',
+            'source': SimpleUploadedFile('genre.csv', b'name,unknown\n'),
+        })
+        job = DataJob.objects.get()
+        assert job.status == FAILED
+        assert 'unknown' in job.message
+        response = staff_client.post('/admin/reviews/datajob/add/', {
+            'model_name': 'genre',
+        })
+        assert response.status_code == HTTPStatus.OK
+        assert DataJob.objects.count() == 1, (
+            'Проверьте, что импорт без файла не создаёт задачу.'
+        )
+
+    def test_04_import_permissions(self, staff_client, django_user_model):
+        from django.contrib.auth.models import Permission
+        from django.test import Client
+        from reviews.models import FAILED, DataJob, User
+
+        staff = django_user_model.objects.create_user(
+            username='staff', email='staff@yamdb.fake', is_staff=True
+        )
+        staff.user_permissions.set(Permission.objects.filter(
+            codename__in=['add_datajob', 'view_datajob', 'add_genre']
+        ))
+        client = Client()
+        client.force_login(staff)
+        response = client.post('/admin/reviews/datajob/add/', {
+            'model_name': 'user',
+            'source': SimpleUploadedFile(
+                'user.csv', b'username,email,is_superuser\nroot,r@r.ru,1\n'
+            ),
+        })
+        assert response.status_code == HTTPStatus.OK
+        assert not DataJob.objects.exists(), (
+            'Проверьте, что импорт требует права добавления объектов '
+            'целевой модели.'
+        )
+        response = client.post('/admin/reviews/datajob/add/', {
+            'model_name': 'genre',
+            'source': SimpleUploadedFile('genre.csv', b'name,slug\nA,a\n'),
+        })
+        assert response.status_code == HTTPStatus.FOUND
+
+        staff_client.post('/admin/reviews/datajob/add/', {
+            'model_name': 'user',
+            'source': SimpleUploadedFile(
+                'user.csv',
+                b'username,email,password\nroot,r@r.ru,pbkdf2_sha256$1$a$b\n'
+            ),
+        })
+        job = DataJob.objects.latest('pk')
+        assert job.status == FAILED
+        assert 'password' in job.message
+        assert not User.objects.filter(username='root').exists()
+
+    def test_05_recover_jobs(self, admin_client, user_client, user):
+        from django.core.management import call_command
+        from reviews.counters import rebuild_counters
+        from reviews.models import (
+            DONE, EXPORT, FAILED, IMPORT, PENDING, RUNNING, DataJob, Title
+        )
+
+        create_reviews(admin_client, {user: user_client})
+        Title.objects.update(reviews_count=0, rating_sum=0)
+        interrupted = DataJob.objects.create(
+            kind=IMPORT, model_name='review', status=RUNNING
+        )
+        export = DataJob.objects.create(
+            kind=EXPORT, model_name='title', status=RUNNING, processed=1
+        )
+        queued = DataJob.objects.create(
+            kind=EXPORT, model_name='review', status=PENDING,
+            selection={'params': {'q': ['нет такого']}}
+        )
+        call_command('recover_jobs', stdout=io.StringIO())
+
+        interrupted.refresh_from_db()
+        assert interrupted.status == FAILED, (
+            'Проверьте, что прерванный импорт помечается неудачным.'
+        )
+        assert rebuild_counters(fix=False) == [], (
+            'Проверьте, что после прерванного импорта пересчитываются '
+            'счётчики его модели.'
+        )
+        export.refresh_from_db()
+        queued.refresh_from_db()
+        assert (export.status, export.total) == (
+            DONE, Title.objects.count()
+        )
+        assert (queued.status, queued.total) == (DONE, 0)
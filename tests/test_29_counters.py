@@ -0,0 +1,142 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_single_comment
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29Counters:
+
+    def test_01_counters_in_responses(self, admin_client, user_client,
+                                      moderator_client, user, moderator):
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        reviews_url = f'{title_url}reviews/'
+        review_url = f'{reviews_url}{reviews[0]["id"]}/'
+
+        assert admin_client.get(title_url).json()['reviews_count'] == 2, (
+            'Проверьте, что в ответе Произведения есть `reviews_count`.'
+        )
+        counts = {
+            review['id']: review['comments_count']
+            for review in admin_client.get(reviews_url).json()['results']
+        }
+        assert counts == {reviews[0]['id']: 2, reviews[1]['id']: 0}, (
+            'Проверьте, что в ответе Отзыва есть `comments_count`.'
+        )
+
+        create_single_comment(
+            user_client, titles[0]['id'], reviews[0]['id'], 'Ещё один'
+        )
+        assert admin_client.get(reviews_url).json()['results'][-1][
+            'comments_count'
+        ] == 3, 'Проверьте, что новый комментарий сбрасывает кэш Отзывов.'
+        admin_client.delete(f'{review_url}comments/{comments[0]["id"]}/')
+        assert admin_client.get(review_url).json()['comments_count'] == 2
+
+        admin_client.delete(review_url)
+        assert admin_client.get(title_url).json()['reviews_count'] == 1
+
+    def test_02_batch_and_rebuild(self, admin_client, user_client, user,
+                                  moderator_client, moderator):
+        from reviews.counters import rebuild_comment_counters
+        from reviews.models import Review
+
+        _, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        review_id, other_id = reviews[0]['id'], reviews[1]['id']
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post('/api/v1/batch/comments/', data=[
+                {'review': review_id, 'text': f'Комментарий {idx}'}
+                for idx in range(3)
+            ], format='json')
+        assert response.status_code == 201
+        with CaptureQueriesContext(connection) as other_context:
+            response = user_client.post('/api/v1/batch/comments/', data=[
+                {'review': (review_id, other_id)[idx % 2], 'text': 'Текст'}
+                for idx in range(4)
+            ], format='json')
+        assert response.status_code == 201
+        assert len(other_context.captured_queries) == len(
+            context.captured_queries
+        ), (
+            'Проверьте, что счётчики комментариев пакета обновляются одним '
+            'запросом независимо от числа Отзывов.'
+        )
+        assert dict(Review.objects.filter(
+            pk__in=(review_id, other_id)
+        ).values_list('pk', 'comments_count')) == {
+            review_id: 7, other_id: 2
+        }, 'Проверьте, что пакетное создание обновляет `comments_count`.'
+
+        Review.objects.filter(pk=review_id).update(comments_count=10)
+        out = StringIO()
+        call_command('rebuild_counters', '--check', stdout=out)
+        assert f'Отзыв {review_id}: сохранено комментариев 10, ' in (
+            out.getvalue()
+        )
+        call_command('rebuild_counters', stdout=StringIO())
+        assert rebuild_comment_counters(fix=False) == [], (
+            'Проверьте, что `rebuild_counters` исправляет счётчики '
+            'комментариев.'
+        )
+
+    def test_03_cascade_delete_queries(self, admin_client, user_client,
+                                       user, moderator_client, moderator):
+        from reviews.counters import rebuild_comment_counters
+        from reviews.models import Comment
+
+        _, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        queries = []
+        for review, size in zip(reviews, (2, 20)):
+            Comment.objects.bulk_create(
+                Comment(review_id=review['id'], author=user, text='Текст')
+                for _ in range(size)
+            )
+            with CaptureQueriesContext(connection) as context:
+                admin_client.delete(f'{reviews_url}{review["id"]}/')
+            queries.append(len(context.captured_queries))
+        assert queries[0] == queries[1], (
+            'Проверьте, что число запросов при удалении Отзыва не зависит '
+            'от числа его Комментариев.'
+        )
+        assert rebuild_comment_counters(fix=False) == []
+
+    def test_04_drift_does_not_break_deletes(self, admin_client,
+                                             user_client, user):
+        from reviews.counters import rebuild_comment_counters, rebuild_counters
+        from reviews.models import CategoryStats, Review, Title
+
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client}
+        )
+        Review.objects.update(comments_count=0)
+        Title.objects.update(reviews_count=0, rating_sum=0)
+        CategoryStats.objects.update(reviews_count=0, rating_sum=0)
+        review_url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        )
+        response = admin_client.delete(
+            f'{review_url}comments/{comments[0]["id"]}/'
+        )
+        assert response.status_code == 204, (
+            'Проверьте, что расхождение счётчика не ломает удаление '
+            'Комментария.'
+        )
+        assert admin_client.delete(review_url).status_code == 204, (
+            'Проверьте, что расхождение счётчиков не ломает удаление '
+            'Отзыва.'
+        )
+        assert Title.objects.get(pk=titles[0]['id']).reviews_count == 0
+        rebuild_counters()
+        assert rebuild_comment_counters(fix=False) == []
@@ -0,0 +1,101 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30NestedLookups:
+
+    def get(self, client, url, expected=HTTPStatus.OK):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == expected, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает статус '
+            f'{expected}.'
+        )
+        return response, [query['sql'] for query in context.captured_queries]
+
+    def test_01_list_without_parent_query(self, admin_client, user_client,
+                                          user):
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client}
+        )
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        _, queries = self.get(user_client, reviews_url)
+        assert not any('FROM "reviews_title"' in sql for sql in queries), (
+            'Проверьте, что список Отзывов не загружает Произведение '
+            'отдельным запросом.'
+        )
+        _, queries = self.get(user_client, comments_url)
+        assert not any('FROM "reviews_review"' in sql for sql in queries), (
+            'Проверьте, что список Комментариев не загружает Отзыв '
+            'отдельным запросом.'
+        )
+
+        response, _ = self.get(
+            user_client, f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+        )
+        assert response.json()['results'] == []
+        self.get(user_client, '/api/v1/titles/999/reviews/',
+                 HTTPStatus.NOT_FOUND)
+        other_title_url = (
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/{reviews[0]["id"]}/'
+            'comments/'
+        )
+        self.get(user_client, other_title_url, HTTPStatus.NOT_FOUND)
+        self.get(
+            user_client, f'{other_title_url}{comments[0]["id"]}/',
+            HTTPStatus.NOT_FOUND
+        )
+        response = user_client.post(other_title_url, data={'text': 'Текст'})
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что нельзя прокомментировать Отзыв через чужое '
+            'Произведение.'
+        )
+
+    def test_02_parent_cache(self, settings, admin_client, user_client,
+                             user):
+        settings.PARENT_LOOKUP_CACHE_TIMEOUT = 60
+        _, reviews, titles = create_comments(
+            admin_client, {user: user_client}
+        )
+        comments_url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        caches['default'].clear()
+        _, queries = self.get(user_client, comments_url)
+        assert any('JOIN "reviews_review"' in sql for sql in queries)
+        _, queries = self.get(user_client, f'{comments_url}?limit=5')
+        assert not any('reviews_review' in sql for sql in queries), (
+            'Проверьте, что с кэшем родителя список Комментариев '
+            'фильтруется только по внешнему ключу.'
+        )
+        self.get(
+            user_client,
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/{reviews[0]["id"]}/'
+            'comments/?limit=5',
+            HTTPStatus.NOT_FOUND
+        )
+
+        admin_client.delete(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        )
+        self.get(user_client, f'{comments_url}?limit=6',
+                 HTTPStatus.NOT_FOUND)
+
+    def test_03_empty_title(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response, queries = self.get(user_client, url)
+        assert response.json()['count'] == 0
+        assert any('FROM "reviews_title"' in sql for sql in queries), (
+            'Проверьте, что для пустого списка проверяется существование '
+            'Произведения.'
+        )